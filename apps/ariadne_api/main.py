@@ -4,22 +4,36 @@ Ariadne FastAPI Application
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-from libs.ariadne_core.storage import GraphStore
+from libs.ariadne_core.storage import GraphStore, AsyncGraphStore, ProjectionManager, SnapshotManager
+from libs.ariadne_core.utils import dumps
 
-# Global graph store instance
+# Global graph store instances (sync for schema setup and sync helpers, async for request handlers)
 graph_store: GraphStore | None = None
+async_graph_store: AsyncGraphStore | None = None
+projection_manager: ProjectionManager | None = None
+graph_snapshots: SnapshotManager | None = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager for Neo4j connection"""
-    global graph_store
+    global graph_store, async_graph_store, projection_manager, graph_snapshots
     
     # Startup
     print("🚀 Initializing Ariadne Knowledge Graph...")
     graph_store = GraphStore()
     graph_store.connect()
+    async_graph_store = AsyncGraphStore().connect()
+    print(
+        f"✓ Async Neo4j driver: pool {async_graph_store.settings['max_connection_pool_size']}, "
+        f"sessions {async_graph_store.max_sessions}"
+    )
+    projection_manager = ProjectionManager(async_graph_store)
+    graph_snapshots = SnapshotManager(async_graph_store)
+    if graph_snapshots.enabled:
+        print(f"✓ CSR snapshot enabled (labels: {', '.join(graph_snapshots.labels or ['*'])})")
     
     if graph_store.verify_connection():
         print("✓ Neo4j connection established")
@@ -31,6 +45,14 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    graph_snapshots = None
+    if projection_manager:
+        dropped = await projection_manager.drop_all()
+        print(f"✓ Dropped {dropped} GDS projections")
+        projection_manager = None
+    if async_graph_store:
+        await async_graph_store.close()
+        async_graph_store = None
     if graph_store:
         graph_store.close()
         print("✓ Neo4j connection closed")
@@ -59,7 +81,38 @@ def get_graph_store() -> GraphStore:
     return graph_store
 
 
-# Import routers (after get_graph_store definition to avoid circular import)
+def get_async_graph_store() -> AsyncGraphStore:
+    """Dependency for the async graph store (use from `async def` routes)"""
+    if async_graph_store is None:
+        raise RuntimeError("Graph store not initialized")
+    return async_graph_store
+
+
+def get_projection_manager() -> ProjectionManager:
+    """Dependency for shared GDS projections"""
+    if projection_manager is None:
+        raise RuntimeError("Graph store not initialized")
+    return projection_manager
+
+
+def get_graph_snapshots() -> SnapshotManager:
+    """Dependency for the in-process CSR snapshot (check current() for None before use)"""
+    if graph_snapshots is None:
+        raise RuntimeError("Graph store not initialized")
+    return graph_snapshots
+
+
+class GraphJSONResponse(JSONResponse):
+    """JSON via orjson; Neo4j nodes, relationships and temporals left in the content are converted.
+
+    Return it directly from a route to skip FastAPI's jsonable_encoder pass over large results.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# Import routers (after the store dependencies to avoid circular import)
 from .routers import health, read, write, learn, ingest, validate, admin, suggestions, analytics, quality, decision, admin_dedup, admin_learning
 
 # Register routers
@@ -3,14 +3,20 @@ Admin endpoints for graph maintenance and error correction.
 Enables agents to fix mistakes, delete incorrect data, and update properties.
 """
 
+import asyncio
+import os
+
 from fastapi import APIRouter, Depends, HTTPException
-from libs.ariadne_core.storage import GraphStore
-from apps.ariadne_api.main import get_graph_store
+from libs.ariadne_core.storage import AsyncGraphStore, ProjectionManager, ResultCache, SnapshotManager
+from apps.ariadne_api.main import get_async_graph_store, get_projection_manager, get_graph_snapshots
 from pydantic import BaseModel
 from typing import Any, Dict
 
 router = APIRouter()
 
+# The detailed breakdown scans every relationship; keep it until the next graph write (or the TTL)
+stats_cache = ResultCache(ttl=float(os.getenv("ARIADNE_STATS_CACHE_TTL", "60")), max_entries=1)
+
 
 class ResetRequest(BaseModel):
     """Reset confirmation"""
@@ -20,7 +26,7 @@ class ResetRequest(BaseModel):
 @router.post("/v1/kg/admin/reset")
 async def reset_graph(
     request: ResetRequest = ResetRequest(confirm=False),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     DANGER: Delete ALL data in the knowledge graph.
@@ -36,14 +42,13 @@ async def reset_graph(
     
     try:
         # Get stats before deletion
-        before_stats = store.get_stats()
+        before_stats = await store.get_stats()
         
         # Delete everything
-        with store.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        await store.execute_write("MATCH (n) DETACH DELETE n")
         
         # Get stats after
-        after_stats = store.get_stats()
+        after_stats = await store.get_stats()
         
         return {
             "status": "success",
@@ -65,10 +70,10 @@ async def reset_graph(
 
 
 @router.get("/v1/kg/admin/stats")
-async def get_stats(store: GraphStore = Depends(get_graph_store)):
+async def get_stats(store: AsyncGraphStore = Depends(get_async_graph_store)):
     """Get detailed graph statistics"""
     try:
-        stats = store.get_stats()
+        stats = await store.get_stats()
         return {
             "status": "success",
             "total_nodes": stats["total_nodes"],
@@ -81,6 +86,27 @@ async def get_stats(store: GraphStore = Depends(get_graph_store)):
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
 
+@router.get("/v1/kg/admin/projections")
+async def get_projections(
+    projections: ProjectionManager = Depends(get_projection_manager),
+    snapshots: SnapshotManager = Depends(get_graph_snapshots)
+):
+    """Shared GDS projections and the CSR snapshot held by this process, with freshness"""
+    return {
+        "status": "success",
+        "ttl_seconds": projections.ttl,
+        "projections": projections.status(),
+        "csr_snapshot": snapshots.status()
+    }
+
+
+@router.delete("/v1/kg/admin/projections")
+async def drop_projections(projections: ProjectionManager = Depends(get_projection_manager)):
+    """Drop all shared GDS projections (rebuilt on next use)"""
+    dropped = await projections.drop_all()
+    return {"status": "success", "dropped": dropped}
+
+
 class NodeUpdateRequest(BaseModel):
     """Update node properties"""
     node_id: str  # Neo4j elementId
@@ -112,7 +138,7 @@ class EdgeDeleteRequest(BaseModel):
 @router.patch("/v1/kg/admin/node")
 async def update_node(
     request: NodeUpdateRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Update node properties.
@@ -125,7 +151,7 @@ async def update_node(
             WHERE elementId(n) = $node_id
             RETURN n
         """
-        result = store.execute_read(check_query, {"node_id": request.node_id})
+        result = await store.execute_read(check_query, {"node_id": request.node_id})
         if not result:
             raise HTTPException(status_code=404, detail=f"Node {request.node_id} not found")
         
@@ -137,7 +163,7 @@ async def update_node(
             SET n.updated_at = datetime()
             RETURN n
         """
-        updated = store.execute_write(update_query, {
+        updated = await store.execute_write(update_query, {
             "node_id": request.node_id,
             "properties": request.properties
         })
@@ -157,7 +183,7 @@ async def update_node(
 @router.patch("/v1/kg/admin/edge")
 async def update_edge(
     request: EdgeUpdateRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Update edge properties.
@@ -171,7 +197,7 @@ async def update_edge(
             RETURN r
             LIMIT 1
         """
-        result = store.execute_read(check_query, {
+        result = await store.execute_read(check_query, {
             "source_id": request.source_id,
             "target_id": request.target_id
         })
@@ -186,7 +212,7 @@ async def update_edge(
             SET r.updated_at = datetime()
             RETURN r
         """
-        store.execute_write(update_query, {
+        await store.execute_write(update_query, {
             "source_id": request.source_id,
             "target_id": request.target_id,
             "properties": request.properties
@@ -210,7 +236,7 @@ async def update_edge(
 async def delete_node(
     node_id: str,
     force: bool = False,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Delete node from graph.
@@ -227,7 +253,7 @@ async def delete_node(
             OPTIONAL MATCH (n)-[r]-()
             RETURN n, count(r) as edge_count
         """
-        result = store.execute_read(check_query, {"node_id": node_id})
+        result = await store.execute_read(check_query, {"node_id": node_id})
         if not result:
             raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
         
@@ -246,7 +272,7 @@ async def delete_node(
             WHERE elementId(n) = $node_id
             DETACH DELETE n
         """
-        store.execute_write(delete_query, {"node_id": node_id})
+        await store.execute_write(delete_query, {"node_id": node_id})
         
         return {
             "status": "deleted",
@@ -263,7 +289,7 @@ async def delete_node(
 @router.delete("/v1/kg/admin/edge")
 async def delete_edge(
     request: EdgeDeleteRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Delete specific edge.
@@ -283,7 +309,7 @@ async def delete_edge(
                 DELETE r
                 RETURN count(r) as deleted_count
             """
-            result = store.execute_write(delete_query, {
+            result = await store.execute_write(delete_query, {
                 "source_id": request.source_id,
                 "target_id": request.target_id,
                 "version": request.version
@@ -296,7 +322,7 @@ async def delete_edge(
                 DELETE r
                 RETURN count(r) as deleted_count
             """
-            result = store.execute_write(delete_query, {
+            result = await store.execute_write(delete_query, {
                 "source_id": request.source_id,
                 "target_id": request.target_id
             })
@@ -324,7 +350,7 @@ async def delete_edge(
 async def retract_hypothesis(
     hypothesis_id: str,
     reasoning: str,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Retract/withdraw a hypothesis before validation.
@@ -338,7 +364,7 @@ async def retract_hypothesis(
             MATCH (h:Hypothesis {id: $hypothesis_id})
             RETURN h.status as status
         """
-        result = store.execute_read(check_query, {"hypothesis_id": hypothesis_id})
+        result = await store.execute_read(check_query, {"hypothesis_id": hypothesis_id})
         if not result:
             raise HTTPException(status_code=404, detail=f"Hypothesis {hypothesis_id} not found")
         
@@ -356,7 +382,7 @@ async def retract_hypothesis(
                 h.retract_reasoning = $reasoning
             RETURN h
         """
-        store.execute_write(retract_query, {
+        await store.execute_write(retract_query, {
             "hypothesis_id": hypothesis_id,
             "reasoning": reasoning
         })
@@ -377,7 +403,7 @@ async def retract_hypothesis(
 async def delete_pattern(
     pattern_id: str,
     reasoning: str,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Delete a pattern that turned out to be invalid.
@@ -391,7 +417,7 @@ async def delete_pattern(
             MATCH (p:Pattern {id: $pattern_id})
             RETURN p
         """
-        result = store.execute_read(check_query, {"pattern_id": pattern_id})
+        result = await store.execute_read(check_query, {"pattern_id": pattern_id})
         if not result:
             raise HTTPException(status_code=404, detail=f"Pattern {pattern_id} not found")
         
@@ -400,7 +426,7 @@ async def delete_pattern(
             MATCH (p:Pattern {id: $pattern_id})
             DETACH DELETE p
         """
-        store.execute_write(delete_query, {"pattern_id": pattern_id})
+        await store.execute_write(delete_query, {"pattern_id": pattern_id})
         
         # Log deletion (could store in separate log)
         print(f"🗑️ Pattern {pattern_id} deleted. Reason: {reasoning}")
@@ -420,7 +446,7 @@ async def delete_pattern(
 @router.post("/v1/kg/admin/cleanup/orphaned-nodes")
 async def cleanup_orphaned_nodes(
     dry_run: bool = True,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Find and optionally delete orphaned nodes (nodes with no edges).
@@ -439,7 +465,7 @@ async def cleanup_orphaned_nodes(
             RETURN elementId(n) as node_id, labels(n) as labels, n.name as name, n.ticker as ticker
             LIMIT 100
         """
-        result = store.execute_read(find_query, {})
+        result = await store.execute_read(find_query, {})
         
         orphaned_nodes = [
             {
@@ -459,7 +485,7 @@ async def cleanup_orphaned_nodes(
                 WHERE elementId(n) IN $node_ids
                 DELETE n
             """
-            store.execute_write(delete_query, {"node_ids": node_ids})
+            await store.execute_write(delete_query, {"node_ids": node_ids})
         
         return {
             "status": "completed" if not dry_run else "dry_run",
@@ -472,64 +498,52 @@ async def cleanup_orphaned_nodes(
         raise HTTPException(status_code=500, detail=f"Cleanup failed: {str(e)}")
 
 
+async def load_detailed_stats(store: AsyncGraphStore) -> dict:
+    """Counts from the count store plus one relationship scan for temporal/confidence coverage"""
+    # count(expr) skips nulls, so both edge-property aggregates share a single pass
+    coverage_query = """
+        MATCH ()-[r]->()
+        RETURN count(r.valid_from) AS temporal_count,
+               avg(r.confidence) AS avg_confidence,
+               count(r.confidence) AS confidence_count
+    """
+    stats, coverage = await asyncio.gather(
+        store.get_stats(),
+        store.execute_read(coverage_query, {})
+    )
+    coverage = coverage[0] if coverage else {}
+    
+    total_edges = stats["total_edges"]
+    temporal_coverage = (
+        coverage.get("temporal_count", 0) / total_edges * 100
+        if total_edges > 0
+        else 0
+    )
+    avg_conf = coverage.get("avg_confidence")
+    
+    node_stats = sorted(stats["nodes_by_label"].items(), key=lambda item: item[1], reverse=True)
+    edge_stats = sorted(stats["edges_by_type"].items(), key=lambda item: item[1], reverse=True)
+    
+    return {
+        "status": "ok",
+        "node_stats": [{"label": label, "count": count} for label, count in node_stats],
+        "edge_stats": [{"rel_type": rel_type, "count": count} for rel_type, count in edge_stats],
+        "temporal_coverage_pct": round(temporal_coverage, 2) if temporal_coverage else 0,
+        "avg_confidence": round(avg_conf, 3) if avg_conf is not None else None,
+        "edges_with_confidence": coverage.get("confidence_count", 0)
+    }
+
+
 @router.get("/v1/kg/admin/stats/detailed")
 async def get_detailed_stats(
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Detailed graph statistics for monitoring.
     Agent use case: "Show me graph health metrics"
     """
     try:
-        # Node counts by label
-        node_stats_query = """
-            MATCH (n)
-            RETURN labels(n)[0] as label, count(*) as count
-            ORDER BY count DESC
-        """
-        node_stats = store.execute_read(node_stats_query, {})
-        
-        # Edge counts by type
-        edge_stats_query = """
-            MATCH ()-[r]->()
-            RETURN type(r) as rel_type, count(*) as count
-            ORDER BY count DESC
-        """
-        edge_stats = store.execute_read(edge_stats_query, {})
-        
-        # Temporal coverage
-        temporal_query = """
-            MATCH ()-[r]->()
-            WHERE r.valid_from IS NOT NULL
-            WITH count(r) as temporal_count
-            MATCH ()-[r2]->()
-            RETURN temporal_count, count(r2) as total_edges
-        """
-        temporal_result = store.execute_read(temporal_query, {})
-        temporal_coverage = (
-            temporal_result[0]["temporal_count"] / temporal_result[0]["total_edges"] * 100
-            if temporal_result and temporal_result[0]["total_edges"] > 0
-            else 0
-        )
-        
-        # Average confidence
-        confidence_query = """
-            MATCH ()-[r]->()
-            WHERE r.confidence IS NOT NULL
-            RETURN avg(r.confidence) as avg_confidence, count(r) as confidence_count
-        """
-        confidence_result = store.execute_read(confidence_query, {})
-        
-        avg_conf = confidence_result[0]["avg_confidence"] if confidence_result and confidence_result[0]["avg_confidence"] is not None else None
-        
-        return {
-            "status": "ok",
-            "node_stats": [{"label": r["label"], "count": r["count"]} for r in node_stats if r["label"]],
-            "edge_stats": [{"rel_type": r["rel_type"], "count": r["count"]} for r in edge_stats if r["rel_type"]],
-            "temporal_coverage_pct": round(temporal_coverage, 2) if temporal_coverage else 0,
-            "avg_confidence": round(avg_conf, 3) if avg_conf is not None else None,
-            "edges_with_confidence": confidence_result[0]["confidence_count"] if confidence_result else 0
-        }
+        return await stats_cache.get_or_load("detailed", lambda: load_detailed_stats(store))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
@@ -538,7 +552,7 @@ async def get_detailed_stats(
 @router.post("/v1/kg/admin/snapshot-degrees")
 async def snapshot_degrees(
     label: str = "Company",
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Create temporal snapshots for anomaly detection.
@@ -560,7 +574,7 @@ async def snapshot_degrees(
         RETURN count(n) as updated_nodes
         """
         
-        result = store.execute_write(update_query, {})
+        result = await store.execute_write(update_query, {})
         
         return {
             "status": "success",
@@ -3,14 +3,77 @@ Deduplication management endpoints for safe node merging.
 Provides duplicate detection, merge planning, and safe execution.
 """
 
+import asyncio
+import os
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from libs.ariadne_core.storage import GraphStore
-from apps.ariadne_api.main import get_graph_store
-from typing import Optional
+from libs.ariadne_core.storage import AsyncGraphStore
+from libs.ariadne_core.utils.name_keys import BLOCKING_KEY_VERSION, blocking_keys, candidate_pairs
+from apps.ariadne_api.main import get_async_graph_store
+from typing import List
 
 router = APIRouter()
 
+# Blocks larger than this are skipped (a common token like "bank" would pair everything with everything)
+DEDUP_MAX_BLOCK = int(os.getenv("ARIADNE_DEDUP_MAX_BLOCK", "200"))
+DEDUP_KEY_BATCH = int(os.getenv("ARIADNE_DEDUP_KEY_BATCH", "1000"))
+DEDUP_MERGE_BATCH = int(os.getenv("ARIADNE_DEDUP_MERGE_BATCH", "100"))
+
+# Stored key property -> key kind reported in matched_on
+BLOCKING_KEYS = {
+    "dedup_name_key": "name",
+    "dedup_phonetic_key": "phonetic",
+    "dedup_lead_key": "lead_token",
+}
+
+# Strategy -> apoc.refactor.mergeNodes property handling (target is the first node, so it wins on 'discard')
+MERGE_PROPERTIES = {
+    "prefer_target": "discard",
+    "prefer_source": "overwrite",
+    "merge_all_properties": "discard",
+}
+
+STALE_KEYS = """
+MATCH (n:{label})
+WITH n, $version + ':' + coalesce(n.name, n.ticker, '') AS source
+WHERE n.dedup_key_source IS NULL OR n.dedup_key_source <> source
+RETURN elementId(n) AS id, coalesce(n.name, n.ticker, '') AS name, source
+"""
+
+SET_KEYS = """
+UNWIND $rows AS row
+MATCH (n) WHERE elementId(n) = row.id
+SET n.dedup_name_key = row.name_key,
+    n.dedup_phonetic_key = row.phonetic_key,
+    n.dedup_lead_key = row.lead_key,
+    n.dedup_key_source = row.source
+"""
+
+KEY_BLOCKS = """
+MATCH (n:{label})
+WHERE n.{key} IS NOT NULL
+WITH n.{key} AS block, collect({{id: elementId(n), name_key: n.dedup_name_key}}) AS members
+WHERE size(members) > 1
+RETURN size(members) AS size, CASE WHEN size(members) <= $max_block THEN members ELSE [] END AS members
+"""
+
+# History is read before and written after mergeNodes: with "overwrite" the source's
+# merged_from would replace the target's. Keeps both nodes' history plus the source id.
+MERGE_PAIRS = """
+UNWIND $rows AS row
+MATCH (source) WHERE elementId(source) = row.source_id
+MATCH (target) WHERE elementId(target) = row.target_id
+WITH source, target, row,
+     coalesce(target.merged_from, []) + coalesce(source.merged_from, []) + row.source_id AS history
+CALL apoc.refactor.mergeNodes([target, source], {properties: row.properties, mergeRels: true}) YIELD node
+SET node.merged_from = history,
+    node.merged_at = datetime()
+RETURN count(node) AS merged
+"""
+
+_indexed_labels: set = set()
+
 
 class DedupExecuteRequest(BaseModel):
     """Request body for deduplication execution"""
@@ -20,23 +83,82 @@ class DedupExecuteRequest(BaseModel):
     dry_run: bool = True
 
 
+class DedupPair(BaseModel):
+    """Source node merged into target node"""
+    source_id: str
+    target_id: str
+
+
+class DedupBatchRequest(BaseModel):
+    """Request body for batched deduplication"""
+    pairs: List[DedupPair]
+    strategy: str = "prefer_target"
+    dry_run: bool = True
+
+
+async def ensure_key_indexes(store: AsyncGraphStore, label: str):
+    """Range indexes on the blocking key properties of a label (once per process)"""
+    if label in _indexed_labels:
+        return
+    for key in BLOCKING_KEYS:
+        await store.run_single(
+            f"CREATE INDEX {label.lower()}_{key} IF NOT EXISTS FOR (n:{label}) ON (n.{key})"
+        )
+    _indexed_labels.add(label)
+
+
+async def refresh_blocking_keys(store: AsyncGraphStore, label: str) -> int:
+    """
+    Store blocking keys on nodes that have none yet or whose name changed since.
+    Returns the number of nodes updated.
+    """
+    await ensure_key_indexes(store, label)
+    stale = await store.execute_read(
+        STALE_KEYS.format(label=label), {"version": str(BLOCKING_KEY_VERSION)}
+    )
+    if not stale:
+        return 0
+    rows = await asyncio.to_thread(
+        lambda: [{"id": r["id"], "source": r["source"], **blocking_keys(r["name"])} for r in stale]
+    )
+    return await store.write_batches(SET_KEYS, rows, DEDUP_KEY_BATCH)
+
+
+async def merge_pairs(store: AsyncGraphStore, pairs: list[tuple[str, str]], strategy: str) -> int:
+    """
+    Merge each source into its target with apoc.refactor.mergeNodes, in batched
+    write transactions. Returns the number of sources merged.
+    """
+    properties = MERGE_PROPERTIES.get(strategy, "discard")
+    rows = [{"source_id": s, "target_id": t, "properties": properties} for s, t in pairs]
+    await store.write_batches(MERGE_PAIRS, rows, DEDUP_MERGE_BATCH)
+    remaining = await store.execute_read(
+        "MATCH (n) WHERE elementId(n) IN $ids RETURN count(n) AS remaining",
+        {"ids": [s for s, _ in pairs]}
+    )
+    return len(pairs) - (remaining[0]["remaining"] if remaining else 0)
+
+
 @router.get("/deduplicate/plan")
 async def get_dedup_plan(
     label: str = Query("Company", description="Node label to analyze"),
     threshold: float = Query(0.85, ge=0.0, le=1.0, description="Similarity threshold"),
     limit: int = Query(20, ge=1, le=100, description="Maximum duplicate pairs"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Generate deduplication plan: find potential duplicates and show merge preview.
     
-    Uses GDS Node Similarity to find nodes with high structural similarity.
+    Names are reduced to blocking keys (sorted tokens without legal suffixes,
+    their Soundex codes, the leading token), stored as indexed properties and
+    refreshed only for nodes whose name changed. Only nodes sharing a key are
+    compared, so the plan stays far below the all-pairs cost on large labels.
     Shows property differences so user can decide on merge strategy.
     
     Returns:
-    - Duplicate pairs with similarity scores
+    - Duplicate pairs with similarity scores and the keys they matched on
     - Property differences (for decision-making)
-    - Relationship overview for both nodes
+    - Blocking statistics
     """
     try:
         # First, check how many nodes we have
@@ -45,7 +167,7 @@ async def get_dedup_plan(
         RETURN count(n) as node_count
         """
         
-        count_results = store.execute_read(count_query, {})
+        count_results = await store.execute_read(count_query, {})
         node_count = count_results[0]["node_count"] if count_results else 0
         
         if node_count < 2:
@@ -57,105 +179,58 @@ async def get_dedup_plan(
                 "message": f"Fewer than 2 nodes of type {label} found"
             }
         
-        # Project GDS graph
-        graph_name = f"dedup_{label}_{int(__import__('time').time())}"
-        try:
-            store.project_gds_graph(graph_name, [label], [])
-        except Exception as e:
-            # If projection fails (e.g., too small), use fallback
-            pass
-        
-        # Query: GDS Node Similarity
-        similarity_query = f"""
-        CALL gds.nodeSimilarity.stream(
-            '{label}',
-            {{similarityMetric: 'JACCARD'}}
-        )
-        YIELD node1, node2, similarity
-        
-        WITH gds.util.asNode(node1) as n1,
-             gds.util.asNode(node2) as n2,
-             similarity
-        
-        WHERE similarity >= $threshold AND elementId(n1) < elementId(n2)
-        
-        RETURN {{
-            node1_id: elementId(n1),
-            node1_name: coalesce(n1.name, n1.ticker, 'Unknown'),
-            node1_type: labels(n1)[0],
-            node2_id: elementId(n2),
-            node2_name: coalesce(n2.name, n2.ticker, 'Unknown'),
-            node2_type: labels(n2)[0],
-            similarity: round(similarity, 3),
-            properties_n1: properties(n1),
-            properties_n2: properties(n2)
-        }} as dup_pair
-        
-        ORDER BY similarity DESC
-        LIMIT $limit
-        """
-        
-        # Fallback if GDS not available: use property similarity
-        fallback_query = f"""
-        MATCH (n1:{label}), (n2:{label})
-        WHERE elementId(n1) < elementId(n2)
-        
-        // Simple string similarity: count matching properties
-        WITH n1, n2,
-             coalesce(n1.name, n1.ticker, '') as name1,
-             coalesce(n2.name, n2.ticker, '') as name2
-        
-        WHERE name1 <> '' AND name2 <> '' AND (
-            name1 = name2 OR 
-            toLower(name1) = toLower(name2) OR
-            name1 CONTAINS name2 OR
-            name2 CONTAINS name1
-        )
-        
-        WITH n1, n2, 0.9 as similarity  // High confidence if names match
-        
-        RETURN {{
-            node1_id: elementId(n1),
-            node1_name: coalesce(n1.name, n1.ticker, 'Unknown'),
-            node1_type: labels(n1)[0],
-            node2_id: elementId(n2),
-            node2_name: coalesce(n2.name, n2.ticker, 'Unknown'),
-            node2_type: labels(n2)[0],
-            similarity: round(similarity, 3),
-            properties_n1: properties(n1),
-            properties_n2: properties(n2)
-        }} as dup_pair
-        
-        ORDER BY similarity DESC
-        LIMIT $limit
-        """
-        
-        try:
-            results = store.execute_read(similarity_query, {
-                "threshold": threshold,
-                "limit": limit
-            })
-        except:
-            # Fallback to property-based similarity
-            results = store.execute_read(fallback_query, {"limit": limit})
+        keys_updated = await refresh_blocking_keys(store, label)
+        
+        # Candidate blocks per key, grouped in the database
+        block_results = await asyncio.gather(*(
+            store.execute_read(KEY_BLOCKS.format(label=label, key=key), {"max_block": DEDUP_MAX_BLOCK})
+            for key in BLOCKING_KEYS
+        ))
+        blocks = {}
+        oversized = 0
+        for key, rows in zip(BLOCKING_KEYS, block_results):
+            blocks[BLOCKING_KEYS[key]] = [r["members"] for r in rows if r["members"]]
+            oversized += sum(1 for r in rows if not r["members"])
+        
+        scored = await asyncio.to_thread(candidate_pairs, blocks, threshold)
+        blocking = {
+            "keys_updated": keys_updated,
+            "blocks": sum(len(b) for b in blocks.values()),
+            "oversized_blocks_skipped": oversized,
+            "candidate_pairs_above_threshold": len(scored)
+        }
         
-        if not results:
+        if not scored:
             return {
                 "status": "success",
                 "label": label,
+                "threshold": threshold,
                 "duplicates": [],
                 "count": 0,
+                "blocking": blocking,
                 "message": f"No duplicates found above {threshold} similarity"
             }
         
+        scored = scored[:limit]
+        node_results = await store.execute_read("""
+        MATCH (n) WHERE elementId(n) IN $ids
+        RETURN elementId(n) AS id,
+               coalesce(n.name, n.ticker, 'Unknown') AS name,
+               labels(n)[0] AS type,
+               properties(n) AS props
+        """, {"ids": list({node_id for a, b, _, _ in scored for node_id in (a, b)})})
+        nodes = {r["id"]: r for r in node_results}
+        
         # Build duplicate pairs with diff info
         duplicates = []
-        for r in results:
-            dup = r["dup_pair"]
+        for id1, id2, similarity, matched_on in scored:
+            if id1 not in nodes or id2 not in nodes:
+                continue
+            node1, node2 = nodes[id1], nodes[id2]
             
-            # Calculate property diff
-            props1 = dup["properties_n1"] or {}
-            props2 = dup["properties_n2"] or {}
+            # Calculate property diff (bookkeeping keys left out)
+            props1 = {k: v for k, v in (node1["props"] or {}).items() if not k.startswith("dedup_")}
+            props2 = {k: v for k, v in (node2["props"] or {}).items() if not k.startswith("dedup_")}
             
             all_keys = set(props1.keys()) | set(props2.keys())
             diffs = {}
@@ -168,16 +243,17 @@ async def get_dedup_plan(
             
             duplicates.append({
                 "node1": {
-                    "id": dup["node1_id"],
-                    "name": dup["node1_name"],
-                    "type": dup["node1_type"]
+                    "id": id1,
+                    "name": node1["name"],
+                    "type": node1["type"]
                 },
                 "node2": {
-                    "id": dup["node2_id"],
-                    "name": dup["node2_name"],
-                    "type": dup["node2_type"]
+                    "id": id2,
+                    "name": node2["name"],
+                    "type": node2["type"]
                 },
-                "similarity": dup["similarity"],
+                "similarity": round(similarity, 3),
+                "matched_on": matched_on,
                 "property_differences": diffs,
                 "recommended_strategy": "prefer_target" if len(str(props2)) >= len(str(props1)) else "prefer_source"
             })
@@ -188,6 +264,7 @@ async def get_dedup_plan(
             "threshold": threshold,
             "duplicates": duplicates,
             "count": len(duplicates),
+            "blocking": blocking,
             "message": f"Found {len(duplicates)} potential duplicates"
         }
     
@@ -198,14 +275,14 @@ async def get_dedup_plan(
 @router.post("/deduplicate/execute")
 async def execute_dedup(
     request: DedupExecuteRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Execute deduplication: merge two nodes safely.
     
     Strategies:
     - prefer_target: Keep target node, copy missing properties from source, rewire relationships
-    - prefer_source: Keep source node, copy missing properties from target, rewire relationships
+    - prefer_source: Keep target node, source properties win on conflicts, rewire relationships
     - merge_all_properties: Merge all properties (target overwrites on conflicts)
     
     Dry-run shows what would happen; set dry_run=false to execute.
@@ -213,7 +290,7 @@ async def execute_dedup(
     Returns:
     - Merge plan / execution summary
     - Relationship rewiring details
-    - Audit trail (merged_into property)
+    - Audit trail (merged_from property on the target)
     """
     try:
         # Validate that both nodes exist
@@ -223,7 +300,7 @@ async def execute_dedup(
         RETURN elementId(n1) as n1_id, elementId(n2) as n2_id
         """
         
-        validation = store.execute_read(validate_query, {
+        validation = await store.execute_read(validate_query, {
             "source_id": request.source_id,
             "target_id": request.target_id
         })
@@ -261,7 +338,7 @@ async def execute_dedup(
         } as plan
         """
         
-        plan_results = store.execute_read(plan_query, {
+        plan_results = await store.execute_read(plan_query, {
             "source_id": request.source_id,
             "target_id": request.target_id
         })
@@ -294,63 +371,18 @@ async def execute_dedup(
                         f"Copy missing properties from source to target (strategy: {request.strategy})",
                         f"Rewire {plan['source_in']} incoming relationships to target",
                         f"Rewire {plan['source_out']} outgoing relationships to target",
-                        f"Set source.merged_into = target.id (audit trail)",
+                        f"Append source id to target.merged_from (audit trail)",
                         "Delete source node"
                     ]
                 },
                 "message": "Dry-run mode: no changes made. Set dry_run=false to execute."
             }
         
-        # EXECUTE: Perform actual merge (transactional)
-        # Note: For real safety, this should be wrapped in a transaction
-        execute_query = """
-        MATCH (source), (target)
-        WHERE elementId(source) = $source_id AND elementId(target) = $target_id
-        
-        // Step 1: Copy properties from source to target based on strategy
-        CALL apoc.do.case([
-            $strategy = 'prefer_target',
-            'WITH source, target FOREACH (key IN keys(properties(source)) | 
-                SET target[key] = COALESCE(target[key], source[key]))',
-            $strategy = 'prefer_source',
-            'WITH source, target FOREACH (key IN keys(properties(target)) | 
-                SET target[key] = source[key])',
-            true,
-            'WITH source, target FOREACH (key IN keys(properties(source)) | 
-                SET target[key] = COALESCE(target[key], source[key]))'
-        ], {source: source, target: target}, {}) YIELD value
-        
-        // Step 2: Rewire incoming relationships
-        WITH source, target
-        MATCH (n)-[r_in]-(source)
-        CREATE (n)-[:MERGED_WITH]->(target)
-        DELETE r_in
-        
-        // Step 3: Rewire outgoing relationships
-        WITH source, target
-        MATCH (source)-[r_out]->(n)
-        CREATE (target)-[r_out_new:MERGED_REL]->(n)
-        SET r_out_new = properties(r_out)
-        DELETE r_out
-        
-        // Step 4: Mark source as merged
-        SET source.merged_into = elementId(target),
-            source.merged_at = datetime()
-        
-        // Return result
-        RETURN {
-            merged_source_id: elementId(source),
-            merged_target_id: elementId(target),
-            merged_at: datetime()
-        } as result
-        """
-        
+        # EXECUTE: apoc.refactor.mergeNodes in one managed write transaction
         try:
-            exec_result = store.execute_write(execute_query, {
-                "source_id": request.source_id,
-                "target_id": request.target_id,
-                "strategy": request.strategy
-            })
+            merged = await merge_pairs(store, [(request.source_id, request.target_id)], request.strategy)
+            if not merged:
+                raise HTTPException(status_code=500, detail="Merge execution failed: source node still present")
             
             return {
                 "status": "success",
@@ -366,11 +398,77 @@ async def execute_dedup(
                     "message": "Merge completed successfully"
                 }
             }
+        except HTTPException:
+            raise
         except Exception as exec_error:
-            # Rollback by marking as failed (Neo4j doesn't auto-rollback in our setup)
+            # The failed batch transaction was rolled back; nothing was merged
             raise HTTPException(status_code=500, detail=f"Merge execution failed: {str(exec_error)}")
     
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Deduplication execution failed: {str(e)}")
+
+
+@router.post("/deduplicate/execute-batch")
+async def execute_dedup_batch(
+    request: DedupBatchRequest,
+    store: AsyncGraphStore = Depends(get_async_graph_store)
+):
+    """
+    Merge many duplicate pairs (e.g. accepted from /deduplicate/plan) in
+    batched apoc.refactor.mergeNodes transactions.
+    
+    Each source may appear once and must not also be a target, so the
+    outcome does not depend on batch order. Strategies as in
+    /deduplicate/execute. Dry-run reports which nodes are missing.
+    """
+    pairs = [(p.source_id, p.target_id) for p in request.pairs]
+    if not pairs:
+        raise HTTPException(status_code=400, detail="No pairs given")
+    if request.strategy not in MERGE_PROPERTIES:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy: {request.strategy}")
+    sources = [s for s, _ in pairs]
+    targets = {t for _, t in pairs}
+    if any(s == t for s, t in pairs):
+        raise HTTPException(status_code=400, detail="A node cannot be merged into itself")
+    if len(set(sources)) != len(sources) or targets & set(sources):
+        raise HTTPException(
+            status_code=400,
+            detail="Each source may appear once and must not be the target of another pair"
+        )
+    
+    try:
+        existing = await store.execute_read(
+            "MATCH (n) WHERE elementId(n) IN $ids RETURN elementId(n) AS id",
+            {"ids": sources + list(targets)}
+        )
+        found = {r["id"] for r in existing}
+        ready = [(s, t) for s, t in pairs if s in found and t in found]
+        missing = sorted((set(sources) | targets) - found)
+        
+        if request.dry_run:
+            return {
+                "status": "success",
+                "dry_run": True,
+                "strategy": request.strategy,
+                "pairs": len(pairs),
+                "mergeable": len(ready),
+                "missing_nodes": missing,
+                "batches": -(-len(ready) // DEDUP_MERGE_BATCH),
+                "message": "Dry-run mode: no changes made. Set dry_run=false to execute."
+            }
+        
+        merged = await merge_pairs(store, ready, request.strategy) if ready else 0
+        return {
+            "status": "success",
+            "dry_run": False,
+            "action": "merge_executed",
+            "strategy": request.strategy,
+            "merged": merged,
+            "skipped": len(pairs) - merged,
+            "missing_nodes": missing
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch deduplication failed: {str(e)}")
@@ -5,8 +5,8 @@ Automatically adjust confidence values based on observed patterns and occurrence
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from libs.ariadne_core.storage import GraphStore
-from apps.ariadne_api.main import get_graph_store
+from libs.ariadne_core.storage import AsyncGraphStore
+from apps.ariadne_api.main import get_async_graph_store
 from datetime import datetime, timedelta
 
 router = APIRouter()
@@ -24,7 +24,7 @@ class LearningFeedbackRequest(BaseModel):
 @router.post("/learning/apply-feedback")
 async def apply_learning_feedback(
     request: LearningFeedbackRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Apply learning feedback: automatically adjust relationship confidences
@@ -93,7 +93,7 @@ async def apply_learning_feedback(
         ORDER BY learning_update.new_confidence - learning_update.old_confidence DESC
         """
         
-        detection_results = store.execute_read(detection_query, {})
+        detection_results = await store.execute_read(detection_query, {})
         
         if not detection_results:
             return {
@@ -175,7 +175,7 @@ async def apply_learning_feedback(
                 batch_ids = relation_ids[i:i+batch_size]
                 batch_updates = updates[i:i+batch_size]
                 
-                exec_results = store.execute_write(execute_query, {
+                exec_results = await store.execute_write(execute_query, {
                     "relation_ids": batch_ids,
                     "updates": batch_updates
                 })
@@ -213,7 +213,7 @@ async def apply_learning_feedback(
 async def get_learning_history(
     relation_id: str = Query(..., description="Element ID of relationship to inspect"),
     limit: int = Query(10, ge=1, le=50, description="Maximum history entries"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Retrieve confidence adjustment history for a specific relation.
@@ -241,7 +241,7 @@ async def get_learning_history(
         } as history
         """
         
-        results = store.execute_read(query, {"relation_id": relation_id})
+        results = await store.execute_read(query, {"relation_id": relation_id})
         
         if not results:
             raise HTTPException(status_code=404, detail=f"Relation {relation_id} not found")
@@ -3,11 +3,14 @@ Analytics endpoints for Graph Data Science queries via GDS
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from libs.ariadne_core.storage import GraphStore
-from apps.ariadne_api.main import get_graph_store
+from libs.ariadne_core.storage import AsyncGraphStore, ProjectionManager, SnapshotManager
+from libs.ariadne_core.utils import plain_properties
+from apps.ariadne_api.main import get_async_graph_store, get_projection_manager, get_graph_snapshots, GraphJSONResponse
 from typing import List
+import asyncio
+import numpy as np
 
-router = APIRouter()
+router = APIRouter(default_response_class=GraphJSONResponse)
 
 
 @router.get("/centrality")
@@ -15,7 +18,9 @@ async def get_centrality(
     algo: str = Query("pagerank", regex="^(pagerank|betweenness|closeness)$"),
     label: str | None = Query(None, description="Optional Node-Label Filter"),
     topk: int = Query(10, ge=1, le=100),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store),
+    projections: ProjectionManager = Depends(get_projection_manager),
+    snapshots: SnapshotManager = Depends(get_graph_snapshots)
 ):
     """
     Berechne Centrality-Scores via GDS für Nodes.
@@ -29,31 +34,6 @@ async def get_centrality(
         Ranking der wichtigsten Nodes
     """
     try:
-        # GDS Graph projizieren
-        graph_name = f"centrality_{algo}_{id(store)}"
-        
-        # Cleanup alte Projektionen
-        cleanup_query = f"CALL gds.graph.drop($name) YIELD graphName"
-        try:
-            store.execute_read(cleanup_query, {"name": graph_name})
-        except:
-            pass
-        
-        # Neue Projektion
-        label_filter = label if label else "*"
-        project_query = f"""
-            CALL gds.graph.project(
-                $graph_name,
-                '{label_filter}',
-                '*'
-            ) YIELD graphName, nodeCount
-            RETURN graphName, nodeCount
-        """
-        
-        proj_result = store.execute_read(project_query, {"graph_name": graph_name})
-        if not proj_result:
-            raise Exception("GDS graph projection failed")
-        
         # Centrality-Berechnung
         if algo == "pagerank":
             algo_query = """
@@ -80,14 +60,29 @@ async def get_centrality(
                 LIMIT $topk
             """
         
-        results = store.execute_read(algo_query, {
-            "graph_name": graph_name,
-            "topk": topk
-        })
+        # PageRank aus dem CSR-Snapshot, wenn er die ganze Projektion enthält (Label bzw. alle Labels)
+        snapshot = await snapshots.current() if algo == "pagerank" else None
+        if snapshot is not None and snapshot.covers(label):
+            rows, scores = await asyncio.to_thread(snapshot.pagerank, label)
+            top = np.argsort(-scores, kind="stable")[:topk]
+            ranked = [(snapshot.ids[row], score) for row, score in zip(rows[top].tolist(), scores[top].tolist())]
+            found = await store.execute_read(
+                "MATCH (n) WHERE elementId(n) IN $ids RETURN elementId(n) AS id, n AS node",
+                {"ids": [node_id for node_id, _ in ranked]}
+            )
+            by_id = {r["id"]: r["node"] for r in found}
+            results = [{"node": by_id[node_id], "score": score} for node_id, score in ranked if node_id in by_id]
+        else:
+            # Projektion wird zwischen Requests wiederverwendet (bis zum nächsten Write oder TTL)
+            async with projections.use([label] if label else None, None) as graph_name:
+                results = await store.execute_read(algo_query, {
+                    "graph_name": graph_name,
+                    "topk": topk
+                })
         
         nodes = []
         for record in results:
-            node = dict(record["node"])
+            node = plain_properties(record["node"])
             labels = list(record["node"].labels) if hasattr(record["node"], "labels") else []
             nodes.append({
                 "id": node.get("id"),
@@ -97,18 +92,12 @@ async def get_centrality(
                 "properties": node
             })
         
-        # Cleanup
-        try:
-            store.execute_read("CALL gds.graph.drop($name) YIELD graphName", {"name": graph_name})
-        except:
-            pass
-        
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "algorithm": algo,
             "count": len(nodes),
             "results": nodes
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Centrality calculation failed: {str(e)}")
@@ -118,7 +107,8 @@ async def get_centrality(
 async def get_communities(
     algo: str = Query("louvain", regex="^(louvain|leiden)$"),
     label: str | None = Query(None),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store),
+    projections: ProjectionManager = Depends(get_projection_manager)
 ):
     """
     Berechne Community-Zuordnungen via GDS.
@@ -131,29 +121,6 @@ async def get_communities(
         Community-Zuordnungen (node_id → community_id)
     """
     try:
-        graph_name = f"communities_{algo}_{id(store)}"
-        
-        # Cleanup
-        try:
-            store.execute_read("CALL gds.graph.drop($name) YIELD graphName", {"name": graph_name})
-        except:
-            pass
-        
-        # Projektion
-        label_filter = label if label else "*"
-        project_query = f"""
-            CALL gds.graph.project(
-                $graph_name,
-                '{label_filter}',
-                '*'
-            ) YIELD graphName, nodeCount
-            RETURN graphName, nodeCount
-        """
-        
-        proj_result = store.execute_read(project_query, {"graph_name": graph_name})
-        if not proj_result:
-            raise Exception("GDS graph projection failed")
-        
         # Community-Detection
         if algo == "leiden":
             detect_query = """
@@ -170,11 +137,12 @@ async def get_communities(
                 ORDER BY communityId, nodeId
             """
         
-        results = store.execute_read(detect_query, {"graph_name": graph_name})
+        async with projections.use([label] if label else None, None) as graph_name:
+            results = await store.execute_read(detect_query, {"graph_name": graph_name})
         
         communities = {}
         for record in results:
-            node = dict(record["node"])
+            node = plain_properties(record["node"])
             labels = list(record["node"].labels) if hasattr(record["node"], "labels") else []
             comm_id = record["communityId"]
             if comm_id not in communities:
@@ -185,18 +153,12 @@ async def get_communities(
                 "label": labels[0] if labels else "Unknown"
             })
         
-        # Cleanup
-        try:
-            store.execute_read("CALL gds.graph.drop($name) YIELD graphName", {"name": graph_name})
-        except:
-            pass
-        
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "algorithm": algo,
             "community_count": len(communities),
             "communities": communities
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Community detection failed: {str(e)}")
@@ -207,7 +169,8 @@ async def get_similarity(
     node_id: str = Query(..., description="Node ID"),
     method: str = Query("gds", regex="^(gds|weighted)$"),
     topk: int = Query(10, ge=1, le=50),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store),
+    projections: ProjectionManager = Depends(get_projection_manager)
 ):
     """
     Finde ähnliche Nodes via Node Similarity.
@@ -221,26 +184,6 @@ async def get_similarity(
         Ranking ähnlicher Nodes
     """
     try:
-        graph_name = f"similarity_{id(store)}"
-        
-        # Cleanup
-        try:
-            store.execute_read("CALL gds.graph.drop($name) YIELD graphName", {"name": graph_name})
-        except:
-            pass
-        
-        # Projektion
-        project_query = f"""
-            CALL gds.graph.project(
-                $graph_name,
-                '*',
-                '*'
-            ) YIELD graphName, nodeCount
-            RETURN graphName, nodeCount
-        """
-        
-        store.execute_read(project_query, {"graph_name": graph_name})
-        
         # Node Similarity
         query = """
             CALL gds.nodeSimilarity.stream($graph_name)
@@ -254,15 +197,16 @@ async def get_similarity(
         """
         
         node_id_int = int(node_id) if node_id.isdigit() else node_id
-        results = store.execute_read(query, {
-            "graph_name": graph_name,
-            "node_id": node_id_int,
-            "topk": topk
-        })
+        async with projections.use(None, None) as graph_name:
+            results = await store.execute_read(query, {
+                "graph_name": graph_name,
+                "node_id": node_id_int,
+                "topk": topk
+            })
         
         similar = []
         for record in results:
-            node = dict(record["similarNode"])
+            node = plain_properties(record["similarNode"])
             labels = list(record["similarNode"].labels) if hasattr(record["similarNode"], "labels") else []
             similar.append({
                 "id": node.get("id"),
@@ -272,19 +216,13 @@ async def get_similarity(
                 "properties": node
             })
         
-        # Cleanup
-        try:
-            store.execute_read("CALL gds.graph.drop($name) YIELD graphName", {"name": graph_name})
-        except:
-            pass
-        
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "reference_node": node_id,
             "method": method,
             "count": len(similar),
             "results": similar
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Similarity computation failed: {str(e)}")
@@ -294,7 +232,7 @@ async def get_similarity(
 async def predict_links(
     node_id: str = Query(..., description="Node ID"),
     topk: int = Query(10, ge=1, le=50),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Vorhersage fehlender Kanten via GDS Link Prediction.
@@ -307,26 +245,6 @@ async def predict_links(
         Ranking wahrscheinlicher Links
     """
     try:
-        graph_name = f"linkpred_{id(store)}"
-        
-        # Cleanup
-        try:
-            store.execute_read("CALL gds.graph.drop($name) YIELD graphName", {"name": graph_name})
-        except:
-            pass
-        
-        # Projektion
-        project_query = f"""
-            CALL gds.graph.project(
-                $graph_name,
-                '*',
-                '*'
-            ) YIELD graphName, nodeCount
-            RETURN graphName, nodeCount
-        """
-        
-        store.execute_read(project_query, {"graph_name": graph_name})
-        
         # Link Prediction (AdamicAdar)
         query = """
             MATCH (n) WHERE id(n) = $node_id
@@ -341,14 +259,14 @@ async def predict_links(
         """
         
         node_id_int = int(node_id) if node_id.isdigit() else node_id
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "node_id": node_id_int,
             "topk": topk
         })
         
         predictions = []
         for record in results:
-            node = dict(record["potential"])
+            node = plain_properties(record["potential"])
             labels = list(record["potential"].labels) if hasattr(record["potential"], "labels") else []
             predictions.append({
                 "id": node.get("id"),
@@ -358,18 +276,12 @@ async def predict_links(
                 "properties": node
             })
         
-        # Cleanup
-        try:
-            store.execute_read("CALL gds.graph.drop($name) YIELD graphName", {"name": graph_name})
-        except:
-            pass
-        
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "source_node": node_id,
             "count": len(predictions),
             "predictions": predictions
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Link prediction failed: {str(e)}")
@@ -384,7 +296,7 @@ async def propagate_confidence(
     mode: str = Query("product", regex="^(product|min|avg)$", description="Aggregation mode"),
     min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
     limit: int = Query(20, ge=1, le=100, description="Maximum results"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Calculate transitive confidence from a source node to target nodes.
@@ -452,25 +364,25 @@ async def propagate_confidence(
         LIMIT $limit
         """
         
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "source_value": source_param,
             "min_confidence": min_confidence,
             "limit": limit
         })
         
         if not results:
-            return {
+            return GraphJSONResponse({
                 "status": "success",
                 "source": from_ticker or from_id,
                 "target_label": to_label,
                 "propagations": [],
                 "count": 0,
                 "message": "No confidence paths found"
-            }
+            })
         
         propagations = [r["result"] for r in results]
         
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "source": from_ticker or from_id,
             "target_label": to_label,
@@ -487,7 +399,7 @@ async def propagate_confidence(
                 "avg_confidence": round(sum(p["confidence"] for p in propagations) / len(propagations), 3) if propagations else 0.0,
                 "avg_depth": round(sum(p["depth"] for p in propagations) / len(propagations), 1) if propagations else 0.0
             }
-        }
+        })
     
     except HTTPException:
         raise
@@ -4,11 +4,13 @@ Provides risk scoring and evidence lineage tracing.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from libs.ariadne_core.storage import GraphStore
+from libs.ariadne_core.storage import AsyncGraphStore, GraphSnapshot, SnapshotManager
 from libs.ariadne_core.utils.scoring import (
     normalize_weights, weighted_score, normalize_minmax, aggregate_confidence
 )
-from apps.ariadne_api.main import get_graph_store
+from apps.ariadne_api.main import get_async_graph_store, get_graph_snapshots
+import asyncio
+import numpy as np
 
 router = APIRouter()
 
@@ -17,7 +19,7 @@ router = APIRouter()
 async def get_risk_score(
     ticker: str = Query(..., description="Company ticker symbol"),
     include_centrality: bool = Query(False, description="Include PageRank centrality factor"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Calculate risk score for a company.
@@ -31,43 +33,49 @@ async def get_risk_score(
     Agent use case: "What is the risk profile of this company?"
     """
     try:
-        # Main query for risk factors
-        query = """
-        MATCH (n:Company {ticker: $ticker})
+        # The three risk factors are independent reads: run them concurrently.
+        # Each groups by the company, so an unknown ticker yields no rows.
+        company_match = "MATCH (n:Company {ticker: $ticker})"
         
-        // Factor 1: Negative events
+        # Factor 1: Negative events
+        negative_query = company_match + """
         OPTIONAL MATCH (n)-[r:HARMS|AFFECTS]->()
         WHERE type(r) = 'HARMS' OR r.effect = 'negative'
-        WITH n, count(r) as negative_rels
+        RETURN elementId(n) as company, count(r) as negative_events
+        """
         
-        // Factor 2: Dependency degree (who depends on this node)
+        # Factor 2: Dependency degree (who depends on this node)
+        dependents_query = company_match + """
         OPTIONAL MATCH (n)<-[:SUPPLIES_TO]-()
-        WITH n, negative_rels, count(*) as dependents
+        RETURN elementId(n) as company, count(*) as dependents
+        """
         
-        // Factor 3: Low confidence ratio
+        # Factor 3: Low confidence ratio
+        confidence_query = company_match + """
         OPTIONAL MATCH (n)-[r]->()
-        WITH n, negative_rels, dependents,
-             sum(CASE WHEN r.confidence < 0.5 THEN 1 ELSE 0 END) as low_conf_count,
+        WITH n, sum(CASE WHEN r.confidence < 0.5 THEN 1 ELSE 0 END) as low_conf_count,
              count(r) as total_rels_val
-        
-        WITH n, negative_rels, dependents,
-             CASE WHEN total_rels_val > 0 THEN low_conf_count * 1.0 / total_rels_val ELSE 0 END as low_conf_ratio,
-             total_rels_val
-        
-        RETURN {
-          negative_events: coalesce(negative_rels, 0),
-          dependents: coalesce(dependents, 0),
-          low_confidence_ratio: low_conf_ratio,
-          total_relations: total_rels_val
-        } as risk_factors
+        RETURN elementId(n) as company,
+               CASE WHEN total_rels_val > 0 THEN low_conf_count * 1.0 / total_rels_val ELSE 0 END as low_confidence_ratio,
+               total_rels_val as total_relations
         """
         
-        results = store.execute_read(query, {"ticker": ticker})
+        params = {"ticker": ticker}
+        negative, dependents, confidence = await asyncio.gather(
+            store.execute_read(negative_query, params),
+            store.execute_read(dependents_query, params),
+            store.execute_read(confidence_query, params),
+        )
         
-        if not results:
+        if not (negative and dependents and confidence):
             raise HTTPException(status_code=404, detail=f"Company {ticker} not found")
         
-        factors = results[0]["risk_factors"]
+        factors = {
+            "negative_events": negative[0]["negative_events"] or 0,
+            "dependents": dependents[0]["dependents"] or 0,
+            "low_confidence_ratio": confidence[0]["low_confidence_ratio"],
+            "total_relations": confidence[0]["total_relations"],
+        }
         
         # Calculate risk score (weighted sum)
         # Scale factors to 0-10 range first
@@ -122,7 +130,7 @@ async def get_lineage(
     ticker: str = Query(..., description="Company ticker symbol"),
     max_depth: int = Query(5, ge=1, le=10, description="Maximum path depth"),
     limit: int = Query(20, ge=1, le=100, description="Maximum lineage chains to return"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Trace evidence lineage for a company.
@@ -173,7 +181,7 @@ async def get_lineage(
         LIMIT $limit
         """
         
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "ticker": ticker,
             "limit": limit
         })
@@ -205,6 +213,37 @@ async def get_lineage(
         raise HTTPException(status_code=500, detail=f"Lineage tracing failed: {str(e)}")
 
 
+def snapshot_impacts(
+    snapshot: GraphSnapshot,
+    source: int,
+    max_depth: int,
+    rel_filter: str | None,
+    decay: str,
+    min_confidence: float,
+    limit: int
+) -> list[dict] | None:
+    """/impact results computed on the CSR snapshot (None: rel_filter needs the APOC path)"""
+    reached = snapshot.impact(source, max_depth, rel_filter, decay)
+    if reached is None:
+        return None
+    
+    rows, depths, scores = reached
+    keep = scores >= min_confidence
+    rows, depths, rounded = rows[keep], depths[keep], np.round(scores[keep], 3)
+    top = np.lexsort((depths, -rounded))[:limit]
+    
+    return [
+        {
+            "target_id": snapshot.ids[row],
+            "target_name": snapshot.names[row],
+            "target_type": snapshot.kinds[row],
+            "impact_score": score,
+            "depth": depth
+        }
+        for row, score, depth in zip(rows[top].tolist(), rounded[top].tolist(), depths[top].tolist())
+    ]
+
+
 @router.get("/impact")
 async def get_impact_simulation(
     ticker: str | None = Query(None, description="Company ticker (use one of ticker or node_id)"),
@@ -214,7 +253,8 @@ async def get_impact_simulation(
     decay: str = Query("exponential", regex="^(linear|exponential)$", description="Decay function"),
     min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
     limit: int = Query(20, ge=1, le=100, description="Maximum results"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store),
+    snapshots: SnapshotManager = Depends(get_graph_snapshots)
 ):
     """
     Simulate impact of a node or event on other nodes through the graph.
@@ -232,6 +272,10 @@ async def get_impact_simulation(
     - limit: Top N results
     
     Returns: List of impacted nodes with impact scores and path information
+    
+    With ARIADNE_CSR_SNAPSHOT=1 this runs on the CSR snapshot, as long as it
+    covers the whole graph (ARIADNE_CSR_LABELS=*, the default); otherwise it
+    uses the APOC expansion.
     """
     try:
         # Build match clause for finding source node
@@ -244,6 +288,17 @@ async def get_impact_simulation(
         else:
             raise HTTPException(status_code=400, detail="Either ticker or node_id required")
         
+        # CSR snapshot first (opt-in); the APOC expansion below runs when it is off or cannot answer.
+        # The expansion has no label filter, so only a whole-graph snapshot gives the same answer.
+        impacts = None
+        snapshot = await snapshots.current()
+        covered = snapshot is not None and snapshot.covers(None)
+        source_row = snapshot.node(ticker=ticker, node_id=node_id) if covered else None
+        if source_row is not None:
+            impacts = await asyncio.to_thread(
+                snapshot_impacts, snapshot, source_row, max_depth, rel_filter, decay, min_confidence, limit
+            )
+        
         # Build relationship filter
         rel_str = f"[:{rel_filter}]" if rel_filter else ""
         
@@ -296,13 +351,15 @@ async def get_impact_simulation(
          RETURN result
          """
         
-        results = store.execute_read(query, {
-            "source_value": source_param,
-            "min_confidence": min_confidence,
-            "limit": limit
-        })
+        if impacts is None:
+            results = await store.execute_read(query, {
+                "source_value": source_param,
+                "min_confidence": min_confidence,
+                "limit": limit
+            })
+            impacts = [r["result"] for r in results]
         
-        if not results:
+        if not impacts:
             return {
                 "status": "success",
                 "source": ticker or node_id,
@@ -311,8 +368,6 @@ async def get_impact_simulation(
                 "message": "No impact found within specified depth"
             }
         
-        impacts = [r["result"] for r in results]
-        
         return {
             "status": "success",
             "source": ticker or node_id,
@@ -336,6 +391,17 @@ async def get_impact_simulation(
         raise HTTPException(status_code=500, detail=f"Impact simulation failed: {str(e)}")
 
 
+def snapshot_pagerank(snapshot: GraphSnapshot, label: str) -> list[dict]:
+    """PageRank over the whole snapshot for nodes carrying label, shaped like the degree rows"""
+    rows, scores = snapshot.pagerank()
+    members = np.zeros(snapshot.node_count, dtype=bool)
+    members[snapshot.nodes_with(label)] = True
+    return [
+        {"node_id": snapshot.ids[row], "centrality_score": score}
+        for row, score in zip(rows[members[rows]].tolist(), scores[members[rows]].tolist())
+    ]
+
+
 @router.get("/opportunities")
 async def get_opportunities(
     label: str = Query("Company", description="Node label to analyze (e.g., Company)"),
@@ -343,7 +409,8 @@ async def get_opportunities(
     w_centrality: float = Query(0.4, ge=0.0, le=1.0, description="Centrality factor weight"),
     w_anomaly: float = Query(0.3, ge=0.0, le=1.0, description="Anomaly factor weight"),
     limit: int = Query(15, ge=1, le=50, description="Top N opportunities"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store),
+    snapshots: SnapshotManager = Depends(get_graph_snapshots)
 ):
     """
     Score nodes by opportunity: combining gaps, centrality, and anomalies.
@@ -389,31 +456,11 @@ async def get_opportunities(
         }} as gap_data
         """
         
-        gap_results = store.execute_read(gap_query, {})
-        
-        if not gap_results:
-            return {
-                "status": "success",
-                "label": label,
-                "opportunities": [],
-                "count": 0,
-                "message": f"No nodes with gaps found for label {label}"
-            }
-        
-        # Extract gap scores
-        gap_data = {r["gap_data"]["node_id"]: r["gap_data"] for r in gap_results}
-        gap_scores = {nid: d["gap_ratio"] for nid, d in gap_data.items()}
-        
-        # Query: Centrality scores
-        centrality_query = f"""
-        CALL gds.pageRank.stream('{{graph_name}}')
-        YIELD nodeId, score
-        WITH gds.util.asNode(nodeId) as n, score
-        WHERE '{label}' IN labels(n)
-        RETURN elementId(n) as node_id, score as centrality_score
-        """
+        # Centrality: PageRank from the CSR snapshot when it covers the label,
+        # otherwise degree (we can't rely on a GDS graph existing)
+        snapshot = await snapshots.current()
+        use_pagerank = snapshot is not None and snapshot.covers(label)
         
-        # Since we can't rely on GDS graph existing, we calculate degree directly
         degree_query = f"""
         MATCH (n:{label})
         OPTIONAL MATCH (n)-[r]->()
@@ -421,9 +468,6 @@ async def get_opportunities(
         RETURN elementId(n) as node_id, degree as centrality_score
         """
         
-        centrality_results = store.execute_read(degree_query, {})
-        centrality_data = {r["node_id"]: r["centrality_score"] for r in centrality_results}
-        
         # Query: Anomaly detection (high degree or temporal spike)
         anomaly_query = f"""
         MATCH (n:{label})
@@ -446,7 +490,28 @@ async def get_opportunities(
         }} as anomaly_data
         """
         
-        anomaly_results = store.execute_read(anomaly_query, {})
+        # Gap, centrality and anomaly scans are independent: run them concurrently
+        gap_results, centrality_results, anomaly_results = await asyncio.gather(
+            store.execute_read(gap_query, {}),
+            asyncio.to_thread(snapshot_pagerank, snapshot, label) if use_pagerank
+            else store.execute_read(degree_query, {}),
+            store.execute_read(anomaly_query, {}),
+        )
+        
+        if not gap_results:
+            return {
+                "status": "success",
+                "label": label,
+                "opportunities": [],
+                "count": 0,
+                "message": f"No nodes with gaps found for label {label}"
+            }
+        
+        # Extract gap scores
+        gap_data = {r["gap_data"]["node_id"]: r["gap_data"] for r in gap_results}
+        gap_scores = {nid: d["gap_ratio"] for nid, d in gap_data.items()}
+        
+        centrality_data = {r["node_id"]: r["centrality_score"] for r in centrality_results}
         anomaly_data = {r["anomaly_data"]["node_id"]: r["anomaly_data"] for r in anomaly_results}
         anomaly_scores = {nid: d.get("growth_rate", 0) for nid, d in anomaly_data.items()}
         
@@ -485,7 +550,7 @@ async def get_opportunities(
                 },
                 "rationale": [
                     f"Gap severity: {round(gap_score*100, 1)}% low-confidence relations ({gap_data[node_id]['low_conf_count']}/{gap_data[node_id]['total_relations']})",
-                    f"Centrality: degree {centrality_raw}",
+                    f"Centrality: PageRank {round(centrality_raw, 3)}" if use_pagerank else f"Centrality: degree {centrality_raw}",
                     f"Anomaly: {round(anomaly_norm*100, 1)}% degree growth"
                 ]
             })
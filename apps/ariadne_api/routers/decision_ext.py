@@ -4,9 +4,9 @@ Provides confidence propagation across graph paths.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from libs.ariadne_core.storage import GraphStore
+from libs.ariadne_core.storage import AsyncGraphStore
 from libs.ariadne_core.utils.scoring import aggregate_confidence
-from apps.ariadne_api.main import get_graph_store
+from apps.ariadne_api.main import get_async_graph_store
 
 router = APIRouter()
 
@@ -20,7 +20,7 @@ async def propagate_confidence(
     mode: str = Query("product", regex="^(product|min|avg)$", description="Aggregation mode"),
     min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
     limit: int = Query(20, ge=1, le=100, description="Maximum results"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Calculate transitive confidence from a source node to target nodes.
@@ -90,7 +90,7 @@ async def propagate_confidence(
         LIMIT $limit
         """
         
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "source_value": source_param,
             "min_confidence": min_confidence,
             "limit": limit
@@ -4,23 +4,23 @@ Health and stats endpoints
 
 from fastapi import APIRouter, Depends
 from libs.ariadne_core.models import HealthResponse, StatsResponse
-from libs.ariadne_core.storage import GraphStore
-from apps.ariadne_api.main import get_graph_store
+from libs.ariadne_core.storage import AsyncGraphStore
+from apps.ariadne_api.main import get_async_graph_store
 
 router = APIRouter()
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health(store: GraphStore = Depends(get_graph_store)):
+async def health(store: AsyncGraphStore = Depends(get_async_graph_store)):
     """Health check endpoint"""
-    connected = store.verify_connection()
+    connected = await store.verify_connection()
     
     node_count = None
     edge_count = None
     
     if connected:
         try:
-            stats = store.get_stats()
+            stats = await store.get_stats()
             node_count = stats["total_nodes"]
             edge_count = stats["total_edges"]
         except Exception:
@@ -36,9 +36,9 @@ async def health(store: GraphStore = Depends(get_graph_store)):
 
 
 @router.get("/v1/kg/stats", response_model=StatsResponse)
-async def get_stats(store: GraphStore = Depends(get_graph_store)):
+async def get_stats(store: AsyncGraphStore = Depends(get_async_graph_store)):
     """Get database statistics"""
-    stats = store.get_stats()
+    stats = await store.get_stats()
     
     return StatsResponse(
         nodes_by_label=stats["nodes_by_label"],
@@ -4,16 +4,30 @@ Manual graph building for entities/events is preferred - use Write endpoints ins
 """
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from libs.ariadne_core.storage import GraphStore
+from libs.ariadne_core.storage import AsyncGraphStore
+from libs.ariadne_core.storage.ingest_writes import INGEST_FETCH_CONCURRENCY, INGEST_WRITE_BATCH, UPSERT_INSTRUMENTS
 from libs.ariadne_core.signals import PriceEventDetector
-from apps.ariadne_api.main import get_graph_store
+from apps.ariadne_api.main import get_async_graph_store
 from datetime import datetime, timedelta
+import asyncio
 import httpx
 import os
+import time
 import uuid
 
 router = APIRouter()
 
+# Keyed on (symbol, event_type, occurred_at) so re-ingesting a range updates instead of duplicating
+UPSERT_PRICE_EVENTS = """
+    UNWIND $rows AS row
+    MATCH (i:Instrument {symbol: row.symbol})
+    MERGE (pe:PriceEvent {symbol: row.symbol, event_type: row.event_type, occurred_at: row.occurred_at})
+    ON CREATE SET pe.id = row.id, pe.created_at = datetime()
+    SET pe.confidence = row.confidence
+    SET pe += row.properties
+    MERGE (pe)-[:PRICE_EVENT_OF]->(i)
+"""
+
 # Global detector (lazy loaded)
 price_detector = None
 
@@ -31,7 +45,7 @@ async def ingest_prices(
     symbols: list[str] = Query(default=[]),
     from_date: str = Query(default=None),
     to_date: str = Query(default=None),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Ingest price data from Satbase, detect events, and populate graph.
@@ -39,7 +53,7 @@ async def ingest_prices(
     if not symbols:
         # Get symbols from existing companies in graph
         query = "MATCH (c:Company) RETURN c.ticker AS ticker LIMIT 50"
-        results = store.execute_read(query, {})
+        results = await store.execute_read(query, {})
         symbols = [r["ticker"] for r in results if r.get("ticker")]
     
     if not symbols:
@@ -69,88 +83,72 @@ async def ingest_prices(
 # Background task
 
 async def run_price_ingestion(
-    store: GraphStore,
+    store: AsyncGraphStore,
     symbols: list[str],
     from_date: str,
     to_date: str
 ):
-    """Process price data and detect events"""
+    """Fetch bars concurrently, detect events, then write them in UNWIND batches"""
     print(f"📈 Ingesting price data for {len(symbols)} symbols...")
+    started = time.perf_counter()
     
     satbase_url = os.getenv("SATBASE_URL", "http://localhost:8080")
     detector = get_price_detector()
+    fetch_slots = asyncio.Semaphore(INGEST_FETCH_CONCURRENCY)
+    
+    async def fetch_and_detect(client: httpx.AsyncClient, symbol: str) -> list[dict] | None:
+        """Detected events, or None when Satbase has no bars for the symbol"""
+        try:
+            async with fetch_slots:
+                response = await client.get(
+                    f"{satbase_url}/v1/prices/daily/{symbol}",
+                    params={
+                        "from": from_date,
+                        "to": to_date
+                    }
+                )
+            if response.status_code != 200:
+                return None
+            price_data = response.json().get("bars", [])
+            if not price_data:
+                return None
+            # Detectors are CPU-bound: keep them off the event loop
+            events = await asyncio.to_thread(detector.detect_all, symbol, price_data)
+            print(f"✓ {symbol}: {len(events)} events")
+            return events
+        except Exception as e:
+            print(f"✗ Error processing {symbol}: {str(e)}")
+            return None
     
     try:
         async with httpx.AsyncClient(timeout=60.0) as client:
-            total_events = 0
-            
-            for symbol in symbols:
-                try:
-                    response = await client.get(
-                        f"{satbase_url}/v1/prices/daily/{symbol}",
-                        params={
-                            "from": from_date,
-                            "to": to_date
-                        }
-                    )
-                    
-                    if response.status_code != 200:
-                        continue
-                    
-                    data = response.json()
-                    price_data = data.get("bars", [])
-                    
-                    if not price_data:
-                        continue
-                    
-                    # Ensure instrument exists
-                    store.execute_write(
-                        "MERGE (i:Instrument {symbol: $symbol}) SET i.updated_at = datetime()",
-                        {"symbol": symbol}
-                    )
-                    
-                    # Detect price events
-                    events = detector.detect_all(symbol, price_data)
-                    
-                    # Store events
-                    for event in events:
-                        event_id = str(uuid.uuid4())
-                        
-                        create_event_query = """
-                            CREATE (pe:PriceEvent {
-                                id: $id,
-                                symbol: $symbol,
-                                event_type: $event_type,
-                                occurred_at: $occurred_at,
-                                confidence: $confidence,
-                                created_at: datetime()
-                            })
-                            SET pe += $properties
-                            WITH pe
-                            MATCH (i:Instrument {symbol: $symbol})
-                            MERGE (pe)-[r:PRICE_EVENT_OF]->(i)
-                            RETURN pe
-                        """
-                        
-                        store.execute_write(create_event_query, {
-                            "id": event_id,
-                            "symbol": event["symbol"],
-                            "event_type": event["event_type"],
-                            "occurred_at": event["occurred_at"],
-                            "confidence": event["confidence"],
-                            "properties": event.get("properties", {})
-                        })
-                        
-                        total_events += 1
-                    
-                    print(f"✓ {symbol}: {len(events)} events")
-                
-                except Exception as e:
-                    print(f"✗ Error processing {symbol}: {str(e)}")
-                    continue
-            
-            print(f"🎉 Price ingestion complete: {total_events} events created")
-    
+            detected = await asyncio.gather(*[fetch_and_detect(client, symbol) for symbol in symbols])
+        
+        instruments = []
+        event_rows = []
+        for symbol, events in zip(symbols, detected):
+            if events is None:
+                continue
+            instruments.append({"symbol": symbol})
+            event_rows.extend(
+                {
+                    "id": str(uuid.uuid4()),
+                    "symbol": event["symbol"],
+                    "event_type": event["event_type"],
+                    "occurred_at": event["occurred_at"],
+                    "confidence": event["confidence"],
+                    "properties": event.get("properties", {})
+                }
+                for event in events
+            )
+        
+        # Instruments first: the event batches MATCH them
+        await store.write_batches(UPSERT_INSTRUMENTS, instruments, INGEST_WRITE_BATCH)
+        total_events = await store.write_batches(UPSERT_PRICE_EVENTS, event_rows, INGEST_WRITE_BATCH)
+        
+        print(
+            f"🎉 Price ingestion complete: {total_events} events for {len(instruments)} symbols "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
     except Exception as e:
         print(f"❌ Price ingestion failed: {str(e)}")
-
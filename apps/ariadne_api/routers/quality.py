@@ -4,8 +4,8 @@ Detects contradictions, gaps, anomalies, and duplicates in knowledge graph.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from libs.ariadne_core.storage import GraphStore
-from apps.ariadne_api.main import get_graph_store
+from libs.ariadne_core.storage import AsyncGraphStore, ProjectionManager
+from apps.ariadne_api.main import get_async_graph_store, get_projection_manager
 from typing import Optional
 import math
 
@@ -14,7 +14,7 @@ router = APIRouter()
 
 @router.get("/contradictions")
 async def get_contradictions(
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Detect contradictions in the knowledge graph.
@@ -67,7 +67,7 @@ async def get_contradictions(
         ORDER BY contradiction.relation_1.confidence DESC
         """
         
-        results = store.execute_read(query, {})
+        results = await store.execute_read(query, {})
         
         return {
             "status": "success",
@@ -85,7 +85,7 @@ async def get_gaps(
     min_relations: int = Query(10, ge=1, description="Minimum relations threshold"),
     low_confidence_threshold: float = Query(0.5, ge=0, le=1, description="Confidence threshold"),
     gap_threshold: float = Query(0.5, ge=0, le=1, description="Gap severity threshold"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Detect gaps in knowledge graph coverage.
@@ -124,7 +124,7 @@ async def get_gaps(
         ORDER BY gap.gap_severity DESC
         """
         
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "low_conf_threshold": low_confidence_threshold,
             "min_rels": min_relations,
             "gap_thresh": gap_threshold
@@ -151,7 +151,7 @@ async def get_anomalies(
     label: str = Query("Company", description="Node label to analyze"),
     z_threshold: float = Query(2.5, ge=1, description="Z-score threshold for statistical outliers"),
     growth_threshold: float = Query(0.3, ge=0, le=1, description="Growth rate threshold (30% = 0.3)"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Detect structural and temporal anomalies.
@@ -169,7 +169,7 @@ async def get_anomalies(
         RETURN elementId(n) as node_id, n.name as name, n.ticker as ticker, n.title as title, degree
         """
         
-        degree_results = store.execute_read(degree_query, {})
+        degree_results = await store.execute_read(degree_query, {})
         
         if not degree_results:
             return {
@@ -223,7 +223,7 @@ async def get_anomalies(
                current_degree, degree_7d_ago, growth_rate
         """
         
-        temporal_results = store.execute_read(temporal_query, {"growth_thresh": growth_threshold})
+        temporal_results = await store.execute_read(temporal_query, {"growth_thresh": growth_threshold})
         
         for result in temporal_results:
             anomalies.append({
@@ -259,7 +259,8 @@ async def get_duplicates(
     label: str = Query("Company", description="Node label to analyze"),
     similarity_threshold: float = Query(0.85, ge=0, le=1, description="Similarity threshold"),
     limit: int = Query(20, ge=1, le=100, description="Maximum results"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store),
+    projections: ProjectionManager = Depends(get_projection_manager)
 ):
     """
     Detect potential duplicate nodes using GDS similarity.
@@ -272,7 +273,7 @@ async def get_duplicates(
     try:
         # Check if we have nodes
         node_count_query = f"MATCH (n:{label}) RETURN count(n) as count"
-        node_count_results = store.execute_read(node_count_query, {})
+        node_count_results = await store.execute_read(node_count_query, {})
         node_count = node_count_results[0]["count"] if node_count_results else 0
         
         if node_count < 2:
@@ -283,89 +284,55 @@ async def get_duplicates(
                 "message": f"Minimum 2 nodes required for similarity detection (found: {node_count})"
             }
         
-        # Project GDS graph
-        project_query = f"""
-        CALL gds.graph.project(
-            'dedup_graph_{label}',
-            '{label}',
-            '*',
-            {{ undirectedRelationshipTypes: ['*'] }}
-        )
-        YIELD graphName, nodeCount, relationshipCount
-        RETURN graphName, nodeCount, relationshipCount
-        """
-        
-        # Try to project, if fails then drop and retry
-        projection_success = False
-        try:
-            store.execute_write(project_query, {})
-            projection_success = True
-        except Exception as e:
-            # Try dropping and retrying
-            try:
-                store.execute_write(f"CALL gds.graph.drop('dedup_graph_{label}')", {})
-                store.execute_write(project_query, {})
-                projection_success = True
-            except Exception as retry_error:
-                # If still fails, return empty result gracefully
-                return {
-                    "status": "success",
-                    "duplicates": [],
-                    "count": 0,
-                    "message": f"Similarity detection unavailable: {str(retry_error)[:100]}"
-                }
-        
-        if not projection_success:
-            return {
-                "status": "success",
-                "duplicates": [],
-                "count": 0,
-                "message": "GDS projection failed"
-            }
-        
         # Run similarity
-        similarity_query = f"""
-        CALL gds.nodeSimilarity.stream('dedup_graph_{label}')
+        similarity_query = """
+        CALL gds.nodeSimilarity.stream($graph_name)
         YIELD node1, node2, similarity
         WHERE similarity > $threshold
         WITH gds.util.asNode(node1) as n1, gds.util.asNode(node2) as n2, similarity
-        RETURN {{
-          node_1: {{
+        RETURN {
+          node_1: {
             id: elementId(n1),
             label: labels(n1)[0],
             name: coalesce(n1.name, n1.title, 'Unknown'),
             ticker: coalesce(n1.ticker, null)
-          }},
-          node_2: {{
+          },
+          node_2: {
             id: elementId(n2),
             label: labels(n2)[0],
             name: coalesce(n2.name, n2.title, 'Unknown'),
             ticker: coalesce(n2.ticker, null)
-          }},
+          },
           similarity: similarity,
           recommendation: CASE 
             WHEN similarity > 0.95 THEN 'Very likely duplicate - merge recommended'
             WHEN similarity > 0.90 THEN 'Probable duplicate - manual review suggested'
             ELSE 'Possible duplicate - inspect relations'
           END
-        }} as duplicate
+        } as duplicate
         ORDER BY duplicate.similarity DESC
         LIMIT $limit
         """
         
-        results = store.execute_read(similarity_query, {
-            "threshold": similarity_threshold,
-            "limit": limit
-        })
+        try:
+            # Shared projection of the label, all relationships undirected
+            async with projections.use([label], {"ALL": {"type": "*", "orientation": "UNDIRECTED"}}) as graph_name:
+                results = await store.execute_read(similarity_query, {
+                    "graph_name": graph_name,
+                    "threshold": similarity_threshold,
+                    "limit": limit
+                })
+        except Exception as gds_error:
+            # GDS unavailable or projection failed: return empty result gracefully
+            return {
+                "status": "success",
+                "duplicates": [],
+                "count": 0,
+                "message": f"Similarity detection unavailable: {str(gds_error)[:100]}"
+            }
         
         duplicates = [r["duplicate"] for r in results] if results else []
         
-        # Cleanup GDS graph
-        try:
-            store.execute_write(f"CALL gds.graph.drop('dedup_graph_{label}')", {})
-        except Exception:
-            pass
-        
         return {
             "status": "success",
             "duplicates": duplicates,
@@ -377,11 +344,4 @@ async def get_duplicates(
         }
     
     except Exception as e:
-        # Try to cleanup on error
-        try:
-            cleanup_query = f"CALL gds.graph.drop('dedup_graph_{label}')"
-            store.execute_write(cleanup_query, {})
-        except Exception:
-            pass
-        
         raise HTTPException(status_code=500, detail=f"Duplicate detection failed: {str(e)}")
@@ -10,16 +10,40 @@ from libs.ariadne_core.models import (
     SimilarEntitiesResponse,
     Node,
     Edge,
-    Subgraph,
     Event,
     PriceEvent,
 )
-from libs.ariadne_core.storage import GraphStore
-from apps.ariadne_api.main import get_graph_store
+from libs.ariadne_core.storage import AsyncGraphStore, ProjectionManager, ResultCache
+from libs.ariadne_core.utils import plain_properties, GraphCollector
+from apps.ariadne_api.main import get_async_graph_store, get_projection_manager, GraphJSONResponse
 from datetime import datetime
 from typing import List
+import asyncio
+import os
+import re
+
+router = APIRouter(default_response_class=GraphJSONResponse)
+
+# /context: fulltext seeds per topic, neighbours kept per node and hop, cached subgraphs
+TOPIC_INDEX = "nodeTopicFulltext"
+TOPIC_MAX_SEEDS = int(os.getenv("ARIADNE_TOPIC_MAX_SEEDS", "25"))
+TOPIC_MIN_SCORE_RATIO = float(os.getenv("ARIADNE_TOPIC_MIN_SCORE_RATIO", "0.2"))
+CONTEXT_HOP_LIMIT = int(os.getenv("ARIADNE_CONTEXT_HOP_LIMIT", "50"))
+context_cache = ResultCache(
+    ttl=float(os.getenv("ARIADNE_CONTEXT_CACHE_TTL", "60")),
+    max_entries=int(os.getenv("ARIADNE_CONTEXT_CACHE_SIZE", "256")),
+)
+
 
-router = APIRouter()
+def topic_lucene_query(topic: str) -> str:
+    """Fulltext query for a topic: every word as a prefix, with "supply chain" also matching supply_chain"""
+    words = re.findall(r"[^\W_]+", topic.lower())
+    if not words:
+        return ""
+    query = "(" + " AND ".join(f"{w}*" for w in words) + ")"
+    if len(words) > 1:
+        query += " OR " + "_".join(words) + "*"
+    return query
 
 
 @router.get("/context", response_model=ContextResponse)
@@ -29,7 +53,7 @@ async def get_context(
     as_of: datetime | None = None,
     depth: int = 2,
     limit: int = 200,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Get contextual subgraph for a topic or set of tickers.
@@ -38,105 +62,74 @@ async def get_context(
     if not topic and not tickers:
         raise HTTPException(status_code=400, detail="Either topic or tickers must be provided")
 
-    # Normalize arbitrary Neo4j types (Date/DateTime) into JSONable values
-    def _normalize(value):
-        try:
-            if value is None:
-                return None
-            if isinstance(value, (str, int, float, bool)):
-                return value
-            if isinstance(value, list):
-                return [_normalize(v) for v in value]
-            if isinstance(value, dict):
-                return {k: _normalize(v) for k, v in value.items()}
-            # Neo4j temporal types expose to_native()
-            if hasattr(value, "to_native"):
-                native = value.to_native()
-                return native.isoformat() if hasattr(native, "isoformat") else native
-            # Python datetime/date
-            if hasattr(value, "isoformat"):
-                return value.isoformat()
-            return str(value)
-        except Exception:
-            return str(value)
-
     # Build time conditions for relationships if as_of provided
     r1_time_cond = ""
     r2_time_cond = ""
     if as_of:
         r1_time_cond = " WHERE ((r1.valid_from IS NULL OR r1.valid_from <= $as_of) AND (r1.valid_to IS NULL OR r1.valid_to >= $as_of))"
-        r2_time_cond = " WHERE $depth >= 2 AND ((r2.valid_from IS NULL OR r2.valid_from <= $as_of) AND (r2.valid_to IS NULL OR r2.valid_to >= $as_of))"
+        r2_time_cond = " AND ((r2.valid_from IS NULL OR r2.valid_from <= $as_of) AND (r2.valid_to IS NULL OR r2.valid_to >= $as_of))"
+
+    # Seeds come from an index (ticker constraint / fulltext), each hop keeps at most CONTEXT_HOP_LIMIT
+    # neighbours per node: the cost follows the neighbourhood, not the size of the graph
+    expand = (
+        "CALL { WITH n OPTIONAL MATCH (n)-[r1]-(n1)" + r1_time_cond + " RETURN r1, n1 LIMIT $hop_limit } "
+        "CALL { WITH n1 OPTIONAL MATCH (n1)-[r2]-(n2) WHERE $depth >= 2" + r2_time_cond + " "
+        "RETURN r2, n2 LIMIT $hop_limit } "
+        "RETURN n, r1, n1, r2, n2 LIMIT $limit"
+    )
 
-    try:
-        params: dict = {"limit": limit, "depth": depth}
+    async def load_subgraph() -> tuple[list[dict], list[dict]]:
+        params: dict = {"limit": limit, "depth": depth, "hop_limit": CONTEXT_HOP_LIMIT}
         if as_of:
             params["as_of"] = as_of.isoformat()
 
         if tickers:
             params["tickers"] = tickers
-            simple_query = (
-                "MATCH (c:Company) WHERE c.ticker IN $tickers "
-                "OPTIONAL MATCH (c)-[r1]-(n1)" + r1_time_cond + " "
-                "OPTIONAL MATCH (n1)-[r2]-(n2)" + (r2_time_cond or " WHERE $depth >= 2") + " "
-                "RETURN c, r1, n1, r2, n2 LIMIT $limit"
-            )
+            query = "MATCH (n:Company) WHERE n.ticker IN $tickers " + expand
         else:
-            params["topic"] = topic.lower()
-            simple_query = (
-                "MATCH (n) "
-                "WHERE ANY(prop IN ['sector', 'industry', 'name', 'description', 'ticker', 'title', 'type', 'category'] "
-                "    WHERE prop IN keys(n) AND ("
-                "        toLower(toString(n[prop])) CONTAINS $topic "
-                "        OR toLower(replace(toString(n[prop]), '_', ' ')) CONTAINS replace($topic, '_', ' ') "
-                "        OR toLower(replace(toString(n[prop]), ' ', '_')) CONTAINS replace($topic, ' ', '_')"
-                "    )) "
-                "OPTIONAL MATCH (n)-[r1]-(n1)" + r1_time_cond + " "
-                "OPTIONAL MATCH (n1)-[r2]-(n2)" + (r2_time_cond or " WHERE $depth >= 2") + " "
-                "RETURN n, r1, n1, r2, n2 LIMIT $limit"
+            lucene = topic_lucene_query(topic)
+            if not lucene:
+                return [], []
+            params.update({
+                "index": TOPIC_INDEX,
+                "lucene": lucene,
+                "max_seeds": TOPIC_MAX_SEEDS,
+                "min_score_ratio": TOPIC_MIN_SCORE_RATIO,
+            })
+            # Hits arrive best first; keep those within min_score_ratio of the best one
+            query = (
+                "CALL db.index.fulltext.queryNodes($index, $lucene, {limit: $max_seeds}) YIELD node, score "
+                "WITH collect({node: node, score: score}) AS hits "
+                "UNWIND hits AS hit "
+                "WITH hits, hit WHERE hit.score >= hits[0].score * $min_score_ratio "
+                "WITH hit.node AS n " + expand
             )
 
-        results = store.execute_read(simple_query, params)
+        results = await store.execute_read(query, params)
 
-        # Extract unique nodes and edges
-        nodes_dict: dict[str, Node] = {}
-        edges_list: list[Edge] = []
+        # Rows repeat the seed and first hop for every second hop: each element is converted once
+        collector = GraphCollector().add_records(results)
+        return collector.nodes, collector.edges
 
-        for record in results:
-            for key, val in record.items():
-                if val is None:
-                    continue
-                # Node
-                if hasattr(val, "labels") and hasattr(val, "id"):
-                    node_id = str(val.element_id)  # Use element_id for Neo4j 5.x compatibility
-                    if node_id not in nodes_dict:
-                        props = {k: _normalize(v) for k, v in dict(val).items()}
-                        nodes_dict[node_id] = Node(
-                            id=node_id,
-                            label=list(val.labels)[0] if getattr(val, "labels", None) else "Unknown",
-                            properties=props
-                        )
-                # Relationship
-                elif hasattr(val, "type") and hasattr(val, "start_node") and hasattr(val, "end_node"):
-                    props = {k: _normalize(v) for k, v in dict(val).items()}
-                    edges_list.append(Edge(
-                        source_id=str(val.start_node.element_id),
-                        target_id=str(val.end_node.element_id),
-                        rel_type=val.type,
-                        properties=props
-                    ))
-
-        nodes = list(nodes_dict.values())
+    try:
+        cache_key = (
+            topic.lower() if topic else None,
+            tuple(sorted(tickers)),
+            depth,
+            limit,
+            as_of.isoformat() if as_of else None,
+        )
+        nodes, edges_list = await context_cache.get_or_load(cache_key, load_subgraph)
 
         query_str = topic if topic else f"tickers: {', '.join(tickers)}"
         summary = f"Found {len(nodes)} nodes and {len(edges_list)} edges for {query_str}"
 
-        subgraph = Subgraph(nodes=nodes, edges=edges_list, summary=summary)
-
-        return ContextResponse(
-            query=query_str,
-            subgraph=subgraph,
-            as_of=as_of
-        )
+        # Already in ContextResponse shape: rendered as-is instead of re-validated node by node
+        return GraphJSONResponse({
+            "query": query_str,
+            "subgraph": {"nodes": nodes, "edges": edges_list, "summary": summary},
+            "as_of": as_of
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
 
@@ -147,31 +140,12 @@ async def get_impact(
     event_query: str | None = None,
     k: int = 10,
     as_of: datetime | None = None,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Rank entities impacted by an event.
     Uses edge weights and graph centrality.
     """
-    # Normalizer für Neo4j Typen
-    def _normalize(value):
-        try:
-            if value is None:
-                return None
-            if isinstance(value, (str, int, float, bool)):
-                return value
-            if isinstance(value, list):
-                return [_normalize(v) for v in value]
-            if isinstance(value, dict):
-                return {k: _normalize(v) for k, v in value.items()}
-            if hasattr(value, "to_native"):
-                native = value.to_native()
-                return native.isoformat() if hasattr(native, "isoformat") else native
-            if hasattr(value, "isoformat"):
-                return value.isoformat()
-            return str(value)
-        except Exception:
-            return str(value)
     
     if not event_id and not event_query:
         raise HTTPException(status_code=400, detail="Either event_id or event_query must be provided")
@@ -184,7 +158,7 @@ async def get_impact(
         event_find_query = "MATCH (e:Event) WHERE e.title CONTAINS $query RETURN e LIMIT 1"
         params = {"query": event_query}
     
-    event_results = store.execute_read(event_find_query, params)
+    event_results = await store.execute_read(event_find_query, params)
     
     if not event_results:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -236,7 +210,7 @@ async def get_impact(
         LIMIT $k
     """
     
-    impact_results = store.execute_read(impact_query, {
+    impact_results = await store.execute_read(impact_query, {
         "event_element_id": event_node.element_id,
         "k": k
     })
@@ -248,7 +222,7 @@ async def get_impact(
             "node": Node(
                 id=str(target_node.element_id),
                 label=list(target_node.labels)[0] if target_node.labels else "Unknown",
-                properties={k: _normalize(v) for k, v in dict(target_node).items()}
+                properties=plain_properties(target_node)
             ),
             "impact": record.get("impact", 0.5),
             "paths": record.get("indirect_count", 0)
@@ -266,7 +240,7 @@ async def get_timeline(
     ticker: str | None = None,
     from_date: datetime | None = None,
     to_date: datetime | None = None,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Get timeline of events and price events for an entity.
@@ -282,36 +256,17 @@ async def get_timeline(
         entity_query = "MATCH (n) WHERE id(n) = $entity_id RETURN n"
         params = {"entity_id": int(entity_id)}
     
-    entity_results = store.execute_read(entity_query, params)
+    entity_results = await store.execute_read(entity_query, params)
     
     if not entity_results:
         raise HTTPException(status_code=404, detail="Entity not found")
     
     entity_node = entity_results[0].get("c") or entity_results[0].get("n")
-    # Normalizer for neo4j temporal/property values
-    def _normalize(value):
-        try:
-            if value is None:
-                return None
-            if isinstance(value, (str, int, float, bool)):
-                return value
-            if isinstance(value, list):
-                return [_normalize(v) for v in value]
-            if isinstance(value, dict):
-                return {k: _normalize(v) for k, v in value.items()}
-            if hasattr(value, "to_native"):
-                native = value.to_native()
-                return native.isoformat() if hasattr(native, "isoformat") else native
-            if hasattr(value, "isoformat"):
-                return value.isoformat()
-            return str(value)
-        except Exception:
-            return str(value)
 
     entity = Node(
         id=str(entity_node.element_id),
         label=list(entity_node.labels)[0] if entity_node.labels else "Unknown",
-        properties={k: _normalize(v) for k, v in dict(entity_node).items()}
+        properties=plain_properties(entity_node)
     )
     
     # Build time filter
@@ -323,7 +278,7 @@ async def get_timeline(
         time_filter += " AND e.occurred_at <= datetime($to_date)"
         params["to_date"] = to_date.isoformat() if hasattr(to_date, "isoformat") else str(to_date)
     
-    # Get events
+    # Events, price events and changed relations only depend on the entity: fetch them concurrently
     events_query = f"""
         MATCH (entity)-[:MENTIONS|AFFECTS]-(e:Event)
         WHERE id(entity) = $entity_id {time_filter}
@@ -332,7 +287,29 @@ async def get_timeline(
     """
     params["entity_id"] = entity_node.id
     
-    events_results = store.execute_read(events_query, params)
+    price_events_time = time_filter.replace('e.occurred_at', 'pe.occurred_at')
+    price_events_query = f"""
+        MATCH (i:Instrument)-[:PRICE_EVENT_OF]-(pe:PriceEvent)
+        WHERE i.symbol = $symbol {price_events_time}
+        RETURN pe
+        ORDER BY pe.occurred_at DESC
+    """
+    params["symbol"] = entity.properties.get("ticker", "")
+    
+    relations_query = f"""
+        MATCH (entity)-[r]-(other)
+        WHERE id(entity) = $entity_id
+        AND r.valid_from IS NOT NULL
+        {time_filter.replace('e.occurred_at', 'r.valid_from')}
+        RETURN r, other
+        ORDER BY r.valid_from DESC
+    """
+    
+    events_results, price_events_results, relations_results = await asyncio.gather(
+        store.execute_read(events_query, params),
+        store.execute_read(price_events_query, params),
+        store.execute_read(relations_query, params),
+    )
 
     def _to_dt(val):
         try:
@@ -362,20 +339,6 @@ async def get_timeline(
             )
         )
     
-    # Get price events
-    price_events_time = time_filter.replace('e.occurred_at', 'pe.occurred_at')
-    # Ensure datetime() in replaced filter as well
-    price_events_time = price_events_time.replace('datetime($from_date)', 'datetime($from_date)')
-    price_events_time = price_events_time.replace('datetime($to_date)', 'datetime($to_date)')
-    price_events_query = f"""
-        MATCH (i:Instrument)-[:PRICE_EVENT_OF]-(pe:PriceEvent)
-        WHERE i.symbol = $symbol {price_events_time}
-        RETURN pe
-        ORDER BY pe.occurred_at DESC
-    """
-    params["symbol"] = entity.properties.get("ticker", "")
-    
-    price_events_results = store.execute_read(price_events_query, params)
     price_events = []
     for record in price_events_results:
         pe_node = record["pe"]
@@ -386,23 +349,12 @@ async def get_timeline(
                 symbol=pe_props.get("symbol", ""),
                 event_type=pe_props.get("event_type", "unknown"),
                 occurred_at=_to_dt(pe_props.get("occurred_at")),
-                properties={k: _normalize(v) for k, v in pe_props.items()},
+                properties=plain_properties(pe_node),
                 source=pe_props.get("source", "price_detector"),
                 confidence=pe_props.get("confidence", 1.0)
             )
         )
     
-    # Get relations that changed in time window
-    relations_query = f"""
-        MATCH (entity)-[r]-(other)
-        WHERE id(entity) = $entity_id
-        AND r.valid_from IS NOT NULL
-        {time_filter.replace('e.occurred_at', 'r.valid_from')}
-        RETURN r, other
-        ORDER BY r.valid_from DESC
-    """
-    
-    relations_results = store.execute_read(relations_query, params)
     relations = []
     for record in relations_results:
         rel = record["r"]
@@ -411,7 +363,7 @@ async def get_timeline(
                 source_id=str(rel.start_node.element_id),
                 target_id=str(rel.end_node.element_id),
                 rel_type=rel.type,
-                properties={k: _normalize(v) for k, v in dict(rel).items()}
+                properties=plain_properties(rel)
             )
         )
     
@@ -428,33 +380,15 @@ async def get_similar_entities(
     ticker: str,
     method: str = "weighted_jaccard",  # "weighted_jaccard" | "gds"
     limit: int = 10,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store),
+    projections: ProjectionManager = Depends(get_projection_manager)
 ):
     """
     Ähnliche Unternehmen über gewichtete Nachbarschaft oder optional GDS NodeSimilarity.
     """
-    # Normalizer für Neo4j Typen (z. B. DateTime)
-    def _normalize(value):
-        try:
-            if value is None:
-                return None
-            if isinstance(value, (str, int, float, bool)):
-                return value
-            if isinstance(value, list):
-                return [_normalize(v) for v in value]
-            if isinstance(value, dict):
-                return {k: _normalize(v) for k, v in value.items()}
-            if hasattr(value, "to_native"):
-                native = value.to_native()
-                return native.isoformat() if hasattr(native, "isoformat") else native
-            if hasattr(value, "isoformat"):
-                return value.isoformat()
-            return str(value)
-        except Exception:
-            return str(value)
     # Quelle finden
     source_query = "MATCH (c:Company {ticker: $ticker}) RETURN c"
-    source_results = store.execute_read(source_query, {"ticker": ticker})
+    source_results = await store.execute_read(source_query, {"ticker": ticker})
     if not source_results:
         raise HTTPException(status_code=404, detail="Company not found")
 
@@ -462,43 +396,33 @@ async def get_similar_entities(
     source = Node(
         id=str(source_node.element_id),
         label="Company",
-        properties={k: _normalize(v) for k, v in dict(source_node).items()}
+        properties=plain_properties(source_node)
     )
 
     # Optional: GDS NodeSimilarity
     if method.lower() == "gds":
         try:
             # Prüfe GDS
-            gds_check = store.execute_read("RETURN gds.version() AS version", {})
+            gds_check = await store.execute_read("RETURN gds.version() AS version", {})
             if gds_check:
-                # Projektieren (nur Company-Kanten, sinnvoll gewichtet)
-                try:
-                    store.execute_write("CALL gds.graph.drop('similarity-graph')", {})
-                except Exception:
-                    pass
-
-                project = """
-                    CALL gds.graph.project(
-                        'similarity-graph',
-                        'Company',
-                        {
-                            COMPETES_WITH: {orientation: 'UNDIRECTED'},
-                            SUPPLIES_TO: {orientation: 'UNDIRECTED'},
-                            CORRELATED_WITH: {orientation: 'UNDIRECTED'}
-                        }
-                    )
-                """
-                store.execute_write(project, {})
-
+                # Projektion (nur Company-Kanten) wird zwischen Requests geteilt
+                company_edges = {
+                    "COMPETES_WITH": {"orientation": "UNDIRECTED"},
+                    "SUPPLIES_TO": {"orientation": "UNDIRECTED"},
+                    "CORRELATED_WITH": {"orientation": "UNDIRECTED"},
+                }
                 stream_query = (
-                    "CALL gds.nodeSimilarity.stream('similarity-graph') "
+                    "CALL gds.nodeSimilarity.stream($graph_name) "
                     "YIELD node1, node2, similarity "
                     "WITH gds.util.asNode(node1) AS n1, gds.util.asNode(node2) AS n2, similarity "
                     "WHERE n1.ticker = $ticker "
                     "RETURN n2 AS similar, similarity "
                     "ORDER BY similarity DESC LIMIT $limit"
                 )
-                gds_results = store.execute_read(stream_query, {"ticker": ticker, "limit": limit})
+                async with projections.use(["Company"], company_edges) as graph_name:
+                    gds_results = await store.execute_read(
+                        stream_query, {"graph_name": graph_name, "ticker": ticker, "limit": limit}
+                    )
 
                 similar = []
                 for record in gds_results:
@@ -507,15 +431,12 @@ async def get_similar_entities(
                         "node": Node(
                             id=str(sim_node.element_id),
                             label="Company",
-                            properties={k: _normalize(v) for k, v in dict(sim_node).items()}
+                            properties=plain_properties(sim_node)
                         ),
                         "similarity": float(record.get("similarity", 0.0)),
                         "shared_relations": None
                     })
 
-                # Aufräumen
-                store.execute_write("CALL gds.graph.drop('similarity-graph')", {})
-
                 return SimilarEntitiesResponse(source=source, similar=similar)
         except Exception:
             # Fallback auf weighted_jaccard
@@ -543,7 +464,7 @@ async def get_similar_entities(
         ORDER BY shared_count DESC
         LIMIT $limit
     """
-    results = store.execute_read(similarity_query, {"ticker": ticker, "limit": max(limit, 5)})
+    results = await store.execute_read(similarity_query, {"ticker": ticker, "limit": max(limit, 5)})
 
     def sum_weights(types: list[str]) -> float:
         return float(sum(weight_map.get(t, 0.5) for t in types))
@@ -572,7 +493,7 @@ async def get_similar_entities(
             "node": Node(
                 id=str(sim_node.element_id),
                 label="Company",
-                properties={k: _normalize(v) for k, v in dict(sim_node).items()}
+                properties=plain_properties(sim_node)
             ),
             "similarity": float(score),
             "shared_relations": int(record.get("shared_count", 0))
@@ -590,7 +511,7 @@ async def search_patterns(
     category: str | None = None,
     min_confidence: float = 0.7,
     min_occurrences: int = 1,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """Search validated patterns by criteria"""
     try:
@@ -617,7 +538,7 @@ async def search_patterns(
             LIMIT 50
         """
         
-        results = store.execute_read(query, params)
+        results = await store.execute_read(query, params)
         
         patterns = []
         for record in results:
@@ -635,11 +556,11 @@ async def search_patterns(
                 "manifold_source_id": p_data.get("manifold_source_id")
             })
         
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "count": len(patterns),
             "patterns": patterns
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to search patterns: {str(e)}")
@@ -650,7 +571,7 @@ async def get_pattern_occurrences(
     pattern_id: str,
     from_date: datetime | None = None,
     to_date: datetime | None = None,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """Get historical occurrences of pattern with outcomes"""
     try:
@@ -659,12 +580,12 @@ async def get_pattern_occurrences(
             MATCH (p:Pattern {id: $pattern_id})
             RETURN p
         """
-        pattern_result = store.execute_read(pattern_query, {"pattern_id": pattern_id})
+        pattern_result = await store.execute_read(pattern_query, {"pattern_id": pattern_id})
         
         if not pattern_result:
             raise HTTPException(status_code=404, detail=f"Pattern {pattern_id} not found")
         
-        pattern_data = dict(pattern_result[0]["p"])
+        pattern_data = plain_properties(pattern_result[0]["p"])
         
         # Get events where pattern was observed
         time_filter = ""
@@ -686,23 +607,23 @@ async def get_pattern_occurrences(
             LIMIT 100
         """
         
-        occurrence_results = store.execute_read(occurrences_query, params)
+        occurrence_results = await store.execute_read(occurrences_query, params)
         
         occurrences = [
             {
-                "event_id": dict(res["e"]).get("id"),
-                "title": dict(res["e"]).get("title"),
-                "occurred_at": dict(res["e"]).get("occurred_at"),
-                "outcome": dict(res["e"]).get("outcome")
+                "event_id": res["e"].get("id"),
+                "title": res["e"].get("title"),
+                "occurred_at": res["e"].get("occurred_at"),
+                "outcome": res["e"].get("outcome")
             }
             for res in occurrence_results
         ]
         
-        return {
+        return GraphJSONResponse({
             "pattern": pattern_data,
             "occurrences": occurrences,
             "count": len(occurrences)
-        }
+        })
     
     except HTTPException:
         raise
@@ -712,7 +633,7 @@ async def get_pattern_occurrences(
 
 @router.get("/regimes/current")
 async def get_current_regime(
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """Get current market regime(s)"""
     try:
@@ -724,7 +645,7 @@ async def get_current_regime(
             LIMIT 5
         """
         
-        results = store.execute_read(query, {})
+        results = await store.execute_read(query, {})
         
         regimes = []
         for record in results:
@@ -739,11 +660,11 @@ async def get_current_regime(
                 "confidence": r_data.get("confidence")
             })
         
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "count": len(regimes),
             "regimes": regimes
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get current regime: {str(e)}")
@@ -753,7 +674,7 @@ async def get_current_regime(
 async def find_similar_regimes(
     characteristics: List[str] = Query(default=[]),
     limit: int = 5,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """Find historical regimes with similar characteristics"""
     try:
@@ -769,7 +690,7 @@ async def find_similar_regimes(
             LIMIT $limit
         """
         
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "characteristics": characteristics,
             "limit": limit
         })
@@ -788,12 +709,12 @@ async def find_similar_regimes(
                 "match_count": record["match_count"]
             })
         
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "query_characteristics": characteristics,
             "count": len(similar_regimes),
             "regimes": similar_regimes
-        }
+        })
     
     except HTTPException:
         raise
@@ -810,7 +731,7 @@ async def search_nodes(
     text: str = Query(..., min_length=1, description="Suchtext"),
     labels: str | None = Query(None, description="Komma-separierte Node-Labels (z.B. 'Company,Event')"),
     limit: int = Query(10, ge=1, le=100),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Freie Textsuche über alle Nodes via Fulltext-Index.
@@ -832,14 +753,14 @@ async def search_nodes(
             LIMIT $limit
         """
         
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "text": text,
             "limit": limit
         })
         
         nodes = []
         for record in results:
-            node = dict(record["node"])
+            node = plain_properties(record["node"])
             labels = list(record["node"].labels) if hasattr(record["node"], "labels") else []
             nodes.append({
                 "id": node.get("id"),
@@ -849,12 +770,12 @@ async def search_nodes(
                 "properties": node
             })
         
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "query": text,
             "count": len(nodes),
             "results": nodes
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -866,7 +787,7 @@ async def find_path(
     to_id: str = Query(..., description="End Node ID"),
     max_hops: int = Query(5, ge=1, le=20),
     algo: str = Query("shortest", regex="^(shortest|ksp)$"),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Finde Pfade zwischen zwei Nodes mittels APOC.
@@ -897,30 +818,32 @@ async def find_path(
             LIMIT 10
         """
         
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "from_id": int(from_id) if from_id.isdigit() else from_id,
             "to_id": int(to_id) if to_id.isdigit() else to_id,
             "max_hops": max_hops
         })
         
+        # Paths from one start share most of their nodes: convert each node/edge once
+        collector = GraphCollector()
         paths = []
         for record in results:
             path = record["path"]
-            nodes = [dict(n) for n in path.nodes]
-            edges = [{"type": r.type, "properties": dict(r)} for r in path.relationships]
+            nodes = [collector.node(n)["properties"] for n in path.nodes]
+            edges = [{"type": r.type, "properties": collector.edge(r)["properties"]} for r in path.relationships]
             paths.append({
                 "length": len(path),
                 "nodes": nodes,
                 "edges": edges
             })
         
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "from": from_id,
             "to": to_id,
             "path_count": len(paths),
             "paths": paths
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Path finding failed: {str(e)}")
@@ -932,7 +855,7 @@ async def get_time_slice(
     topic: str | None = Query(None),
     tickers: str | None = Query(None, description="Komma-separierte Tickers"),
     limit: int = Query(100, ge=1, le=1000),
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Hole Graph-Snapshot zu einem bestimmten Zeitpunkt via valid_from/valid_to.
@@ -958,18 +881,19 @@ async def get_time_slice(
             LIMIT $limit
         """
         
-        results = store.execute_read(query, {
+        results = await store.execute_read(query, {
             "as_of": as_of,
             "limit": limit
         })
         
+        collector = GraphCollector()
         nodes = {}
         edges = []
         
         for record in results:
-            source = dict(record["source"])
-            target = dict(record["target"])
-            rel = dict(record["r"])
+            source = collector.node(record["source"])["properties"]
+            target = collector.node(record["target"])["properties"]
+            rel = collector.edge(record["r"])["properties"]
             
             # Deduplicate nodes by ID
             sid = source.get("id", str(id(record["source"])))
@@ -984,14 +908,14 @@ async def get_time_slice(
                 "properties": rel
             })
         
-        return {
+        return GraphJSONResponse({
             "status": "success",
             "as_of": as_of,
             "node_count": len(nodes),
             "edge_count": len(edges),
             "nodes": list(nodes.values()),
             "edges": edges
-        }
+        })
     
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid datetime format. Use ISO format: YYYY-MM-DDTHH:MM:SS")
@@ -3,6 +3,7 @@ Validation workflow endpoints for hypothesis evidence and validation
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from libs.ariadne_core.models import (
     EvidenceRequest,
     ValidationRequest,
@@ -11,10 +12,10 @@ from libs.ariadne_core.models import (
     Hypothesis,
     Pattern
 )
-from libs.ariadne_core.storage import GraphStore
+from libs.ariadne_core.storage import GraphStore, AsyncGraphStore
 from libs.ariadne_core.services import PatternExtractor
 from libs.ariadne_core.utils import ManifoldSync
-from apps.ariadne_api.main import get_graph_store
+from apps.ariadne_api.main import get_graph_store, get_async_graph_store
 from datetime import datetime
 import uuid
 
@@ -25,7 +26,7 @@ router = APIRouter()
 async def add_evidence(
     hypothesis_id: str,
     request: EvidenceRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Add evidence annotation to hypothesis.
@@ -37,7 +38,7 @@ async def add_evidence(
             MATCH (h:Hypothesis {id: $hypothesis_id})
             RETURN h
         """
-        hyp_result = store.execute_read(hyp_query, {"hypothesis_id": hypothesis_id})
+        hyp_result = await store.execute_read(hyp_query, {"hypothesis_id": hypothesis_id})
         
         if not hyp_result:
             raise HTTPException(status_code=404, detail=f"Hypothesis {hypothesis_id} not found")
@@ -58,7 +59,7 @@ async def add_evidence(
             RETURN r
         """
         
-        store.execute_write(edge_query, {
+        await store.execute_write(edge_query, {
             "hypothesis_id": hypothesis_id,
             "evidence_id": request.evidence_source_id,
             "confidence": request.confidence,
@@ -77,7 +78,7 @@ async def add_evidence(
                    h.validation_threshold as threshold
         """
         
-        update_result = store.execute_write(update_query, {"hypothesis_id": hypothesis_id})
+        update_result = await store.execute_write(update_query, {"hypothesis_id": hypothesis_id})
         
         # Access aliased return fields; fallback defaults for safety
         evidence_count = update_result["evidence_count"] if update_result else 0
@@ -106,7 +107,8 @@ async def add_evidence(
 async def validate_hypothesis(
     hypothesis_id: str,
     request: ValidationRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store),
+    sync_store: GraphStore = Depends(get_graph_store)
 ):
     """
     Final validation decision by agent.
@@ -119,7 +121,7 @@ async def validate_hypothesis(
             MATCH (h:Hypothesis {id: $hypothesis_id})
             RETURN h
         """
-        hyp_result = store.execute_read(hyp_query, {"hypothesis_id": hypothesis_id})
+        hyp_result = await store.execute_read(hyp_query, {"hypothesis_id": hypothesis_id})
         
         if not hyp_result:
             raise HTTPException(status_code=404, detail=f"Hypothesis {hypothesis_id} not found")
@@ -144,7 +146,7 @@ async def validate_hypothesis(
             RETURN h
         """
         
-        store.execute_write(update_query, {
+        await store.execute_write(update_query, {
             "hypothesis_id": hypothesis_id,
             "status": new_status,
             "validated_by": request.validated_by,
@@ -161,7 +163,7 @@ async def validate_hypothesis(
                 MATCH (e)-[r:EVIDENCE_FOR]->(h:Hypothesis {id: $hypothesis_id})
                 RETURN e, r
             """
-            evidence_results = store.execute_read(evidence_query, {"hypothesis_id": hypothesis_id})
+            evidence_results = await store.execute_read(evidence_query, {"hypothesis_id": hypothesis_id})
             
             # Convert to Hypothesis and Evidence objects
             # Robustly parse created_at from Neo4j (string or neo4j.time.DateTime)
@@ -205,11 +207,12 @@ async def validate_hypothesis(
             ]
             
             # Extract pattern
-            extractor = PatternExtractor(store)
+            # (PatternExtractor is synchronous: its writes run in the threadpool)
+            extractor = PatternExtractor(sync_store)
             pattern = extractor.extract_pattern_from_hypothesis(hypothesis, evidence_edges)
             
             # Create pattern node
-            pattern_node = extractor.create_pattern_node(pattern)
+            pattern_node = await run_in_threadpool(extractor.create_pattern_node, pattern)
             pattern_id = pattern.id
             
             # Link pattern to hypothesis
@@ -219,14 +222,14 @@ async def validate_hypothesis(
                 SET r.created_at = datetime()
                 RETURN r
             """
-            store.execute_write(link_query, {
+            await store.execute_write(link_query, {
                 "pattern_id": pattern_id,
                 "hypothesis_id": hypothesis_id
             })
             
             # Link pattern to evidence
             evidence_ids = [dict(res["e"]).get("id") for res in evidence_results]
-            extractor.link_pattern_to_evidence(pattern_id, evidence_ids)
+            await run_in_threadpool(extractor.link_pattern_to_evidence, pattern_id, evidence_ids)
             
             pattern_created = True
         
@@ -248,7 +251,7 @@ async def validate_hypothesis(
 @router.get("/hypotheses/pending-validation")
 async def get_pending_validations(
     min_annotations: int = 3,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Get hypotheses that have reached validation threshold.
@@ -273,7 +276,7 @@ async def get_pending_validations(
             LIMIT 50
         """
         
-        results = store.execute_read(query, {"min_annotations": min_annotations})
+        results = await store.execute_read(query, {"min_annotations": min_annotations})
         
         hypotheses = []
         for record in results:
@@ -311,7 +314,7 @@ async def get_pending_validations(
 @router.get("/hypotheses/{hypothesis_id}")
 async def get_hypothesis(
     hypothesis_id: str,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """Get detailed hypothesis with evidence"""
     try:
@@ -320,7 +323,7 @@ async def get_hypothesis(
             MATCH (h:Hypothesis {id: $hypothesis_id})
             RETURN h
         """
-        hyp_result = store.execute_read(hyp_query, {"hypothesis_id": hypothesis_id})
+        hyp_result = await store.execute_read(hyp_query, {"hypothesis_id": hypothesis_id})
         
         if not hyp_result:
             raise HTTPException(status_code=404, detail=f"Hypothesis {hypothesis_id} not found")
@@ -332,14 +335,14 @@ async def get_hypothesis(
             MATCH (e)-[r:EVIDENCE_FOR]->(h:Hypothesis {id: $hypothesis_id})
             RETURN e, r
         """
-        evidence_results = store.execute_read(evidence_query, {"hypothesis_id": hypothesis_id})
+        evidence_results = await store.execute_read(evidence_query, {"hypothesis_id": hypothesis_id})
         
         # Get contradictions
         contra_query = """
             MATCH (e)-[r:CONTRADICTS]->(h:Hypothesis {id: $hypothesis_id})
             RETURN e, r
         """
-        contra_results = store.execute_read(contra_query, {"hypothesis_id": hypothesis_id})
+        contra_results = await store.execute_read(contra_query, {"hypothesis_id": hypothesis_id})
         
         supporting_evidence = [
             {
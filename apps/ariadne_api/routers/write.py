@@ -12,8 +12,8 @@ from libs.ariadne_core.models import (
     HypothesisResponse,
     Edge,
 )
-from libs.ariadne_core.storage import GraphStore
-from apps.ariadne_api.main import get_graph_store
+from libs.ariadne_core.storage import AsyncGraphStore
+from apps.ariadne_api.main import get_async_graph_store
 from datetime import datetime
 import uuid
 
@@ -23,7 +23,7 @@ router = APIRouter()
 @router.post("/fact", response_model=FactResponse)
 async def add_fact(
     request: FactRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Add or update a fact (edge) with provenance.
@@ -35,8 +35,8 @@ async def add_fact(
         source_query = f"MATCH (s:{request.source_label}) WHERE id(s) = $id RETURN s"
         target_query = f"MATCH (t:{request.target_label}) WHERE id(t) = $id RETURN t"
         
-        source_exists = store.execute_read(source_query, {"id": int(request.source_id)})
-        target_exists = store.execute_read(target_query, {"id": int(request.target_id)})
+        source_exists = await store.execute_read(source_query, {"id": int(request.source_id)})
+        target_exists = await store.execute_read(target_query, {"id": int(request.target_id)})
         
         if not source_exists:
             raise HTTPException(status_code=404, detail=f"Source node {request.source_id} not found")
@@ -57,7 +57,7 @@ async def add_fact(
         valid_to = request.valid_to or None
 
         # Use temporal merge for consistency
-        rel_dict = store.merge_edge_temporal(
+        rel_dict = await store.merge_edge_temporal(
             source_label=request.source_label,
             source_id=int(request.source_id),
             target_label=request.target_label,
@@ -89,7 +89,7 @@ async def add_fact(
 @router.post("/observation", response_model=ObservationResponse)
 async def add_observation(
     request: ObservationRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Record an agent observation/journal entry.
@@ -111,7 +111,7 @@ async def add_observation(
             RETURN o
         """
         
-        result = store.execute_write(create_query, {
+        result = await store.execute_write(create_query, {
             "id": obs_id,
             "date": request.date.isoformat(),
             "content": request.content,
@@ -137,7 +137,7 @@ async def add_observation(
                 RETURN count(r) as count
             """
             
-            ticker_result = store.execute_write(link_ticker_query, {
+            ticker_result = await store.execute_write(link_ticker_query, {
                 "obs_id": obs_internal_id,
                 "tickers": request.related_tickers
             })
@@ -155,7 +155,7 @@ async def add_observation(
                 RETURN count(r) as count
             """
             
-            event_result = store.execute_write(link_event_query, {
+            event_result = await store.execute_write(link_event_query, {
                 "obs_id": obs_internal_id,
                 "event_ids": [int(eid) for eid in request.related_events]
             })
@@ -178,7 +178,7 @@ async def add_observation(
 @router.post("/hypothesis", response_model=HypothesisResponse)
 async def add_hypothesis(
     request: HypothesisRequest,
-    store: GraphStore = Depends(get_graph_store)
+    store: AsyncGraphStore = Depends(get_async_graph_store)
 ):
     """
     Record a hypothesis edge between entities.
@@ -189,8 +189,8 @@ async def add_hypothesis(
         source_query = f"MATCH (s:{request.source_label}) WHERE elementId(s) = $id RETURN s"
         target_query = f"MATCH (t:{request.target_label}) WHERE elementId(t) = $id RETURN t"
         
-        source_exists = store.execute_read(source_query, {"id": str(request.source_id)})
-        target_exists = store.execute_read(target_query, {"id": str(request.target_id)})
+        source_exists = await store.execute_read(source_query, {"id": str(request.source_id)})
+        target_exists = await store.execute_read(target_query, {"id": str(request.target_id)})
         
         if not source_exists:
             raise HTTPException(status_code=404, detail=f"Source node {request.source_id} not found")
@@ -219,7 +219,7 @@ async def add_hypothesis(
             RETURN h
         """
 
-        store.execute_write(create_h_node, {
+        await store.execute_write(create_h_node, {
             "id": hyp_id,
             "statement": request.hypothesis,
             "source_entity_id": str(request.source_id),
@@ -238,7 +238,7 @@ async def add_hypothesis(
             MERGE (s)-[:SUBJECT_OF]->(h)
             MERGE (h)-[:PERTAINS_TO]->(t)
         """
-        store.execute_write(link_query, {"sid": str(request.source_id), "tid": str(request.target_id), "hid": hyp_id})
+        await store.execute_write(link_query, {"sid": str(request.source_id), "tid": str(request.target_id), "hid": hyp_id})
 
         return HypothesisResponse(status="created", hypothesis_id=hyp_id, manifold_thought_id=request.properties.get("manifold_thought_id"), evidence_count=0, contradiction_count=0, validation_pending=False)
     
@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import os
-from libs.manifold_core.storage.qdrant_store import QdrantStore
+from fastapi import HTTPException
+from libs.manifold_core.storage.qdrant_store import QdrantStore, created_range
+from libs.manifold_core.storage.async_qdrant_store import AsyncQdrantStore
 from libs.manifold_core.embeddings.provider import get_embedding_provider, EmbeddingProvider
+from libs.manifold_core.embeddings.lifecycle import EmbeddingLifecycle
+from libs.manifold_core.embeddings.cache import EmbeddingCache, CachedEmbeddingProvider
+from libs.manifold_core.embeddings.executor import EmbeddingExecutor
 
 _qdrant_store = None
-_embedding_provider = None
+_async_qdrant_store = None
+_embedding_cache = None
 
 
 def get_qdrant_store() -> QdrantStore:
@@ -15,31 +21,91 @@ def get_qdrant_store() -> QdrantStore:
     if not _qdrant_store:
         qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
         collection_name = os.getenv("MANIFOLD_QDRANT_COLLECTION", "manifold_thoughts")
-        _qdrant_store = QdrantStore(qdrant_url=qdrant_url, collection_name=collection_name)
+        _qdrant_store = QdrantStore(
+            qdrant_url=qdrant_url,
+            collection_name=collection_name,
+            vector_dim=int(os.getenv("MANIFOLD_VECTOR_DIM", "1024")),
+            qdrant_path=os.getenv("MANIFOLD_QDRANT_PATH") or None,
+        )
         _qdrant_store.initialize_collection()
     return _qdrant_store
 
 
-def get_embedding_provider_dep() -> EmbeddingProvider:
-    global _embedding_provider
-    if not _embedding_provider:
-        import logging
-        provider_type = os.getenv("MANIFOLD_EMBED_PROVIDER", "local")
-        model_name = os.getenv("MANIFOLD_EMBED_MODEL", "mixedbread-ai/mxbai-embed-large-v1")
-        device = os.getenv("MANIFOLD_EMBED_DEVICE", None)  # None = auto-detect (cuda if available)
-        try:
-            _embedding_provider = get_embedding_provider(provider_type, model_name, device=device)
-        except Exception as e:
-            logging.error(f"Failed to load embedding provider with device={device}: {str(e)}", exc_info=True)
-            # Fallback: try CPU explicitly
-            if device != "cpu":
-                logging.warning(f"Falling back to CPU device")
-                try:
-                    _embedding_provider = get_embedding_provider(provider_type, model_name, device="cpu")
-                except Exception as e2:
-                    logging.error(f"Failed to load embedding provider on CPU: {str(e2)}", exc_info=True)
-                    raise
-            else:
+def get_async_qdrant_store() -> AsyncQdrantStore:
+    """Async read store for async routes (collection setup goes through the sync store)."""
+    global _async_qdrant_store
+    if not _async_qdrant_store:
+        store = get_qdrant_store()
+        _async_qdrant_store = AsyncQdrantStore(store, qdrant_url=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    return _async_qdrant_store
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Process-wide embedding cache (None if MANIFOLD_EMBED_CACHE_PATH is empty)."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        cache_path = os.getenv("MANIFOLD_EMBED_CACHE_PATH", "data/embedding_cache.db")
+        if not cache_path:
+            return None
+        _embedding_cache = EmbeddingCache(
+            cache_path,
+            max_entries=int(os.getenv("MANIFOLD_EMBED_CACHE_MAX_ENTRIES", "50000")),
+        )
+    return _embedding_cache
+
+
+def _create_embedding_provider() -> EmbeddingProvider:
+    provider_type = os.getenv("MANIFOLD_EMBED_PROVIDER", "local")
+    model_name = os.getenv("MANIFOLD_EMBED_MODEL", "mixedbread-ai/mxbai-embed-large-v1")
+    provider = _load_embedding_provider(provider_type, model_name)
+    cache = get_embedding_cache()
+    if cache is None:
+        return provider
+    return CachedEmbeddingProvider(provider, cache, model_id=f"{provider_type}:{model_name}")
+
+
+def _load_embedding_provider(provider_type: str, model_name: str) -> EmbeddingProvider:
+    import logging
+    device = os.getenv("MANIFOLD_EMBED_DEVICE", None)  # None = auto-detect (cuda if available)
+    try:
+        return get_embedding_provider(provider_type, model_name, device=device)
+    except Exception as e:
+        logging.error(f"Failed to load embedding provider with device={device}: {str(e)}", exc_info=True)
+        # Fallback: try CPU explicitly
+        if device != "cpu":
+            logging.warning(f"Falling back to CPU device")
+            try:
+                return get_embedding_provider(provider_type, model_name, device="cpu")
+            except Exception as e2:
+                logging.error(f"Failed to load embedding provider on CPU: {str(e2)}", exc_info=True)
                 raise
-    return _embedding_provider
+        raise
+
+
+# Loaded + warmed in the background at startup (see main.py)
+embedding_lifecycle = EmbeddingLifecycle(_create_embedding_provider)
+
+# Model inference for async routes runs here, not on the request threadpool
+embedding_executor = EmbeddingExecutor(
+    max_workers=int(os.getenv("MANIFOLD_EMBED_WORKERS", "2")),
+    max_pending=int(os.getenv("MANIFOLD_EMBED_MAX_PENDING", "64")),
+)
+
+
+def get_embedding_provider_dep() -> EmbeddingProvider:
+    if embedding_lifecycle.loading:
+        # Don't pile request threads onto the startup load; let clients retry
+        raise HTTPException(
+            status_code=503,
+            detail=f"Embedding model is {embedding_lifecycle.state}, retry shortly",
+            headers={"Retry-After": "5"},
+        )
+    return embedding_lifecycle.get()
+
 
+def validate_date_range(from_dt: str | None, to_dt: str | None) -> None:
+    """Reject from_dt/to_dt that are not ISO datetimes with a 400 before any handler work."""
+    try:
+        created_range(from_dt, to_dt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
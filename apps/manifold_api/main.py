@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import os
+import asyncio
 import logging
 import torch
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apps.manifold_api.routers.thoughts import router as thoughts_router
 from apps.manifold_api.routers.health import router as health_router
+from apps.manifold_api import dependencies
+from apps.manifold_api.dependencies import embedding_lifecycle, embedding_executor
 from apps.manifold_api.routers import search, relations, promote, admin, sessions, workspaces
 from apps.manifold_api.routers import graph as graph_router
 
@@ -58,8 +61,24 @@ async def startup_event():
     
     logger.info(f"📦 Embedding Model: {model_name}")
     logger.info(f"🗄️  Qdrant Collection: {collection}")
-    logger.info(f"🔗 Qdrant URL: {qdrant_url}")
+    if os.getenv("MANIFOLD_QDRANT_PATH"):
+        logger.info(f"🔗 Qdrant: embedded local mode ({os.getenv('MANIFOLD_QDRANT_PATH')})")
+    else:
+        logger.info(f"🔗 Qdrant URL: {qdrant_url}")
     logger.info("=" * 60)
+    
+    # Load + warm the embedding model off the event loop; /health/ready gates on it
+    if os.getenv("MANIFOLD_EAGER_LOAD", "true").lower() != "false":
+        asyncio.create_task(asyncio.to_thread(embedding_lifecycle.preload))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the async Qdrant connection pool and the embedding threads."""
+    if dependencies._async_qdrant_store is not None:
+        await dependencies._async_qdrant_store.close()
+        dependencies._async_qdrant_store = None
+    embedding_executor.shutdown()
 
 
 app.include_router(health_router)
@@ -1,14 +1,29 @@
 # apps/manifold_api/routers/admin.py
 """Admin & correction endpoints for full control."""
 from fastapi import APIRouter, Depends, HTTPException
-from libs.manifold_core.storage.qdrant_store import QdrantStore
+from libs.manifold_core.storage.qdrant_store import QdrantStore, created_range
 from libs.manifold_core.embeddings.provider import EmbeddingProvider
-from apps.manifold_api.dependencies import get_qdrant_store, get_embedding_provider_dep
+from apps.manifold_api.dependencies import get_qdrant_store, get_embedding_provider_dep, get_embedding_cache, validate_date_range
 from datetime import datetime, timedelta
 
+# Thoughts re-embedded per model call during /reindex
+REINDEX_BATCH_SIZE = 128
+
 router = APIRouter(prefix="/v1/memory", tags=["admin"])
 
 
+def _vector_texts(thought: dict, vector_names) -> dict:
+    """Source text for each requested named vector (text, title, summary)."""
+    texts = {}
+    if "text" in vector_names:
+        texts["text"] = thought.get("content", "")
+    if "title" in vector_names:
+        texts["title"] = thought.get("title", "")
+    if "summary" in vector_names:
+        texts["summary"] = thought.get("summary") or thought.get("title") or (thought.get("content", "")[:280])
+    return texts
+
+
 @router.get("/thought/{thought_id}/history")
 def get_history(thought_id: str, store: QdrantStore = Depends(get_qdrant_store)):
     """Version history (placeholder: MVP stores only latest)."""
@@ -47,11 +62,8 @@ def reembed_thought(
     
     vectors_to_update = body.get("vectors", ["text", "title"])
     
-    new_vectors = {}
-    if "text" in vectors_to_update:
-        new_vectors["text"] = embedder.embed(thought.get("content", ""))
-    if "title" in vectors_to_update:
-        new_vectors["title"] = embedder.embed(thought.get("title", ""))
+    texts = _vector_texts(thought, vectors_to_update)
+    new_vectors = embedder.embed_many([texts])[0] if texts else {}
     
     thought["last_embedded_at"] = datetime.utcnow().isoformat() + "Z"
     
@@ -75,28 +87,36 @@ def reindex_collection(
     if filters:
         filter_dict = {"must": [filters]} if isinstance(filters, dict) and "must" not in filters else filters
     
-    # Scan all matching using scroll
-    all_thoughts = store.scroll(payload_filter=filter_dict, limit=10000)
-    
     if dry_run:
         return {
             "status": "ok",
-            "would_reindex": len(all_thoughts),
+            "would_reindex": store.count(filter_dict),
         }
     
-    for point in all_thoughts:
-        tid = point.id
-        payload = point.payload
-        new_vectors = {
-            "text": embedder.embed(payload.get("content", "")),
-            "title": embedder.embed(payload.get("title", "")),
-        }
-        payload["last_embedded_at"] = datetime.utcnow().isoformat() + "Z"
-        store.upsert_point(tid, payload, vectors=new_vectors)
+    # Stream all matching points and re-embed them one batch at a time
+    reindexed = 0
+    batch = []
+    
+    def _flush():
+        all_vectors = embedder.embed_many([
+            _vector_texts(p.payload, ("text", "title", "summary")) for p in batch
+        ])
+        for point, new_vectors in zip(batch, all_vectors):
+            point.payload["last_embedded_at"] = datetime.utcnow().isoformat() + "Z"
+            store.upsert_point(point.id, point.payload, vectors=new_vectors)
+        batch.clear()
+    
+    for point in store.iter_points(filter_dict, page_size=REINDEX_BATCH_SIZE):
+        batch.append(point)
+        reindexed += 1
+        if len(batch) >= REINDEX_BATCH_SIZE:
+            _flush()
+    if batch:
+        _flush()
     
     return {
         "status": "ok",
-        "reindexed": len(all_thoughts),
+        "reindexed": reindexed,
     }
 
 
@@ -112,15 +132,24 @@ def dedupe_thoughts(body: dict, store: QdrantStore = Depends(get_qdrant_store)):
     if filters:
         filter_dict = {"must": [filters]} if isinstance(filters, dict) and "must" not in filters else filters
     
-    # Scan all matching using scroll
-    all_thoughts = store.scroll(payload_filter=filter_dict, limit=10000)
+    pairs, scanned = _near_duplicate_pairs(
+        store,
+        filter_dict,
+        threshold,
+        vector_type=body.get("vector_type", "text"),
+        k=body.get("k", 5),
+    )
+    limit = body.get("limit", 100)
     
-    # For MVP, we return a simple stub indicating the system is ready
     return {
         "status": "ok",
-        "duplicates": [],
-        "scanned": len(all_thoughts),
-        "note": "Semantic deduplication ready - implement duplicate detection logic based on vector similarity"
+        "strategy": strategy,
+        "threshold": threshold,
+        "duplicates": [
+            {"id_1": id_1, "id_2": id_2, "title_1": p1.get("title"), "title_2": p2.get("title"), "similarity": round(score, 4)}
+            for score, id_1, p1, id_2, p2 in pairs[:limit]
+        ],
+        "scanned": scanned,
     }
 
 
@@ -165,16 +194,10 @@ def bulk_unquarantine(body: dict, store: QdrantStore = Depends(get_qdrant_store)
 def bulk_reembed(body: dict, store: QdrantStore = Depends(get_qdrant_store), embedder: EmbeddingProvider = Depends(get_embedding_provider_dep)):
     ids = body.get("ids", [])
     vectors_to_update = body.get("vectors", ["text", "title"])
+    thoughts = store.get_many(ids)
+    all_vectors = embedder.embed_many([_vector_texts(t, vectors_to_update) for t in thoughts.values()])
     updated = 0
-    for thought_id in ids:
-        thought = store.get_by_id(thought_id)
-        if not thought:
-            continue
-        new_vectors = {}
-        if "text" in vectors_to_update:
-            new_vectors["text"] = embedder.embed(thought.get("content", ""))
-        if "title" in vectors_to_update:
-            new_vectors["title"] = embedder.embed(thought.get("title", ""))
+    for (thought_id, thought), new_vectors in zip(thoughts.items(), all_vectors):
         thought["last_embedded_at"] = datetime.utcnow().isoformat() + "Z"
         store.upsert_point(thought_id, thought, vectors=new_vectors)
         updated += 1
@@ -511,10 +534,74 @@ def bulk_check_duplicate(
         raise HTTPException(status_code=500, detail=f"Error checking duplicates: {str(e)}")
 
 
+# Payload fields shown for each side of a duplicate pair (content fetched separately)
+_PAIR_FIELDS = ["title", "type", "summary", "status", "confidence_level", "created_at", "session_id"]
+
+
+def _near_duplicate_pairs(
+    store: QdrantStore,
+    filters: dict | None,
+    threshold: float,
+    vector_type: str = "text",
+    k: int = 5,
+    batch_size: int = 256,
+):
+    """Near-duplicate pairs from one kNN query per thought (batched), within `filters`.
+    
+    Candidates are each thought's top-k neighbours scoring >= threshold, so work
+    grows linearly with the number of thoughts; scores are the exact cosine
+    similarities of the named vector. Returns (pairs, scanned), pairs sorted by
+    score as (score, id_1, payload_1, id_2, payload_2).
+    """
+    pairs = {}
+    scanned = 0
+    batch = []
+    
+    def _search():
+        hit_lists = store.search_batch(
+            vector_type,
+            [vector for _, _, vector in batch],
+            payload_filter=filters,
+            limit=k + 1,  # the thought itself is always its own nearest hit
+            score_threshold=threshold,
+            fields=_PAIR_FIELDS,
+        )
+        for (point_id, payload, _), hits in zip(batch, hit_lists):
+            for hit in hits:
+                hit_id = str(hit.id)
+                if hit_id == point_id:
+                    continue
+                pair_key = tuple(sorted([point_id, hit_id]))
+                if pair_key not in pairs:
+                    pairs[pair_key] = (hit.score, point_id, payload, hit_id, hit.payload or {})
+        batch.clear()
+    
+    for point in store.iter_points(filters, fields=_PAIR_FIELDS, vectors=[vector_type], page_size=batch_size):
+        scanned += 1
+        vector = point.vector.get(vector_type) if isinstance(point.vector, dict) else None
+        if not vector:
+            continue
+        batch.append((str(point.id), point.payload, vector))
+        if len(batch) >= batch_size:
+            _search()
+    if batch:
+        _search()
+    
+    return sorted(pairs.values(), key=lambda pair: pair[0], reverse=True), scanned
+
+
+def _pair_side(point_id: str, payload: dict) -> dict:
+    side = {"id": point_id}
+    side.update({field: payload.get(field) for field in _PAIR_FIELDS})
+    return side
+
+
 @router.get("/warnings/duplicates")
 def get_duplicate_warnings(
     threshold: float = 0.92,
     limit: int = 100,
+    k: int = 5,
+    vector_type: str = "text",
     session_id: str | None = None,
     workspace_id: str | None = None,
     from_dt: str | None = None,
@@ -524,8 +611,11 @@ def get_duplicate_warnings(
 ):
     """Find potential duplicate thoughts in the system.
     
+    Each thought's k nearest neighbours (by `vector_type`) scoring >= threshold are
+    reported as pairs with their cosine similarity, highest first.
     Supports temporal filtering via from_dt/to_dt (ISO format) or days (relative from now).
     """
+    validate_date_range(from_dt, to_dt)
     try:
         # Determine effective date range
         eff_from = from_dt
@@ -541,69 +631,32 @@ def get_duplicate_warnings(
             must.append({"key": "session_id", "match": {"value": session_id}})
         if workspace_id:
             must.append({"key": "workspace_id", "match": {"value": workspace_id}})
-        if eff_from:
-            must.append({"key": "created_at", "range": {"gte": eff_from}})
-        if eff_to:
-            must.append({"key": "created_at", "range": {"lte": eff_to}})
+        must.extend(created_range(eff_from, eff_to))
         
         filters = {"must": must} if must else None
         
-        # Scan all thoughts
-        all_points = store.scroll(payload_filter=filters, limit=10000)
+        # Vector near-duplicates within the same scope
+        pairs, scanned = _near_duplicate_pairs(store, filters, threshold, vector_type=vector_type, k=k)
+        pairs = pairs[:limit]
+        contents = store.get_many([pid for _, id_1, _, id_2, _ in pairs for pid in (id_1, id_2)])
         
-        # Simple duplicate detection: group by title/summary similarity
-        # For MVP: just flag very similar pairs (not a full pairwise comparison)
-        seen_ids = set()
         duplicates = []
-        
-        for i, point in enumerate(all_points):
-            if str(point.id) in seen_ids:
-                continue
-            
-            # Check this point against all others
-            for j, other_point in enumerate(all_points[i+1:], start=i+1):
-                if str(other_point.id) in seen_ids:
-                    continue
-                
-                # Rough check: same title or very similar
-                if (point.payload.get("title") == other_point.payload.get("title")):
-                    duplicates.append({
-                        "thought_1": {
-                            "id": str(point.id),
-                            "title": point.payload.get("title"),
-                            "type": point.payload.get("type"),
-                            "summary": point.payload.get("summary"),
-                            "content": point.payload.get("content"),
-                            "status": point.payload.get("status"),
-                            "confidence_level": point.payload.get("confidence_level"),
-                            "created_at": point.payload.get("created_at"),
-                            "session_id": point.payload.get("session_id"),
-                        },
-                        "thought_2": {
-                            "id": str(other_point.id),
-                            "title": other_point.payload.get("title"),
-                            "type": other_point.payload.get("type"),
-                            "summary": other_point.payload.get("summary"),
-                            "content": other_point.payload.get("content"),
-                            "status": other_point.payload.get("status"),
-                            "confidence_level": other_point.payload.get("confidence_level"),
-                            "created_at": other_point.payload.get("created_at"),
-                            "session_id": other_point.payload.get("session_id"),
-                        },
-                        "reason": "identical_title",
-                        "similarity": threshold  # Add similarity score
-                    })
-                    
-                    if len(duplicates) >= limit:
-                        break
-            
-            if len(duplicates) >= limit:
-                break
+        for score, id_1, payload_1, id_2, payload_2 in pairs:
+            thought_1 = _pair_side(id_1, payload_1)
+            thought_2 = _pair_side(id_2, payload_2)
+            thought_1["content"] = contents.get(id_1, {}).get("content")
+            thought_2["content"] = contents.get(id_2, {}).get("content")
+            duplicates.append({
+                "thought_1": thought_1,
+                "thought_2": thought_2,
+                "reason": "vector_similarity",
+                "similarity": round(score, 4),
+            })
         
         return {
             "status": "ok",
             "threshold": threshold,
-            "scanned": len(all_points),
+            "scanned": scanned,
             "duplicate_pairs_found": len(duplicates),
             "duplicates": duplicates,
             "note": "Review and decide: link, merge, or keep both"
@@ -625,6 +678,8 @@ def get_all_duplicates(
     include_similarity: bool = True,
     include_content: bool = False,  # Default False to save tokens
     mcp: bool = False,  # If True, apply token safety limits (MCP/Agent calls)
+    k: int = 5,
+    vector_type: str = "text",
     store: QdrantStore = Depends(get_qdrant_store),
 ):
     """Get all duplicates from both sources: marked duplicate relations AND similarity-based detection.
@@ -641,6 +696,7 @@ def get_all_duplicates(
     # Cap limit for MCP calls (token safety), frontend can use higher limits
     if mcp and limit > 100:
         limit = 100
+    validate_date_range(from_dt, to_dt)
     try:
         all_pairs = []
         seen_pairs = set()  # Deduplicate across both sources
@@ -663,104 +719,55 @@ def get_all_duplicates(
                 must.append({"key": "session_id", "match": {"value": session_id}})
             if workspace_id:
                 must.append({"key": "workspace_id", "match": {"value": workspace_id}})
-            if eff_from:
-                must.append({"key": "created_at", "range": {"gte": eff_from}})
-            if eff_to:
-                must.append({"key": "created_at", "range": {"lte": eff_to}})
+            must.extend(created_range(eff_from, eff_to))
             
             filters = {"must": must} if must else None
-            all_thoughts = store.scroll(payload_filter=filters, limit=10000)
-            
-            # Fallback: If temporal filter yields no results but date filter is intended,
-            # scroll without date range and filter in-app (robustness like timeline endpoint)
-            intends_date_filter = bool(eff_from or eff_to)
-            if intends_date_filter and len(all_thoughts) == 0:
-                must_base = []
-                must_base.append({"key": "status", "match": {"value": "active"}})  # Only active thoughts
-                if session_id:
-                    must_base.append({"key": "session_id", "match": {"value": session_id}})
-                if workspace_id:
-                    must_base.append({"key": "workspace_id", "match": {"value": workspace_id}})
-                filters_base = {"must": must_base} if must_base else None
-                all_thoughts = store.scroll(payload_filter=filters_base, limit=10000)
-                
-                def _in_range(created_str: str) -> bool:
-                    try:
-                        if not created_str:
-                            return False
-                        created_dt = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-                        if eff_from:
-                            from_dt_parsed = datetime.fromisoformat(eff_from.replace("Z", "+00:00"))
-                            if created_dt < from_dt_parsed:
-                                return False
-                        if eff_to:
-                            to_dt_parsed = datetime.fromisoformat(eff_to.replace("Z", "+00:00"))
-                            if created_dt > to_dt_parsed:
-                                return False
-                        return True
-                    except Exception:
-                        return False
-                
-                all_thoughts = [p for p in all_thoughts if _in_range(p.payload.get("created_at", ""))]
+            fields = _PAIR_FIELDS + ["links"] + (["content"] if include_content else [])
+            all_thoughts = store.iter_points(filters, fields=fields)
             
+            # Collect marked relations first, then resolve targets in one batched retrieve
+            marked = []
             for point in all_thoughts:
+                links = point.payload.get("links", {}) or {}
+                for r in links.get("relations", []) or []:
+                    if r.get("type") == "duplicate" and r.get("related_id"):
+                        marked.append((point, r))
+            related_thoughts = store.get_many([r["related_id"] for _, r in marked])
+            
+            for point, r in marked:
                 thought_id = str(point.id)
-                links = point.payload.get("links", {})
-                relations = links.get("relations", []) or []
+                related_id = r["related_id"]
+                # Get related thought (don't filter by date - marked relations are explicit)
+                related_thought = related_thoughts.get(str(related_id))
+                if not related_thought:
+                    continue
+                
+                # CRITICAL: Skip if related thought is deleted (shouldn't be in workflows)
+                if related_thought.get("status") == "deleted":
+                    continue
                 
-                for r in relations:
-                    if r.get("type") == "duplicate":
-                        related_id = r.get("related_id")
-                        if related_id:
-                            # Get related thought (don't filter by date - marked relations are explicit)
-                            related_thought = store.get_by_id(related_id)
-                            if not related_thought:
-                                continue
-                            
-                            # CRITICAL: Skip if related thought is deleted (shouldn't be in workflows)
-                            if related_thought.get("status") == "deleted":
-                                continue
-                            
-                            # For marked duplicate relations: only filter by source thought's created_at
-                            # The relation itself is explicit, so we include it if source is in range
-                            # (Don't filter by related_thought.created_at - that would exclude valid marked duplicates)
-                            
-                            # Create pair key for deduplication
-                            pair_key = tuple(sorted([thought_id, related_id]))
-                            if pair_key not in seen_pairs:
-                                seen_pairs.add(pair_key)
-                                thought_1_data = {
-                                    "id": thought_id,
-                                    "title": point.payload.get("title"),
-                                    "type": point.payload.get("type"),
-                                    "summary": point.payload.get("summary"),
-                                    "status": point.payload.get("status"),
-                                    "confidence_level": point.payload.get("confidence_level"),
-                                    "created_at": point.payload.get("created_at"),
-                                    "session_id": point.payload.get("session_id"),
-                                }
-                                thought_2_data = {
-                                    "id": related_id,
-                                    "title": related_thought.get("title"),
-                                    "type": related_thought.get("type"),
-                                    "summary": related_thought.get("summary"),
-                                    "status": related_thought.get("status"),
-                                    "confidence_level": related_thought.get("confidence_level"),
-                                    "created_at": related_thought.get("created_at"),
-                                    "session_id": related_thought.get("session_id"),
-                                }
-                                if include_content:
-                                    thought_1_data["content"] = point.payload.get("content")
-                                    thought_2_data["content"] = related_thought.get("content")
-                                
-                                all_pairs.append({
-                                    "thought_1": thought_1_data,
-                                    "thought_2": thought_2_data,
-                                    "source": "marked_relation",
-                                    "relation_weight": r.get("weight", 1.0),
-                                    "similarity": r.get("weight", 1.0),  # Use weight as similarity proxy
-                                    "reason": "explicit_duplicate_relation"
-                                })
+                # For marked duplicate relations: only filter by source thought's created_at
+                # The relation itself is explicit, so we include it if source is in range
+                # (Don't filter by related_thought.created_at - that would exclude valid marked duplicates)
+                
+                # Create pair key for deduplication
+                pair_key = tuple(sorted([thought_id, related_id]))
+                if pair_key not in seen_pairs:
+                    seen_pairs.add(pair_key)
+                    thought_1_data = _pair_side(thought_id, point.payload)
+                    thought_2_data = _pair_side(related_id, related_thought)
+                    if include_content:
+                        thought_1_data["content"] = point.payload.get("content")
+                        thought_2_data["content"] = related_thought.get("content")
+                    
+                    all_pairs.append({
+                        "thought_1": thought_1_data,
+                        "thought_2": thought_2_data,
+                        "source": "marked_relation",
+                        "relation_weight": r.get("weight", 1.0),
+                        "similarity": r.get("weight", 1.0),  # Use weight as similarity proxy
+                        "reason": "explicit_duplicate_relation"
+                    })
         
         # 2. Get similarity-based duplicates
         if include_similarity:
@@ -778,65 +785,33 @@ def get_all_duplicates(
                 must.append({"key": "session_id", "match": {"value": session_id}})
             if workspace_id:
                 must.append({"key": "workspace_id", "match": {"value": workspace_id}})
-            if eff_from:
-                must.append({"key": "created_at", "range": {"gte": eff_from}})
-            if eff_to:
-                must.append({"key": "created_at", "range": {"lte": eff_to}})
+            must.extend(created_range(eff_from, eff_to))
             
             filters = {"must": must} if must else None
-            all_points = store.scroll(payload_filter=filters, limit=10000)
+            pairs, _ = _near_duplicate_pairs(store, filters, threshold, vector_type=vector_type, k=k)
+            # Pairs already taken from marked relations are skipped, so allow for them
+            pairs = [p for p in pairs if tuple(sorted([p[1], p[3]])) not in seen_pairs][:limit]
+            contents = store.get_many([pid for _, id_1, _, id_2, _ in pairs for pid in (id_1, id_2)]) if include_content else {}
             
-            seen_ids = set()
-            for i, point in enumerate(all_points):
-                if str(point.id) in seen_ids:
-                    continue
+            for score, id_1, payload_1, id_2, payload_2 in pairs:
                 # Double-check: skip deleted (shouldn't happen with filter, but be safe)
-                if point.payload.get("status") == "deleted":
+                if "deleted" in (payload_1.get("status"), payload_2.get("status")):
                     continue
                 
-                for j, other_point in enumerate(all_points[i+1:], start=i+1):
-                    if str(other_point.id) in seen_ids:
-                        continue
-                    # Double-check: skip deleted
-                    if other_point.payload.get("status") == "deleted":
-                        continue
-                    
-                    # Title-based duplicate detection
-                    if point.payload.get("title") == other_point.payload.get("title"):
-                        pair_key = tuple(sorted([str(point.id), str(other_point.id)]))
-                        if pair_key not in seen_pairs:
-                            seen_pairs.add(pair_key)
-                            thought_1_data = {
-                                "id": str(point.id),
-                                "title": point.payload.get("title"),
-                                "type": point.payload.get("type"),
-                                "summary": point.payload.get("summary"),
-                                "status": point.payload.get("status"),
-                                "confidence_level": point.payload.get("confidence_level"),
-                                "created_at": point.payload.get("created_at"),
-                                "session_id": point.payload.get("session_id"),
-                            }
-                            thought_2_data = {
-                                "id": str(other_point.id),
-                                "title": other_point.payload.get("title"),
-                                "type": other_point.payload.get("type"),
-                                "summary": other_point.payload.get("summary"),
-                                "status": other_point.payload.get("status"),
-                                "confidence_level": other_point.payload.get("confidence_level"),
-                                "created_at": other_point.payload.get("created_at"),
-                                "session_id": other_point.payload.get("session_id"),
-                            }
-                            if include_content:
-                                thought_1_data["content"] = point.payload.get("content")
-                                thought_2_data["content"] = other_point.payload.get("content")
-                            
-                            all_pairs.append({
-                                "thought_1": thought_1_data,
-                                "thought_2": thought_2_data,
-                                "source": "similarity_detection",
-                                "similarity": threshold,
-                                "reason": "identical_title"
-                            })
+                seen_pairs.add(tuple(sorted([id_1, id_2])))
+                thought_1_data = _pair_side(id_1, payload_1)
+                thought_2_data = _pair_side(id_2, payload_2)
+                if include_content:
+                    thought_1_data["content"] = contents.get(id_1, {}).get("content")
+                    thought_2_data["content"] = contents.get(id_2, {}).get("content")
+                
+                all_pairs.append({
+                    "thought_1": thought_1_data,
+                    "thought_2": thought_2_data,
+                    "source": "similarity_detection",
+                    "similarity": round(score, 4),
+                    "reason": "vector_similarity"
+                })
         
         # Sort by similarity (descending) and limit
         all_pairs.sort(key=lambda x: x.get("similarity", 0.0), reverse=True)
@@ -860,75 +835,10 @@ def get_statistics(
     session_id: str | None = None,
     store: QdrantStore = Depends(get_qdrant_store),
 ):
-    """Get comprehensive statistics about thoughts."""
+    """Get comprehensive statistics about thoughts (from the materialized aggregates)."""
     try:
-        # Build filter
-        filters = None
-        if session_id:
-            filters = {"must": [{"key": "session_id", "match": {"value": session_id}}]}
-        
-        # Get all thoughts
-        all_points = store.scroll(payload_filter=filters, limit=10000)
-        
-        # Calculate statistics
-        type_dist = {}
-        status_dist = {}
-        confidence_dist = {}
-        created_by_month = {}
-        has_relations = 0
-        has_parent = 0
-        relation_count = 0
-        
-        for point in all_points:
-            payload = point.payload
-            
-            # Type distribution
-            t = payload.get("type", "unknown")
-            type_dist[t] = type_dist.get(t, 0) + 1
-            
-            # Status distribution
-            s = payload.get("status", "unknown")
-            status_dist[s] = status_dist.get(s, 0) + 1
-            
-            # Confidence distribution
-            c = payload.get("confidence_level", "unknown")
-            confidence_dist[c] = confidence_dist.get(c, 0) + 1
-            
-            # Temporal distribution
-            created_at = payload.get("created_at")
-            if created_at:
-                month = created_at[:7]  # YYYY-MM
-                created_by_month[month] = created_by_month.get(month, 0) + 1
-            
-            # Relations
-            related = payload.get("links", {}).get("related_thoughts", [])
-            if related:
-                has_relations += 1
-                relation_count += len(related)
-            
-            # Parent-child
-            if payload.get("parent_id"):
-                has_parent += 1
-        
-        return {
-            "status": "ok",
-            "total_thoughts": len(all_points),
-            "distributions": {
-                "by_type": type_dist,
-                "by_status": status_dist,
-                "by_confidence": confidence_dist,
-                "by_month": created_by_month,
-            },
-            "relations": {
-                "thoughts_with_relations": has_relations,
-                "total_relations": relation_count,
-                "avg_relations_per_thought": round(relation_count / len(all_points), 2) if all_points else 0,
-            },
-            "hierarchy": {
-                "thoughts_with_parent": has_parent,
-                "orphan_thoughts": len(all_points) - has_parent,
-            }
-        }
+        stats = store.get_aggregates().statistics(session_id)
+        return {"status": "ok", **stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating statistics: {str(e)}")
 
@@ -940,61 +850,15 @@ def get_graph_metrics(
 ):
     """Calculate graph metrics (centrality, clustering, etc)."""
     try:
-        # Build filter
-        filters = None
-        if session_id:
-            filters = {"must": [{"key": "session_id", "match": {"value": session_id}}]}
-        
-        # Get all thoughts
-        all_points = store.scroll(payload_filter=filters, limit=10000)
-        
-        # Build adjacency structure
-        relations_by_type = {}
-        thought_degrees = {}  # How many relations each thought has
-        thought_info = {}
-        
-        for point in all_points:
-            payload = point.payload
-            thought_id = str(point.id)
-            thought_info[thought_id] = {
-                "title": payload.get("title"),
-                "type": payload.get("type"),
-                "confidence": payload.get("confidence_level"),
-            }
-            
-            related = payload.get("links", {}).get("related_thoughts", [])
-            thought_degrees[thought_id] = len(related)
-            
-            for rel in related:
-                rel_type = rel.get("type", "related") if isinstance(rel, dict) else "related"
-                if rel_type not in relations_by_type:
-                    relations_by_type[rel_type] = 0
-                relations_by_type[rel_type] += 1
-        
-        # Calculate metrics
-        total_thoughts = len(all_points)
-        total_relations = sum(thought_degrees.values())
+        # Degree histogram + top-degree lookup from the aggregate store
+        degrees = store.get_aggregates().degree_summary(session_id, top=10)
+        total_thoughts = degrees["total_nodes"]
+        total_relations = degrees["total_edges"]
         
         # Network metrics
         density = (2 * total_relations) / (total_thoughts * (total_thoughts - 1)) if total_thoughts > 1 else 0
         avg_degree = total_relations / total_thoughts if total_thoughts > 0 else 0
         
-        # Find central nodes (highest degree)
-        sorted_by_degree = sorted(
-            [(tid, degree) for tid, degree in thought_degrees.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )
-        top_central = [
-            {
-                "id": tid,
-                "title": thought_info[tid]["title"],
-                "degree": degree,
-                "type": thought_info[tid]["type"],
-            }
-            for tid, degree in sorted_by_degree[:10]
-        ]
-        
         return {
             "status": "ok",
             "network": {
@@ -1002,16 +866,17 @@ def get_graph_metrics(
                 "total_edges": total_relations,
                 "density": round(density, 4),
                 "average_degree": round(avg_degree, 2),
-                "relation_types": relations_by_type,
+                # related_thoughts holds plain IDs, so every edge is "related"
+                "relation_types": {"related": total_relations} if total_relations else {},
             },
             "centrality": {
-                "top_by_degree": top_central,
+                "top_by_degree": degrees["top_by_degree"],
             },
             "degree_distribution": {
-                "min": min(thought_degrees.values()) if thought_degrees else 0,
-                "max": max(thought_degrees.values()) if thought_degrees else 0,
-                "median": sorted(thought_degrees.values())[len(thought_degrees) // 2] if thought_degrees else 0,
-                "isolated_nodes": sum(1 for d in thought_degrees.values() if d == 0),
+                "min": degrees["min"],
+                "max": degrees["max"],
+                "median": degrees["median"],
+                "isolated_nodes": degrees["isolated_nodes"],
             }
         }
     except Exception as e:
@@ -1058,7 +923,7 @@ def get_relation_timeline(
         if session_id:
             filters = {"must": [{"key": "session_id", "match": {"value": session_id}}]}
         
-        all_points = store.scroll(payload_filter=filters, limit=10000)
+        all_points = store.iter_points(filters, fields=["title", "links"])
         
         # Collect all relations with timestamps
         timeline_events = []
@@ -1106,6 +971,55 @@ def get_relation_timeline(
         raise HTTPException(status_code=500, detail=f"Error getting relation timeline: {str(e)}")
 
 
+@router.post("/index/links/rebuild")
+def rebuild_link_index(store: QdrantStore = Depends(get_qdrant_store)):
+    """Rebuild the sidecar reverse-link index from a full collection scan (recovery)."""
+    try:
+        edges = store.rebuild_link_index()
+        return {"status": "ok", "edges": edges}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rebuilding link index: {str(e)}")
+
+
+@router.post("/index/timestamps/backfill")
+def backfill_created_ts(store: QdrantStore = Depends(get_qdrant_store)):
+    """Add the numeric created_ts to points missing it (also runs at startup)."""
+    try:
+        updated = store.backfill_created_ts()
+        return {"status": "ok", "updated": updated}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error backfilling timestamps: {str(e)}")
+
+
+@router.post("/index/aggregates/rebuild")
+def rebuild_aggregates(store: QdrantStore = Depends(get_qdrant_store)):
+    """Recount the materialized stats/session/workspace aggregates from a full collection scan."""
+    try:
+        thoughts = store.rebuild_aggregates()
+        return {"status": "ok", "thoughts": thoughts}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rebuilding aggregates: {str(e)}")
+
+
+@router.get("/embedding-cache")
+def embedding_cache_stats():
+    """Embedding cache size and hit/miss counters (since process start)."""
+    cache = get_embedding_cache()
+    if cache is None:
+        return {"status": "disabled"}
+    return {"status": "ok", **cache.stats()}
+
+
+@router.post("/embedding-cache/clear")
+def clear_embedding_cache():
+    """Drop all cached vectors (e.g. after changing model weights under the same name)."""
+    cache = get_embedding_cache()
+    if cache is None:
+        return {"status": "disabled"}
+    cache.clear()
+    return {"status": "cleared"}
+
+
 @router.post("/reset")
 def factory_reset(
     body: dict,
@@ -1126,8 +1040,7 @@ def factory_reset(
     
     try:
         # Get count before deletion
-        all_points = store.scroll(limit=100000)
-        before_count = len(all_points)
+        before_count = store.count()
         
         # Delete all points by deleting and recreating collection
         # More efficient than deleting points one by one
@@ -1,12 +1,41 @@
 # apps/manifold_api/routers/graph.py
 """Global graph endpoints for birdview visualization."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, Any, List, Optional
 from libs.manifold_core.storage.qdrant_store import QdrantStore
 from apps.manifold_api.dependencies import get_qdrant_store
 
 router = APIRouter(prefix="/v1/memory", tags=["graph"])
 
+# Node fields returned by the compact graph (what the birdview needs to draw/label)
+GRAPH_NODE_FIELDS = ["title", "type", "status", "workspace_id", "session_id"]
+# Edge tuple layout in the compact graph
+GRAPH_EDGE_FIELDS = ["from", "to", "type", "weight"]
+# Nodes per compact page
+GRAPH_PAGE_MAX = 10000
+
+
+def _graph_filter(
+    type: Optional[str],
+    status: Optional[str],
+    tickers: Optional[str],
+    session_id: Optional[str],
+    workspace_id: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    must = []
+    if type:
+        must.append({"key": "type", "match": {"value": type}})
+    if status:
+        must.append({"key": "status", "match": {"value": status}})
+    if tickers:
+        for t in tickers.split(","):
+            must.append({"key": "tickers", "match": {"value": t}})
+    if session_id:
+        must.append({"key": "session_id", "match": {"value": session_id}})
+    if workspace_id:
+        must.append({"key": "workspace_id", "match": {"value": workspace_id}})
+    return {"must": must} if must else None
+
 
 @router.get("/graph")
 def get_graph(
@@ -22,20 +51,7 @@ def get_graph(
 
     Filters are optional; edges are derived from links.related_thoughts, links.relations, and parent-child.
     """
-    must = []
-    if type:
-        must.append({"key": "type", "match": {"value": type}})
-    if status:
-        must.append({"key": "status", "match": {"value": status}})
-    if tickers:
-        for t in tickers.split(","):
-            must.append({"key": "tickers", "match": {"value": t}})
-    if session_id:
-        must.append({"key": "session_id", "match": {"value": session_id}})
-    if workspace_id:
-        must.append({"key": "workspace_id", "match": {"value": workspace_id}})
-    
-    filters = {"must": must} if must else None
+    filters = _graph_filter(type, status, tickers, session_id, workspace_id)
 
     points = store.scroll(payload_filter=filters, limit=limit)
     nodes: List[Dict[str, Any]] = []
@@ -81,10 +97,66 @@ def get_graph(
         if parent_id and str(parent_id) in id_set:
             edges.append({"from": str(parent_id), "to": nid, "type": "section-of", "weight": 1.0})
 
-    # Cap edges to a reasonable number for the UI
-    if len(edges) > 5000:
+    # Cap edges to a reasonable number for the UI (use /graph/compact for whole graphs)
+    edges_total = len(edges)
+    if edges_total > 5000:
         edges = edges[:5000]
 
-    return {"status": "ok", "nodes": nodes, "edges": edges}
+    return {
+        "status": "ok",
+        "nodes": nodes,
+        "edges": edges,
+        "edges_total": edges_total,
+        "truncated": edges_total > len(edges),
+    }
+
+
+@router.get("/graph/compact")
+def get_compact_graph(
+    cursor: Optional[str] = None,
+    limit: int = 2000,
+    fields: Optional[str] = None,
+    type: Optional[str] = None,
+    status: Optional[str] = None,
+    tickers: Optional[str] = None,
+    session_id: Optional[str] = None,
+    workspace_id: Optional[str] = None,
+    store: QdrantStore = Depends(get_qdrant_store),
+):
+    """Whole graph in cursor-paged, projected form.
+
+    Each page holds `limit` nodes (only GRAPH_NODE_FIELDS, or the comma-separated
+    `fields`) plus every edge owned by those nodes, read from the link index:
+    related/typed links are owned by their source, section-of edges by the child.
+    Walking `next_cursor` until it is null therefore returns each node and each
+    edge exactly once, with nothing truncated. Edges can point at nodes on later
+    pages; endpoints outside the filter (or deleted) never arrive as nodes, so
+    clients drop edges whose endpoints they never received.
+    """
+    if limit < 1 or limit > GRAPH_PAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {GRAPH_PAGE_MAX}")
+    node_fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else GRAPH_NODE_FIELDS
+    filters = _graph_filter(type, status, tickers, session_id, workspace_id)
+
+    try:
+        points, next_offset = store.scroll_page(filters, limit=limit, offset=cursor, fields=node_fields)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor or filter: {str(e)}")
+
+    nodes = [{"id": str(p.id), **{f: p.payload.get(f) for f in node_fields}} for p in points]
+    edges = []
+    for from_id, to_id, kind, relation_type, weight in store.get_outgoing_links([n["id"] for n in nodes]):
+        if kind == "parent":
+            edges.append([to_id, from_id, "section-of", 1.0])
+        else:
+            edges.append([from_id, to_id, relation_type or "related", weight if weight is not None else 1.0])
+
+    return {
+        "status": "ok",
+        "edge_fields": GRAPH_EDGE_FIELDS,
+        "nodes": nodes,
+        "edges": edges,
+        "next_cursor": str(next_offset) if next_offset is not None else None,
+    }
 
 
@@ -3,35 +3,59 @@ from __future__ import annotations
 import os
 import torch
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from libs.manifold_core.models.responses import HealthResponse, ConfigResponse
 from libs.manifold_core.storage.qdrant_store import QdrantStore
 from libs.manifold_core.embeddings.provider import EmbeddingProvider
-from apps.manifold_api.dependencies import get_qdrant_store, get_embedding_provider_dep
+from apps.manifold_api.dependencies import get_qdrant_store, get_embedding_provider_dep, embedding_lifecycle
 
 router = APIRouter(prefix="/v1/memory", tags=["health"])
 
 
 @router.get("/health", response_model=HealthResponse)
-def health(
-    store: QdrantStore = Depends(get_qdrant_store),
-    embedder: EmbeddingProvider = Depends(get_embedding_provider_dep)
-):
+def health(store: QdrantStore = Depends(get_qdrant_store)):
     """Check Manifold API health and Qdrant connection."""
-    qdrant_ok = False
-    try:
-        info = store.client.get_collection(store.collection_name)
-        qdrant_ok = True
-    except:
-        pass
+    qdrant_ok = _qdrant_connected(store)
     
     return HealthResponse(
-        status="ok" if qdrant_ok else "degraded",
+        status="ok" if qdrant_ok and embedding_lifecycle.ready else "degraded",
         qdrant_connected=qdrant_ok,
         collection_name=store.collection_name,
-        embedding_model=getattr(embedder, 'model_name', 'unknown')
+        embedding_model=os.getenv("MANIFOLD_EMBED_MODEL", "mixedbread-ai/mxbai-embed-large-v1"),
+        model_state=embedding_lifecycle.state,
+    )
+
+
+@router.get("/health/live")
+def health_live():
+    """Liveness: process is up (does not touch Qdrant or the model)."""
+    return {"status": "ok", "service": "manifold"}
+
+
+@router.get("/health/ready")
+def health_ready(store: QdrantStore = Depends(get_qdrant_store)):
+    """Readiness: model loaded + warmed and Qdrant reachable (503 otherwise)."""
+    qdrant_ok = _qdrant_connected(store)
+    model = embedding_lifecycle.status()
+    ready = qdrant_ok and model["ready"]
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "qdrant_connected": qdrant_ok,
+            "model": model,
+        },
     )
 
 
+def _qdrant_connected(store: QdrantStore) -> bool:
+    try:
+        store.client.get_collection(store.collection_name)
+        return True
+    except Exception:
+        return False
+
+
 @router.get("/config", response_model=ConfigResponse)
 def config(
     store: QdrantStore = Depends(get_qdrant_store),
@@ -42,7 +66,7 @@ def config(
         status="ok",
         collection_name=store.collection_name,
         vector_dim=store.vector_dim,
-        embedding_provider=type(embedder).__name__
+        embedding_provider=type(getattr(embedder, "inner", embedder)).__name__
     )
 
 
@@ -1,8 +1,8 @@
 # apps/manifold_api/routers/relations.py
 """Thought-to-thought relations endpoints."""
 from fastapi import APIRouter, Depends, HTTPException
-from libs.manifold_core.storage.qdrant_store import QdrantStore
-from apps.manifold_api.dependencies import get_qdrant_store
+from libs.manifold_core.storage.qdrant_store import QdrantStore, created_range
+from apps.manifold_api.dependencies import get_qdrant_store, validate_date_range
 from typing import Literal, Dict, Any, List, Set
 from datetime import datetime
 from pydantic import BaseModel
@@ -238,43 +238,44 @@ def get_related(
             rel_dict["description"] = r.get("description")
         typed_outgoing.append(rel_dict)
     
-    # Find incoming links (scan all thoughts that link to this one)
-    # CRITICAL: Only scan active thoughts (exclude deleted)
+    # Find incoming links via the reverse-link index (O(degree), no collection scan)
+    incoming_edges = store.get_incoming_links(thought_id)
+    
+    # Resolve all neighbours (and incoming sources, for their status) in one batched retrieve
+    related_ids: Set[str] = set(outgoing_ids)
+    related_ids.update([e["to_id"] for e in typed_outgoing if e.get("to_id")])
+    related_ids.update([e["from_id"] for e in incoming_edges])
+    payloads = store.get_many(list(related_ids))
+    
+    # CRITICAL: Only count incoming links from active thoughts (exclude deleted)
     incoming = []
     typed_incoming = []
-    all_thoughts = store.scroll(
-        payload_filter={"must": [{"key": "status", "match": {"value": "active"}}]},
-        limit=10000
-    )
-    for point in all_thoughts:
-        # Double-check: skip deleted (shouldn't happen with filter, but be safe)
-        if point.payload.get("status") == "deleted":
+    for edge in incoming_edges:
+        from_payload = payloads.get(edge["from_id"])
+        if not from_payload or from_payload.get("status", "active") != "active":
             continue
-        related_ids = point.payload.get("links", {}).get("related_thoughts", [])
-        if thought_id in related_ids:
-            incoming.append({"from_id": point.id, "to_id": thought_id, "relation_type": "related"})
-        # typed incoming
-        for r in point.payload.get("links", {}).get("relations", []) or []:
-            if r.get("related_id") == thought_id:
-                rel_dict = {
-                    "from_id": point.id,
-                    "to_id": thought_id,
-                    "relation_type": r.get("type", "related"),
-                    "weight": r.get("weight", 1.0),
-                }
-                if r.get("description"):
-                    rel_dict["description"] = r.get("description")
-                typed_incoming.append(rel_dict)
-    
-    # Get full thought objects
-    related_ids: Set[str] = set(outgoing_ids)
-    related_ids.update([inc["from_id"] for inc in incoming])
-    related_ids.update([e["to_id"] for e in typed_outgoing if e.get("to_id")])
-    related_ids.update([e["from_id"] for e in typed_incoming if e.get("from_id")])
+        if edge["kind"] == "related":
+            incoming.append({"from_id": edge["from_id"], "to_id": thought_id, "relation_type": "related"})
+        else:
+            rel_dict = {
+                "from_id": edge["from_id"],
+                "to_id": thought_id,
+                "relation_type": edge.get("relation_type") or "related",
+                "weight": edge["weight"] if edge.get("weight") is not None else 1.0,
+            }
+            if edge.get("description"):
+                rel_dict["description"] = edge["description"]
+            typed_incoming.append(rel_dict)
+    
+    # Get full thought objects (outgoing targets + active incoming sources)
+    wanted_ids: Set[str] = set(outgoing_ids)
+    wanted_ids.update([e["to_id"] for e in typed_outgoing if e.get("to_id")])
+    wanted_ids.update([inc["from_id"] for inc in incoming])
+    wanted_ids.update([e["from_id"] for e in typed_incoming])
     
     thoughts = []
-    for rid in related_ids:
-        thought = store.get_by_id(rid)
+    for rid in wanted_ids:
+        thought = payloads.get(rid)
         if thought:
             # CRITICAL: Skip deleted thoughts (shouldn't be in workflows)
             if thought.get("status") == "deleted":
@@ -321,11 +322,7 @@ def get_related_facets(
         neighbor_ids.add(e["from_id"])
     for e in rel.get("typed_outgoing", []):
         neighbor_ids.add(e["to_id"])
-    neighbors = []
-    for nid in neighbor_ids:
-        t = store.get_by_id(nid)
-        if t:
-            neighbors.append(t)
+    neighbors = list(store.get_many(list(neighbor_ids)).values())
     def add_count(d: Dict[str,int], key: str):
         d[key] = d.get(key, 0) + 1
     facets = {"type": {}, "status": {}, "tickers": {}, "sectors": {}}
@@ -356,11 +353,11 @@ def get_related_graph(
     edges: List[Dict[str, Any]] = []
     for _ in range(min(depth, 3)):
         next_frontier: Set[str] = set()
-        for nid in list(frontier):
-            if nid in visited:
-                continue
+        level_ids = [nid for nid in frontier if nid not in visited]
+        level = store.get_many(level_ids)  # one round trip per hop
+        for nid in level_ids:
             visited.add(nid)
-            t = store.get_by_id(nid)
+            t = level.get(nid)
             if not t:
                 continue
             nodes[nid] = t
@@ -438,8 +435,9 @@ def get_thought_tree(
     links = source.get("links", {})
     related_ids = links.get("related_thoughts", [])
     related = []
+    related_payloads = store.get_many(related_ids)
     for rid in related_ids:
-        thought = store.get_by_id(rid)
+        thought = related_payloads.get(rid)
         if thought:
             # CRITICAL: Skip deleted thoughts (shouldn't be in workflows)
             if thought.get("status") == "deleted":
@@ -476,6 +474,7 @@ def get_thoughts_with_relation_type(
     # Cap limit for MCP calls (token safety), frontend can use higher limits
     if mcp and limit > 100:
         limit = 100
+    validate_date_range(from_dt, to_dt)
     from datetime import datetime, timedelta
     
     # Determine effective date range
@@ -494,13 +493,10 @@ def get_thoughts_with_relation_type(
         must.append({"key": "session_id", "match": {"value": session_id}})
     if workspace_id:
         must.append({"key": "workspace_id", "match": {"value": workspace_id}})
-    if eff_from:
-        must.append({"key": "created_at", "range": {"gte": eff_from}})
-    if eff_to:
-        must.append({"key": "created_at", "range": {"lte": eff_to}})
+    must.extend(created_range(eff_from, eff_to))
     
     filters = {"must": must} if must else None
-    all_thoughts = store.scroll(payload_filter=filters, limit=10000)
+    all_thoughts = store.iter_points(filters)
     pairs = []
     thought_cache = {}  # Cache thoughts to avoid multiple lookups
     
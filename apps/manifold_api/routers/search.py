@@ -3,17 +3,29 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from libs.manifold_core.models.requests import SearchRequest
 from libs.manifold_core.models.responses import SearchResponse, StatsResponse
-from libs.manifold_core.storage.qdrant_store import QdrantStore
+from libs.manifold_core.storage.qdrant_store import QdrantStore, CREATED_TS_FIELD, created_range, epoch_seconds
 from libs.manifold_core.embeddings.provider import EmbeddingProvider
 from libs.manifold_core.scoring import compute_final_score, apply_mmr, compute_score_components
-from apps.manifold_api.dependencies import get_qdrant_store, get_embedding_provider_dep
+from libs.manifold_core.storage.async_qdrant_store import AsyncQdrantStore
+from apps.manifold_api.dependencies import (
+    get_qdrant_store,
+    get_async_qdrant_store,
+    get_embedding_provider_dep,
+    embedding_executor,
+)
 from datetime import datetime, timedelta
+import asyncio
+import calendar
+import os
 from collections import defaultdict
 from pydantic import BaseModel
 from typing import Optional, List
 
 router = APIRouter(prefix="/v1/memory", tags=["search"])
 
+# Largest candidate pool fetched (with vectors) for MMR re-ranking
+MMR_MAX_POOL = 200
+
 
 class SearchRequestV2(BaseModel):
     """Extended search with vector_type and include_content."""
@@ -23,8 +35,10 @@ class SearchRequestV2(BaseModel):
     vector_type: str = "summary"  # "text" | "title" | "summary"
     include_content: bool = False  # Default False to save tokens
     boosts: Optional[dict] = None
-    diversity: Optional[dict] = None
+    diversity: Optional[dict] = None  # {"mmr_lambda": 0.0-1.0 (1 = pure relevance), "fetch_k": pool size <= 200}
     filters: Optional[dict] = None
+    facets: Optional[List[str]] = None  # Facet keys to count (e.g. ["type", "tickers"]); none = skip
+    facet_suggest: bool = False  # If True, also return type/status/tickers/sectors counts
     mcp: bool = False  # If True, apply token safety limits (MCP/Agent calls)
     
     def __init__(self, **data):
@@ -36,18 +50,12 @@ class SearchRequestV2(BaseModel):
 
 
 @router.post("/search", response_model=SearchResponse)
-def search_thoughts(
+async def search_thoughts(
     request: SearchRequestV2,
-    store: QdrantStore = Depends(get_qdrant_store),
+    store: AsyncQdrantStore = Depends(get_async_qdrant_store),
     embedder: EmbeddingProvider = Depends(get_embedding_provider_dep),
 ):
     """Semantic + filter search with optional 2-phase retrieval (cheap summary discovery)."""
-    # Embed query (only if query is not empty)
-    # Use is_query=True for e5-family models (improves search quality)
-    query_vec = None
-    if request.query and request.query.strip():
-        query_vec = embedder.embed(request.query, is_query=True)
-    
     # Convert filters to Qdrant payload filter
     qdrant_filter = _build_qdrant_filter(request.filters)
     
@@ -68,16 +76,46 @@ def search_thoughts(
     
     # Query Qdrant (use specified vector_type: text | title | summary)
     vector_name = request.vector_type or "summary"
-    raw_results = store.query(
-        vector_name=vector_name,
-        query_vector=query_vec,
-        payload_filter=qdrant_filter,
-        limit=min(request.limit or 10, 50),  # Hard cap at 50
-        offset=request.offset or 0,
+    result_limit = min(request.limit or 10, 50)  # Hard cap at 50
+    
+    # MMR re-ranks a larger pool (default 4x the page, max 200) using the hits' vectors
+    diversity = request.diversity or {}
+    mmr_lambda = diversity.get("mmr_lambda")
+    fetch_limit = result_limit
+    if mmr_lambda:
+        fetch_limit = max(result_limit, min(int(diversity.get("fetch_k", result_limit * 4)), MMR_MAX_POOL))
+    
+    # Facets: only computed when asked for (top-level `facets` or legacy filters.facets)
+    facet_keys = request.facets or (request.filters or {}).get("facets")
+    
+    async def _search():
+        # Embed query (only if query is not empty) on the embedding executor
+        # Use is_query=True for e5-family models (improves search quality)
+        query_vec = None
+        if request.query and request.query.strip():
+            query_vec = await embedding_executor.embed(embedder, request.query, is_query=True)
+        return await store.query(
+            vector_name=vector_name,
+            query_vector=query_vec,
+            payload_filter=qdrant_filter,
+            limit=fetch_limit,
+            offset=request.offset or 0,
+            with_vectors=[vector_name] if mmr_lambda else False,
+        )
+    
+    async def _no_facets():
+        return {}
+    
+    # Facet counts don't depend on the hits: run them alongside embedding + search
+    raw_results, facets, facet_suggest = await asyncio.gather(
+        _search(),
+        store.get_facets(facet_keys, qdrant_filter) if facet_keys else _no_facets(),
+        store.get_facets(["type", "status", "tickers", "sectors"], qdrant_filter) if request.facet_suggest else _no_facets(),
     )
     
     # Re-rank with boosts + explainability components
     candidates = []
+    candidate_vectors = {}
     for hit in raw_results:
         payload = hit.payload
         # Double-check: skip deleted (shouldn't happen with filter, but be safe)
@@ -97,16 +135,20 @@ def search_thoughts(
             "score_components": comps,
             "thought": payload,
         })
+        if mmr_lambda and isinstance(hit.vector, dict):
+            candidate_vectors[hit.id] = hit.vector.get(vector_name)
     
     # Sort by final score
     candidates.sort(key=lambda x: x["score"], reverse=True)
     
-    # Apply MMR if requested
-    if request.diversity and request.diversity.get("mmr_lambda"):
+    # Apply MMR if requested (embedding-space similarity; zero vector if one is missing)
+    if mmr_lambda:
+        zero = [0.0] * store.vector_dim
         candidates = apply_mmr(
             candidates,
-            lambda_param=request.diversity["mmr_lambda"],
-            k=request.limit or 50,
+            lambda_param=mmr_lambda,
+            k=result_limit,
+            embeddings=[candidate_vectors.get(c["id"]) or zero for c in candidates],
         )
     
     # Phase 2: Strip content if include_content=False (cheap discovery mode)
@@ -129,15 +171,6 @@ def search_thoughts(
                 "session_id": thought.get("session_id"),
             }
     
-    # Facets
-    facets = {}
-    if request.filters and "facets" in request.filters:
-        facets = store.get_facets(request.filters["facets"], qdrant_filter)
-    # facet_suggest: top keys by frequency if no facets requested
-    facet_suggest = {}
-    if not request.filters or "facets" not in request.filters:
-        facet_suggest = store.get_facets(["type", "status", "tickers", "sectors"], qdrant_filter)
-    
     return SearchResponse(
         status="ok",
         count=len(candidates),
@@ -147,31 +180,32 @@ def search_thoughts(
     )
 
 
-@router.get("/timeline")
-def get_timeline(
-    from_dt: str | None = None,
-    to_dt: str | None = None,
-    type: str | None = None,
-    tickers: str | None = None,
-    session_id: str | None = None,
-    workspace_id: str | None = None,
-    days: int | None = 30,
-    bucket: str | None = "day",
-    limit: int = 20,  # Reduced from 1000 for token efficiency
-    include_content: bool = False,  # Default False to save tokens
-    mcp: bool = False,  # If True, apply token safety limits (MCP/Agent calls)
-    store: QdrantStore = Depends(get_qdrant_store),
-):
-    """Timeline view: thoughts in date range, grouped by day or week. Hard max limit of 100 for token safety (only if mcp=true)."""
-    # Cap limit for MCP calls (token safety), frontend can use higher limits
-    if mcp and limit > 100:
-        limit = 100
-    
-    # Filters: type (exact), tickers (OR across list), created_at range (from_dt/to_dt or last `days`), session_id, workspace_id.
-    # Bucketing: `bucket=day` (default) or `bucket=week`.
-    # Robustness: If created_at range filtering yields no results (e.g., index type mismatch),
-    #   fallback to filter by type/tickers only and apply the date filter in-app.
+# Upper bound on buckets counted by /timeline/counts (one count request each)
+MAX_TIMELINE_BUCKETS = 400
+# Bucket count requests in flight at once, shared by all /timeline/counts calls
+TIMELINE_COUNT_CONCURRENCY = int(os.getenv("MANIFOLD_TIMELINE_COUNT_CONCURRENCY", "16"))
+_count_slots: asyncio.Semaphore | None = None
 
+
+async def _bounded_count(store: AsyncQdrantStore, qfilter: dict) -> int:
+    global _count_slots
+    if _count_slots is None:
+        # Created on first use so it belongs to the serving loop
+        _count_slots = asyncio.Semaphore(TIMELINE_COUNT_CONCURRENCY)
+    async with _count_slots:
+        return await store.count(qfilter)
+
+
+def _timeline_filters(
+    from_dt: str | None,
+    to_dt: str | None,
+    days: int | None,
+    type: str | None,
+    tickers: str | None,
+    session_id: str | None,
+    workspace_id: str | None,
+):
+    """Shared timeline filter: (must clauses without the date range, eff_from, eff_to)."""
     # Determine effective date range
     eff_from = from_dt
     eff_to = to_dt
@@ -195,42 +229,39 @@ def get_timeline(
         must_base.append({"key": "session_id", "match": {"value": session_id}})
     if workspace_id:
         must_base.append({"key": "workspace_id", "match": {"value": workspace_id}})
+    return must_base, eff_from, eff_to
 
-    # First attempt: include created_at range at the storage level
-    must_q = list(must_base)
-    if eff_from:
-        must_q.append({"key": "created_at", "range": {"gte": eff_from}})
-    if eff_to:
-        must_q.append({"key": "created_at", "range": {"lte": eff_to}})
-
-    filters_q = {"must": must_q} if must_q else None
-    results = store.scroll(payload_filter=filters_q, limit=limit)
 
-    # Fallback: if empty and a date filter is intended, scroll without date range and filter in-app
-    intends_date_filter = bool(eff_from or eff_to)
-    if intends_date_filter and not results:
-        filters_base = {"must": must_base} if must_base else None
-        fallback_limit = min(limit * 5, 5000)
-        results = store.scroll(payload_filter=filters_base, limit=fallback_limit)
-
-        def _in_range(created_str: str) -> bool:
-            try:
-                if not created_str:
-                    return False
-                created_dt = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-                if eff_from:
-                    from_dt_parsed = datetime.fromisoformat(eff_from.replace("Z", "+00:00"))
-                    if created_dt < from_dt_parsed:
-                        return False
-                if eff_to:
-                    to_dt_parsed = datetime.fromisoformat(eff_to.replace("Z", "+00:00"))
-                    if created_dt > to_dt_parsed:
-                        return False
-                return True
-            except Exception:
-                return False
+@router.get("/timeline")
+async def get_timeline(
+    from_dt: str | None = None,
+    to_dt: str | None = None,
+    type: str | None = None,
+    tickers: str | None = None,
+    session_id: str | None = None,
+    workspace_id: str | None = None,
+    days: int | None = 30,
+    bucket: str | None = "day",
+    limit: int = 20,  # Reduced from 1000 for token efficiency
+    include_content: bool = False,  # Default False to save tokens
+    mcp: bool = False,  # If True, apply token safety limits (MCP/Agent calls)
+    store: AsyncQdrantStore = Depends(get_async_qdrant_store),
+):
+    """Timeline view: thoughts in date range, newest first, grouped by day or week. Hard max limit of 100 for token safety (only if mcp=true)."""
+    # Cap limit for MCP calls (token safety), frontend can use higher limits
+    if mcp and limit > 100:
+        limit = 100
+    
+    # Filters: type (exact), tickers (OR across list), created_at range (from_dt/to_dt or last `days`), session_id, workspace_id.
+    # Bucketing: `bucket=day` (default) or `bucket=week`.
+    # The date range and ordering run server-side on the integer created_ts index.
+    must_base, eff_from, eff_to = _timeline_filters(from_dt, to_dt, days, type, tickers, session_id, workspace_id)
+    try:
+        must_q = must_base + created_range(eff_from, eff_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        results = [p for p in results if _in_range(p.payload.get("created_at", ""))]
+    results = await store.scroll(payload_filter={"must": must_q}, limit=limit, order_by=CREATED_TS_FIELD)
 
     # Bucket
     bucket = (bucket or "day").lower()
@@ -283,6 +314,65 @@ def get_timeline(
     }
 
 
+@router.get("/timeline/counts")
+async def get_timeline_counts(
+    from_dt: str | None = None,
+    to_dt: str | None = None,
+    type: str | None = None,
+    tickers: str | None = None,
+    session_id: str | None = None,
+    workspace_id: str | None = None,
+    days: int | None = 30,
+    bucket: str | None = "day",
+    store: AsyncQdrantStore = Depends(get_async_qdrant_store),
+):
+    """Thought counts per day or ISO week in the date range (server-side counts, no points fetched)."""
+    must_base, eff_from, eff_to = _timeline_filters(from_dt, to_dt, days, type, tickers, session_id, workspace_id)
+    if not eff_from or not eff_to:
+        raise HTTPException(status_code=400, detail="Bucketed counts need a bounded range (from_dt and to_dt, or days)")
+    start_ts, end_ts = epoch_seconds(eff_from), epoch_seconds(eff_to)
+    if start_ts is None or end_ts is None:
+        raise HTTPException(status_code=400, detail="from_dt/to_dt must be ISO datetimes")
+
+    bucket = (bucket or "day").lower()
+    start = datetime.utcfromtimestamp(start_ts)
+    if bucket == "week":
+        # Buckets start on the Monday of the ISO week
+        start = datetime(start.year, start.month, start.day) - timedelta(days=start.weekday())
+        step = timedelta(weeks=1)
+    else:
+        start = datetime(start.year, start.month, start.day)
+        step = timedelta(days=1)
+    end = datetime.utcfromtimestamp(end_ts)
+    if (end - start) / step > MAX_TIMELINE_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Range spans more than {MAX_TIMELINE_BUCKETS} buckets")
+
+    keys, requests = [], []
+    cursor = start
+    while cursor <= end:
+        if bucket == "week":
+            keys.append(f"{cursor.isocalendar().year}-W{cursor.isocalendar().week:02d}")
+        else:
+            keys.append(cursor.date().isoformat())
+        lo = max(start_ts, calendar.timegm(cursor.timetuple()))
+        hi = min(end_ts, calendar.timegm((cursor + step).timetuple()) - 1)
+        requests.append(_bounded_count(store, {"must": must_base + [
+            {"key": CREATED_TS_FIELD, "range": {"gte": lo, "lte": hi}}
+        ]}))
+        cursor += step
+    # Bucket counts are independent: issue them concurrently, at most TIMELINE_COUNT_CONCURRENCY at a time
+    counts = dict(zip(keys, await asyncio.gather(*requests)))
+
+    return {
+        "status": "ok",
+        "bucket": bucket,
+        "from_dt": eff_from,
+        "to_dt": eff_to,
+        "total": sum(counts.values()),
+        "counts": counts,
+    }
+
+
 @router.get("/stats", response_model=StatsResponse)
 def get_stats(
     tickers: str | None = None,
@@ -306,12 +396,13 @@ def get_stats(
     
     filters = {"must": must} if must else None
     
-    # Scan all
-    all_thoughts = store.scroll(
-        payload_filter=filters,
-        limit=10000
+    # Stream all matching thoughts (aggregated fields only)
+    all_thoughts = store.iter_points(
+        filters,
+        fields=["type", "status", "confidence_score", "flags"],
     )
     
+    total = 0
     by_type = defaultdict(int)
     by_status = defaultdict(int)
     confidence_scores = []
@@ -319,6 +410,7 @@ def get_stats(
     
     for point in all_thoughts:
         p = point.payload
+        total += 1
         by_type[p.get("type", "unknown")] += 1
         by_status[p.get("status", "unknown")] += 1
         if p.get("confidence_score"):
@@ -327,11 +419,11 @@ def get_stats(
             promoted += 1
     
     avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0
-    validation_rate = promoted / len(all_thoughts) if all_thoughts else 0.0
+    validation_rate = promoted / total if total else 0.0
     
     return StatsResponse(
         status="ok",
-        total=len(all_thoughts),
+        total=total,
         by_type=dict(by_type),
         by_status=dict(by_status),
         avg_confidence=avg_confidence,
@@ -7,15 +7,24 @@ from libs.manifold_core.models.envelope import ThoughtEnvelope, VersionSnapshot
 from libs.manifold_core.models.responses import CreateResponse, UpdateResponse, DeleteResponse
 from libs.manifold_core.embeddings.provider import EmbeddingProvider
 from libs.manifold_core.storage.qdrant_store import QdrantStore
-from apps.manifold_api.dependencies import get_qdrant_store, get_embedding_provider_dep
+from libs.manifold_core.storage.async_qdrant_store import AsyncQdrantStore
+from apps.manifold_api.dependencies import get_qdrant_store, get_async_qdrant_store, get_embedding_provider_dep
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from uuid import uuid4
 import hashlib
 import json
+import os
 
 
 router = APIRouter(prefix="/v1/memory", tags=["thoughts"])
 
+# Bulk create: request cap, points per upsert request, chunks written concurrently
+BULK_MAX_THOUGHTS = int(os.getenv("MANIFOLD_BULK_MAX_THOUGHTS", "1000"))
+BULK_BATCH_SIZE = int(os.getenv("MANIFOLD_BULK_BATCH_SIZE", "256"))
+BULK_WRITE_CONCURRENCY = int(os.getenv("MANIFOLD_BULK_WRITE_CONCURRENCY", "2"))
+
 
 @router.post("/thought", response_model=CreateResponse)
 def create_thought(
@@ -68,15 +77,15 @@ def create_thought(
     thought.created_at = now
     thought.updated_at = now
     
-    # Embed all vectors: text, title, summary
-    vectors = {
-        "text": embedder.embed(thought.content or ""),
-        "title": embedder.embed(thought.title or ""),
-    }
-    
     # Summary vector: use thought.summary if provided, else fallback to title or content[:280]
     summary_text = thought.summary or thought.title or (thought.content[:280] if thought.content else "")
-    vectors["summary"] = embedder.embed(summary_text)
+    
+    # Embed all vectors (text, title, summary) in one batch
+    vectors = embedder.embed_many([{
+        "text": thought.content or "",
+        "title": thought.title or "",
+        "summary": summary_text,
+    }])[0]
     
     payload = thought.model_dump()
     store.upsert_point(thought.id, payload, vectors)
@@ -92,20 +101,29 @@ def bulk_create_thoughts(
 ):
     """Create multiple thoughts in a single batch. Much more efficient than multiple create-thought calls.
     
-    Accepts array of thought objects (1-100 thoughts per batch).
+    Accepts array of thought objects (1-MANIFOLD_BULK_MAX_THOUGHTS per request, default 1000).
     Each thought follows ThoughtEnvelope schema.
-    Returns detailed results for each thought (created, skipped, errors).
+    Items are validated up front, then embedded and written in chunks of
+    MANIFOLD_BULK_BATCH_SIZE: chunk N+1 is embedded while chunk N is upserted.
+    Returns per-item results in input order (created or error); a bad item
+    never aborts the rest of the batch.
     """
     thoughts = body.get("thoughts", [])
     if not thoughts:
         raise HTTPException(400, "No thoughts provided")
-    if len(thoughts) > 100:
-        raise HTTPException(400, "Maximum 100 thoughts per batch")
+    if len(thoughts) > BULK_MAX_THOUGHTS:
+        raise HTTPException(400, f"Maximum {BULK_MAX_THOUGHTS} thoughts per batch")
     
     now = datetime.utcnow().isoformat() + "Z"
-    results = []
-    created_count = 0
-    error_count = 0
+    results: dict = {}
+    
+    def _error(idx: int, message: str, label) -> None:
+        results[idx] = {
+            "index": idx,
+            "status": "error",
+            "error": message,
+            "thought_data": label or f"thought_{idx}",
+        }
     
     # Validate all thoughts first
     validated_thoughts = []
@@ -127,73 +145,72 @@ def bulk_create_thoughts(
             thought.updated_at = now
             validated_thoughts.append((idx, thought))
         except Exception as e:
-            error_count += 1
-            results.append({
-                "index": idx,
-                "status": "error",
-                "error": f"Validation failed: {str(e)}",
-                "thought_data": thought_data.get("title") or thought_data.get("id") or f"thought_{idx}"
-            })
-    
-    # Batch embed all texts, titles, summaries for efficiency
-    texts = [t.content or "" for _, t in validated_thoughts]
-    titles = [t.title or "" for _, t in validated_thoughts]
-    summaries = [
-        t.summary or t.title or (t.content[:280] if t.content else "")
-        for _, t in validated_thoughts
-    ]
-    
-    # Batch embedding (much faster than individual calls)
-    text_vectors = embedder.embed_batch(texts)
-    title_vectors = embedder.embed_batch(titles)
-    summary_vectors = embedder.embed_batch(summaries)
-    
-    # Process each thought with pre-computed embeddings
-    for (idx, thought), text_vec, title_vec, summary_vec in zip(
-        validated_thoughts, text_vectors, title_vectors, summary_vectors
-    ):
-        try:
-            vectors = {
-                "text": text_vec,
-                "title": title_vec,
-                "summary": summary_vec
-            }
-            
-            payload = thought.model_dump()
-            store.upsert_point(thought.id, payload, vectors)
-            
-            created_count += 1
-            results.append({
-                "thought_id": thought.id,
-                "status": "created",
-                "title": thought.title
-            })
-        except Exception as e:
-            error_count += 1
-            results.append({
-                "index": idx,
-                "status": "error",
-                "error": f"Storage failed: {str(e)}",
-                "thought_data": thought.title or thought.id or f"thought_{idx}"
-            })
+            label = (thought_data.get("title") or thought_data.get("id")) if isinstance(thought_data, dict) else None
+            _error(idx, f"Validation failed: {str(e)}", label)
     
+    def _write(chunk, all_vectors) -> None:
+        """Upsert one embedded chunk; on failure retry item by item to isolate the bad ones."""
+        items = [(t.id, t.model_dump(), v) for (_, t), v in zip(chunk, all_vectors)]
+        try:
+            store.upsert_points(items)
+            for idx, thought in chunk:
+                results[idx] = {"index": idx, "thought_id": thought.id, "status": "created", "title": thought.title}
+            return
+        except Exception:
+            pass
+        for (idx, thought), item in zip(chunk, items):
+            try:
+                store.upsert_point(*item)
+                results[idx] = {"index": idx, "thought_id": thought.id, "status": "created", "title": thought.title}
+            except Exception as e:
+                _error(idx, f"Storage failed: {str(e)}", thought.title or thought.id)
+    
+    # Embed chunk N+1 while up to `concurrency` chunks are being written
+    # (one writer in local mode: the embedded engine isn't safe for parallel writes)
+    concurrency = 1 if store.local_mode else BULK_WRITE_CONCURRENCY
+    chunks = [validated_thoughts[i:i + BULK_BATCH_SIZE] for i in range(0, len(validated_thoughts), BULK_BATCH_SIZE)]
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="manifold-bulk") as writers:
+        for chunk in chunks:
+            try:
+                # Texts, titles and summaries of the chunk in one model call
+                all_vectors = embedder.embed_many([
+                    {
+                        "text": t.content or "",
+                        "title": t.title or "",
+                        "summary": t.summary or t.title or (t.content[:280] if t.content else ""),
+                    }
+                    for _, t in chunk
+                ])
+            except Exception as e:
+                for idx, thought in chunk:
+                    _error(idx, f"Embedding failed: {str(e)}", thought.title or thought.id)
+                continue
+            if len(pending) >= concurrency:
+                pending.popleft().result()
+            pending.append(writers.submit(_write, chunk, all_vectors))
+        for future in pending:
+            future.result()
+    
+    ordered = [results[idx] for idx in sorted(results)]
+    created_count = sum(1 for r in ordered if r["status"] == "created")
     return {
         "status": "ok",
         "total": len(thoughts),
         "created": created_count,
-        "errors": error_count,
-        "results": results,
+        "errors": len(ordered) - created_count,
+        "results": ordered,
         "created_at": now
     }
 
 
 @router.get("/thought/{tid}")
-def get_thought(
+async def get_thought(
     tid: str,
-    store: QdrantStore = Depends(get_qdrant_store),
+    store: AsyncQdrantStore = Depends(get_async_qdrant_store),
 ):
     """Get thought by ID."""
-    payload = store.get_by_id(tid)
+    payload = await store.get_by_id(tid)
     if not payload:
         raise HTTPException(status_code=404, detail="Thought not found")
     return payload
@@ -288,18 +305,19 @@ def patch_thought(
     current["versions"].append(version_snap.model_dump())
     
     # Re-embed if content/title/summary changed
-    vectors = {}
+    texts = {}
     if "content" in patch:
-        vectors["text"] = embedder.embed(current.get("content", ""))
+        texts["text"] = current.get("content", "")
     if "title" in patch:
-        vectors["title"] = embedder.embed(current.get("title", ""))
+        texts["title"] = current.get("title", "")
     if "summary" in patch:
-        vectors["summary"] = embedder.embed(current.get("summary", ""))
+        texts["summary"] = current.get("summary", "")
     
     # If no summary provided but content changed, update summary vector too
     if "content" in patch and "summary" not in patch:
-        summary_text = current.get("summary") or current.get("title") or (current.get("content", "")[:280])
-        vectors["summary"] = embedder.embed(summary_text)
+        texts["summary"] = current.get("summary") or current.get("title") or (current.get("content", "")[:280])
+    
+    vectors = embedder.embed_many([texts])[0] if texts else {}
     
     store.upsert_point(tid, current, vectors)
     
@@ -374,14 +392,14 @@ def merge_thoughts(
     
     # 2. Transfer incoming relations (from other thoughts pointing to source)
     # We need to update all thoughts that link to source to link to target instead
-    all_thoughts = store.scroll(limit=10000)
+    # (reverse-link index gives exactly those thoughts; fetched in one batch)
+    incoming_ids = {e["from_id"] for e in store.get_incoming_links(source_id)}
+    incoming_ids.discard(target_id)
+    incoming_ids.discard(source_id)
     incoming_updated = 0
     
-    for point in all_thoughts:
-        if str(point.id) == target_id or str(point.id) == source_id:
-            continue
-        
-        other_links = point.payload.get("links", {})
+    for other_id, other_payload in store.get_many(list(incoming_ids)).items():
+        other_links = other_payload.get("links", {})
         other_related = other_links.get("related_thoughts", [])
         other_relations = other_links.get("relations", []) or []
         updated = False
@@ -402,9 +420,9 @@ def merge_thoughts(
         if updated:
             other_links["related_thoughts"] = other_related
             other_links["relations"] = other_relations
-            point.payload["links"] = other_links
-            point.payload["updated_at"] = now
-            store.upsert_point(str(point.id), point.payload, vectors={})
+            other_payload["links"] = other_links
+            other_payload["updated_at"] = now
+            store.upsert_point(other_id, other_payload, vectors={})
             incoming_updated += 1
     
     # 3. Transfer metadata (tags, tickers, sectors)
@@ -455,10 +473,12 @@ def merge_thoughts(
     # Re-embed if content/title/summary changed
     vectors = {}
     if merge_strategy in ["merge_content", "keep_source"]:
-        vectors["text"] = embedder.embed(target.get("content", ""))
-        vectors["title"] = embedder.embed(target.get("title", ""))
         summary_text = target.get("summary") or target.get("title") or (target.get("content", "")[:280])
-        vectors["summary"] = embedder.embed(summary_text)
+        vectors = embedder.embed_many([{
+            "text": target.get("content", ""),
+            "title": target.get("title", ""),
+            "summary": summary_text,
+        }])[0]
     
     store.upsert_point(target_id, target, vectors)
     
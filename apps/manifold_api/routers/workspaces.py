@@ -6,7 +6,6 @@ from libs.manifold_core.embeddings.provider import EmbeddingProvider
 from apps.manifold_api.dependencies import get_qdrant_store, get_embedding_provider_dep
 from datetime import datetime
 from uuid import uuid4
-from collections import defaultdict
 from typing import Dict, List, Any, Set
 
 router = APIRouter(prefix="/v1/memory", tags=["workspaces"])
@@ -19,28 +18,9 @@ def list_workspaces(
 ):
     """Get list of all distinct workspaces with thought counts."""
     try:
-        # Scroll all thoughts and group by workspace_id
-        all_points = store.scroll(limit=10000)
-        
-        workspaces: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "types": defaultdict(int)})
-        
-        for point in all_points:
-            payload = point.payload
-            workspace_id = payload.get("workspace_id")
-            if workspace_id:
-                workspaces[workspace_id]["count"] += 1
-                thought_type = payload.get("type", "unknown")
-                workspaces[workspace_id]["types"][thought_type] += 1
-        
-        # Format response
         workspaces_list = [
-            {
-                "workspace_id": wid,
-                "count": data["count"],
-                "types": dict(data["types"]),
-                "created_at": None  # TODO: track workspace creation
-            }
-            for wid, data in sorted(workspaces.items())
+            {**workspace, "created_at": None}  # TODO: track workspace creation
+            for workspace in store.get_aggregates().workspaces()
         ]
         
         return {
@@ -202,32 +182,9 @@ def get_workspace_sessions(
 ):
     """Get list of all sessions within a workspace with thought counts."""
     try:
-        # Scroll all thoughts in workspace
-        all_points = store.scroll(
-            payload_filter={"must": [{"key": "workspace_id", "match": {"value": workspace_id}}]},
-            limit=10000
-        )
-        
-        sessions: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "types": defaultdict(int)})
-        
-        for point in all_points:
-            payload = point.payload
-            session_id = payload.get("session_id")
-            if session_id:
-                sessions[session_id]["count"] += 1
-                thought_type = payload.get("type", "unknown")
-                sessions[session_id]["types"][thought_type] += 1
-        
-        # Format response
         sessions_list = [
-            {
-                "session_id": sid,
-                "workspace_id": workspace_id,
-                "count": data["count"],
-                "types": dict(data["types"]),
-                "created_at": None  # TODO: track session creation
-            }
-            for sid, data in sorted(sessions.items())
+            {**session, "created_at": None}  # TODO: track session creation
+            for session in store.get_aggregates().sessions(workspace_id)
         ]
         
         return {
@@ -292,12 +249,12 @@ def upsert_workspace_summary(
                 "version": 1,
             }
         
-        # Embed vectors
-        vectors = {
-            "text": embedder.embed(content),
-            "title": embedder.embed(title),
-            "summary": embedder.embed(summary_text),
-        }
+        # Embed vectors (one batch)
+        vectors = embedder.embed_many([{
+            "text": content,
+            "title": title,
+            "summary": summary_text,
+        }])[0]
         
         store.upsert_point(str(thought_id), summary_thought, vectors)
         
@@ -1,3 +1,5 @@
+import asyncio
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import search, health
@@ -15,3 +17,15 @@ app.add_middleware(
 app.include_router(health.router, prefix="")
 app.include_router(search.router, prefix="/v1")
 
+
+@app.on_event("startup")
+async def startup_event():
+    await search.get_search_log().start()
+    # Load + warm the embedding model in the background; /health/ready gates on it
+    if os.getenv("TESSERACT_EAGER_LOAD", "true").lower() != "false":
+        asyncio.create_task(asyncio.to_thread(search.model_lifecycle.preload))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await search.get_search_log().stop()
@@ -1,8 +1,21 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from .search import model_lifecycle
 
 router = APIRouter()
 
 @router.get("/health")
 def health():
+    return {"status": "ok", "service": "tesseract", "model": model_lifecycle.state}
+
+@router.get("/health/live")
+def health_live():
+    """Liveness: the process is up and serving requests"""
     return {"status": "ok", "service": "tesseract"}
 
+@router.get("/health/ready")
+def health_ready():
+    """Readiness: embedding model loaded and warmed (503 until then)"""
+    model = model_lifecycle.status()
+    body = {"status": "ready" if model["ready"] else "not_ready", "service": "tesseract", "model": model}
+    return JSONResponse(status_code=200 if model["ready"] else 503, content=body)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, Request, Body
 from libs.tesseract_core.models.search import SearchRequest, SearchResponse, SearchResult
 from libs.tesseract_core.embeddings.embedder import Embedder
+from libs.common.model_lifecycle import ModelLifecycle
 from libs.tesseract_core.storage.vector_store import VectorStore
 from libs.tesseract_core.storage.tesseract_db import TesseractDB
+from libs.tesseract_core.storage.search_log import SearchLogBuffer
 from qdrant_client.models import PointStruct
 import httpx
 import time
@@ -15,16 +17,23 @@ import asyncio
 
 router = APIRouter()
 
-# Initialize once at startup
-embedder = None
+# Initialize once at startup (model is loaded + warmed in background, see main.py)
+model_lifecycle = ModelLifecycle(Embedder)  # Model/Device from env
 vector_store = VectorStore()
 tesseract_db = None
+search_log = None
 
 def get_embedder():
-    global embedder
-    if embedder is None:
-        embedder = Embedder()  # Model/Device from env
-    return embedder
+    return model_lifecycle.get()
+
+def require_model_ready():
+    """Reject requests with 503 while the startup load/warm-up is still running"""
+    if model_lifecycle.loading:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Embedding model is {model_lifecycle.state}, retry shortly",
+            headers={"Retry-After": "5"},
+        )
 
 def get_tesseract_db():
     global tesseract_db
@@ -33,6 +42,12 @@ def get_tesseract_db():
         tesseract_db = TesseractDB(db_path)
     return tesseract_db
 
+def get_search_log():
+    global search_log
+    if search_log is None:
+        search_log = SearchLogBuffer(get_tesseract_db())
+    return search_log
+
 
 @router.get("/admin/search-history")
 async def get_search_history(
@@ -43,6 +58,8 @@ async def get_search_history(
     """Get search history with optional filters"""
     try:
         db = get_tesseract_db()
+        # Make buffered searches visible before reading history
+        await asyncio.to_thread(get_search_log().flush)
         history = db.get_search_history(
             limit=limit,
             query_filter=query_filter,
@@ -64,12 +81,15 @@ async def get_search_history(
 async def get_search_stats(days: int = 30):
     """Get search statistics"""
     try:
-        db = get_tesseract_db()
-        stats = db.get_search_stats(days=days)
-        return stats
+        return await asyncio.to_thread(get_search_log().get_search_stats, days)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get search stats: {e}")
 
+@router.get("/admin/search-log/status")
+async def get_search_log_status():
+    """Buffered search-history writer status (pending, written, dropped)"""
+    return get_search_log().status()
+
 @router.delete("/admin/vectors/{news_id}/{vector_type}")
 async def delete_vector_type(news_id: str, vector_type: str):
     """Delete vectors for a news_id of a specific type (title|summary|body)."""
@@ -93,6 +113,7 @@ async def semantic_search(request: SearchRequest):
     vector_store.ensure_collection()
     
     # Generate query embedding
+    require_model_ready()
     emb = get_embedder()
     query_embedding = emb.encode(request.query, normalize=True, is_query=True)[0]
     
@@ -176,18 +197,9 @@ async def semantic_search(request: SearchRequest):
         results=results
     )
     
-    # Log search asynchronously (non-blocking)
+    # Log search via buffered writer (flushed in batches by background task)
     try:
-        db = get_tesseract_db()
-        # Use asyncio.create_task for non-blocking logging
-        asyncio.create_task(
-            asyncio.to_thread(
-                db.log_search,
-                request.query,
-                request.filters,
-                len(results)
-            )
-        )
+        get_search_log().record(request.query, request.filters, len(results))
     except Exception as e:
         # Don't fail search if logging fails
         print(f"⚠️ Failed to log search: {e}")
@@ -400,6 +412,8 @@ async def embed_batch(
     if not re.match(date_pattern, from_date) or not re.match(date_pattern, to_date):
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
+    require_model_ready()
+    
     # Ensure collection exists
     vector_store.ensure_collection()
     
@@ -781,6 +795,7 @@ async def factory_reset():
         # 1. Drop SQLite tables
         db = get_tesseract_db()
         print("  📊 Dropping SQLite tables...")
+        get_search_log().reset()
         db.drop_all_tables()
         print("  ✓ SQLite tables dropped")
         
@@ -82,6 +82,8 @@ class CorrelationRequest(BaseModel):
     from_date: datetime | None = None
     to_date: datetime | None = None
     method: str = "spearman"  # pearson, spearman
+    min_abs_rho: float = Field(default=0.3, ge=0.0, le=1.0)
+    top_k: int | None = Field(default=20, ge=1)  # strongest pairs kept per symbol; None keeps all significant
 
 
 class EvidenceRequest(BaseModel):
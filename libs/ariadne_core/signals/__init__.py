@@ -3,6 +3,7 @@ Signal detection for price events
 """
 
 from .price_detectors import PriceEventDetector
+from .correlations import returns_matrix, correlation_matrix, correlation_edges
 
-__all__ = ["PriceEventDetector"]
+__all__ = ["PriceEventDetector", "returns_matrix", "correlation_matrix", "correlation_edges"]
 
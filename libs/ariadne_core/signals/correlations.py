@@ -0,0 +1,168 @@
+"""
+Correlation matrices over aligned daily returns
+"""
+
+import numpy as np
+from scipy.stats import rankdata, t as student_t
+from typing import List, Dict, Any, Tuple
+
+
+def returns_matrix(
+    price_data: Dict[str, List[Tuple[str, float]]],
+    window: int,
+    max_missing: float = 0.2
+) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Align closes on the union of trading days and convert them to returns.
+
+    Args:
+        price_data: symbol -> [(date, close), ...]
+        window: Number of most recent days to keep
+        max_missing: Symbols missing more than this share of days are dropped
+
+    Returns:
+        (symbols, dates, returns) with returns shaped (days - 1, symbols);
+        a return is NaN when either of its two days is missing.
+    """
+    all_dates = set()
+    for dates_prices in price_data.values():
+        all_dates.update(d for d, _ in dates_prices)
+    dates = sorted(all_dates)[-window:]
+    date_index = {d: i for i, d in enumerate(dates)}
+
+    symbols = []
+    columns = []
+    for symbol, dates_prices in price_data.items():
+        column = np.full(len(dates), np.nan)
+        for d, close in dates_prices:
+            i = date_index.get(d)
+            if i is not None and close is not None:
+                column[i] = close
+        if np.isnan(column).sum() < len(dates) * max_missing:
+            symbols.append(symbol)
+            columns.append(column)
+
+    if not columns:
+        return [], dates, np.empty((max(len(dates) - 1, 0), 0))
+
+    prices = np.column_stack(columns)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = prices[1:] / prices[:-1] - 1.0
+    returns[~np.isfinite(returns)] = np.nan
+    return symbols, dates, returns
+
+
+def pairwise_corrcoef(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson correlation of every column pair over the rows both have.
+
+    Equivalent to np.corrcoef when nothing is missing, but NaNs only drop
+    the affected rows from the pairs that contain them. Done with a handful
+    of matrix products instead of one call per pair.
+
+    Returns:
+        (rho, n) - correlation matrix and overlapping observation counts
+    """
+    valid = (~np.isnan(values)).astype(float)
+    x = np.where(valid > 0, values, 0.0)
+
+    n = valid.T @ valid
+    sum_x = x.T @ valid          # sum_x[i, j]: sum of column i over rows shared with j
+    sum_xx = (x * x).T @ valid
+    sum_xy = x.T @ x
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_x = sum_xx - sum_x ** 2 / n
+        var_y = var_x.T
+        rho = cov / np.sqrt(var_x * var_y)
+
+    rho[~np.isfinite(rho)] = np.nan
+    np.clip(rho, -1.0, 1.0, out=rho)
+    return rho, n
+
+
+def correlation_matrix(
+    values: np.ndarray,
+    method: str = "spearman"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pearson or Spearman correlation matrix with two-sided p-values.
+
+    Spearman is Pearson on per-column ranks (ties averaged, NaNs left out of
+    the ranking). With gaps, ranks are taken over each column's own days
+    rather than re-ranked per pair - identical when the pair shares all days.
+
+    Returns:
+        (rho, p_value, n), all (symbols, symbols); NaN where undefined
+    """
+    if method == "spearman":
+        values = rankdata(values, axis=0, nan_policy="omit")
+    rho, n = pairwise_corrcoef(values)
+
+    # Same t-test scipy's pearsonr/spearmanr use, applied to the whole matrix
+    df = n - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_stat = rho * np.sqrt(df / np.clip(1.0 - rho ** 2, 1e-15, None))
+        p_value = 2 * student_t.sf(np.abs(t_stat), df)
+    p_value[df < 1] = np.nan
+    return rho, p_value, n
+
+
+def correlation_edges(
+    symbols: List[str],
+    returns: np.ndarray,
+    method: str = "spearman",
+    min_abs_rho: float = 0.3,
+    max_p_value: float = 0.05,
+    min_periods: int = 10,
+    top_k: int | None = None
+) -> List[Dict[str, Any]]:
+    """
+    Significant symbol pairs, optionally limited to each symbol's strongest.
+
+    Args:
+        symbols: Column labels of `returns`
+        returns: (days, symbols) matrix from returns_matrix()
+        method: "pearson" or "spearman"
+        min_abs_rho: Minimum |rho| to keep a pair
+        max_p_value: Maximum p-value to keep a pair
+        min_periods: Minimum overlapping days per pair
+        top_k: Keep a pair only if it is among the k strongest (by |rho|) of
+            at least one of its symbols; None keeps every significant pair
+
+    Returns:
+        List of {sym1, sym2, rho, p_value, observations}
+    """
+    if len(symbols) < 2:
+        return []
+
+    rho, p_value, n = correlation_matrix(returns, method)
+
+    keep = (
+        np.isfinite(rho)
+        & (np.abs(rho) > min_abs_rho)
+        & (p_value < max_p_value)
+        & (n >= min_periods)
+    )
+    np.fill_diagonal(keep, False)
+
+    if top_k and top_k < len(symbols) - 1:
+        strength = np.where(keep, np.abs(rho), 0.0)
+        # Each symbol's k-th strongest pair sets its bar; a pair survives if it clears either end's
+        # (symbols with fewer than k significant pairs keep all of them)
+        kth = -np.partition(-strength, top_k - 1, axis=1)[:, top_k - 1]
+        bar = np.where(kth > 0, kth, np.finfo(float).tiny)
+        keep &= (strength >= bar[:, None]) | (strength >= bar[None, :])
+
+    rows, cols = np.nonzero(np.triu(keep, k=1))
+    return [
+        {
+            "sym1": symbols[i],
+            "sym2": symbols[j],
+            "rho": float(rho[i, j]),
+            "p_value": float(p_value[i, j]),
+            "observations": int(n[i, j])
+        }
+        for i, j in zip(rows, cols)
+    ]
@@ -3,77 +3,212 @@ Price event detection using technical indicators
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 
 class PriceEventDetector:
-    """Detect significant price events using technical indicators"""
+    """Detect significant price events using technical indicators.
+    
+    Every detector runs on a 2-D (symbols x days) array, so a batch of
+    equal-length series is scanned in one pass with rolling-window views
+    instead of a Python loop per day. The per-symbol methods are the same
+    kernels on a single row.
+    """
     
     def __init__(self):
         self.short_ma = 20
         self.long_ma = 50
         self.vol_window = 20
     
-    def detect_ma_crossover(
+    # Array kernels: (symbols, days) in, (symbols, positions) signal arrays out
+    
+    def _crossover_signals(self, closes: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Aligned short/long MAs and crossover masks; position i maps to day i + long_ma - 1"""
+        # np.convolve per row keeps the MA values bit-identical to the single-series path
+        short_ma = np.stack([
+            np.convolve(row, np.ones(self.short_ma)/self.short_ma, mode='valid') for row in closes
+        ])
+        long_ma = np.stack([
+            np.convolve(row, np.ones(self.long_ma)/self.long_ma, mode='valid') for row in closes
+        ])
+        
+        # Align lengths
+        min_len = min(short_ma.shape[1], long_ma.shape[1])
+        short_ma = short_ma[:, -min_len:]
+        long_ma = long_ma[:, -min_len:]
+        
+        prev_short, prev_long = short_ma[:, :-1], long_ma[:, :-1]
+        cur_short, cur_long = short_ma[:, 1:], long_ma[:, 1:]
+        bullish = (prev_short <= prev_long) & (cur_short > cur_long)
+        bearish = ~bullish & (prev_short >= prev_long) & (cur_short < cur_long)
+        return bullish, bearish, cur_short, cur_long
+    
+    @staticmethod
+    def _breakout_signals(
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        lookback: int
+    ) -> Tuple[np.ndarray, ...]:
+        """Prior-window resistance/support and breakout masks; position i maps to day i + lookback"""
+        days = closes.shape[1]
+        resistance = sliding_window_view(highs, lookback, axis=1)[:, :days - lookback].max(axis=-1)
+        support = sliding_window_view(lows, lookback, axis=1)[:, :days - lookback].min(axis=-1)
+        current = closes[:, lookback:]
+        
+        bullish = current > resistance * 1.02  # 2% above
+        bearish = ~bullish & (current < support * 0.98)  # 2% below
+        return bullish, bearish, resistance, support, current
+    
+    @staticmethod
+    def _volatility_signals(closes: np.ndarray, window: int) -> Tuple[np.ndarray, ...]:
+        """Recent vs trailing return volatility and regime masks; position i maps to return i + window"""
+        returns = np.diff(np.log(closes), axis=1)
+        rolling_vol = sliding_window_view(returns, window, axis=1).std(axis=-1)
+        
+        # Vol of returns[i:i+window] vs returns[i-window:i], for i in [window, len(returns) - window)
+        positions = max(returns.shape[1] - 2 * window, 0)
+        recent_vol = rolling_vol[:, window:window + positions]
+        historical_vol = rolling_vol[:, :positions]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vol_ratio = recent_vol / historical_vol
+        high = recent_vol > historical_vol * 1.5  # 50% increase
+        low = ~high & (recent_vol < historical_vol * 0.5)  # 50% decrease
+        return high, low, recent_vol, historical_vol, vol_ratio
+    
+    # Event builders
+    
+    def _crossover_events(
         self,
         symbol: str,
         dates: List[str],
-        closes: List[float]
+        signals: Tuple[np.ndarray, ...]
     ) -> List[Dict[str, Any]]:
-        """
-        Detect moving average crossovers.
-        Golden cross (bullish) and death cross (bearish).
-        """
-        if len(closes) < self.long_ma:
-            return []
-        
-        prices = np.array(closes)
-        
-        # Calculate MAs
-        short_ma = np.convolve(prices, np.ones(self.short_ma)/self.short_ma, mode='valid')
-        long_ma = np.convolve(prices, np.ones(self.long_ma)/self.long_ma, mode='valid')
+        bullish, bearish, short_ma, long_ma = signals
+        offset = len(dates) - len(bullish)
+        events = []
         
-        # Align lengths
-        min_len = min(len(short_ma), len(long_ma))
-        short_ma = short_ma[-min_len:]
-        long_ma = long_ma[-min_len:]
-        aligned_dates = dates[-min_len:]
+        hits = np.flatnonzero(bullish | bearish)
+        rows = zip(hits.tolist(), bullish[hits].tolist(), short_ma[hits].tolist(), long_ma[hits].tolist())
+        for i, is_bullish, short, long in rows:
+            if is_bullish:
+                # Golden cross (short crosses above long)
+                event_type, signal = "ma_crossover_bullish", "golden_cross"
+            else:
+                # Death cross (short crosses below long)
+                event_type, signal = "ma_crossover_bearish", "death_cross"
+            events.append({
+                "symbol": symbol,
+                "event_type": event_type,
+                "occurred_at": dates[i + offset],
+                "properties": {
+                    "short_ma": short,
+                    "long_ma": long,
+                    "signal": signal
+                },
+                "confidence": 0.8
+            })
         
+        return events
+    
+    @staticmethod
+    def _breakout_events(
+        symbol: str,
+        dates: List[str],
+        lookback: int,
+        signals: Tuple[np.ndarray, ...]
+    ) -> List[Dict[str, Any]]:
+        bullish, bearish, resistance, support, current = signals
         events = []
         
-        # Detect crossovers
-        for i in range(1, len(short_ma)):
-            # Golden cross (short crosses above long)
-            if short_ma[i-1] <= long_ma[i-1] and short_ma[i] > long_ma[i]:
+        hits = np.flatnonzero(bullish | bearish)
+        rows = zip(
+            hits.tolist(), bullish[hits].tolist(),
+            resistance[hits].tolist(), support[hits].tolist(), current[hits].tolist()
+        )
+        for i, is_bullish, resistance_i, support_i, close in rows:
+            # Breakout above resistance
+            if is_bullish:
                 events.append({
                     "symbol": symbol,
-                    "event_type": "ma_crossover_bullish",
-                    "occurred_at": aligned_dates[i],
+                    "event_type": "breakout_bullish",
+                    "occurred_at": dates[i + lookback],
                     "properties": {
-                        "short_ma": float(short_ma[i]),
-                        "long_ma": float(long_ma[i]),
-                        "signal": "golden_cross"
+                        "resistance": resistance_i,
+                        "close": close,
+                        "breakout_pct": (close - resistance_i) / resistance_i
                     },
-                    "confidence": 0.8
+                    "confidence": 0.75
                 })
             
-            # Death cross (short crosses below long)
-            elif short_ma[i-1] >= long_ma[i-1] and short_ma[i] < long_ma[i]:
+            # Breakdown below support
+            else:
                 events.append({
                     "symbol": symbol,
-                    "event_type": "ma_crossover_bearish",
-                    "occurred_at": aligned_dates[i],
+                    "event_type": "breakout_bearish",
+                    "occurred_at": dates[i + lookback],
                     "properties": {
-                        "short_ma": float(short_ma[i]),
-                        "long_ma": float(long_ma[i]),
-                        "signal": "death_cross"
+                        "support": support_i,
+                        "close": close,
+                        "breakdown_pct": (support_i - close) / support_i
                     },
-                    "confidence": 0.8
+                    "confidence": 0.75
                 })
         
         return events
     
+    @staticmethod
+    def _volatility_events(
+        symbol: str,
+        dates: List[str],
+        window: int,
+        signals: Tuple[np.ndarray, ...]
+    ) -> List[Dict[str, Any]]:
+        high, low, recent_vol, historical_vol, vol_ratio = signals
+        events = []
+        
+        hits = np.flatnonzero(high | low)
+        rows = zip(
+            hits.tolist(), high[hits].tolist(),
+            recent_vol[hits].tolist(), historical_vol[hits].tolist(), vol_ratio[hits].tolist()
+        )
+        for i, is_high, recent, historical, ratio in rows:
+            events.append({
+                "symbol": symbol,
+                # Volatility spike (risk-off) or compression (calm before storm)
+                "event_type": "vol_regime_high" if is_high else "vol_regime_low",
+                "occurred_at": dates[i + window],
+                "properties": {
+                    "recent_vol": recent,
+                    "historical_vol": historical,
+                    "vol_ratio": ratio
+                },
+                "confidence": 0.85
+            })
+        
+        return events
+    
+    # Single-series detectors
+    
+    def detect_ma_crossover(
+        self,
+        symbol: str,
+        dates: List[str],
+        closes: List[float]
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect moving average crossovers.
+        Golden cross (bullish) and death cross (bearish).
+        """
+        if len(closes) < self.long_ma:
+            return []
+        
+        signals = self._crossover_signals(np.asarray([closes], dtype=float))
+        return self._crossover_events(symbol, dates, [s[0] for s in signals])
+    
     def detect_breakout(
         self,
         symbol: str,
@@ -89,46 +224,13 @@ class PriceEventDetector:
         if len(closes) < lookback + 1:
             return []
         
-        events = []
-        
-        for i in range(lookback, len(closes)):
-            window_highs = highs[i-lookback:i]
-            window_lows = lows[i-lookback:i]
-            
-            resistance = max(window_highs)
-            support = min(window_lows)
-            
-            current_close = closes[i]
-            
-            # Breakout above resistance
-            if current_close > resistance * 1.02:  # 2% above
-                events.append({
-                    "symbol": symbol,
-                    "event_type": "breakout_bullish",
-                    "occurred_at": dates[i],
-                    "properties": {
-                        "resistance": float(resistance),
-                        "close": float(current_close),
-                        "breakout_pct": float((current_close - resistance) / resistance)
-                    },
-                    "confidence": 0.75
-                })
-            
-            # Breakdown below support
-            elif current_close < support * 0.98:  # 2% below
-                events.append({
-                    "symbol": symbol,
-                    "event_type": "breakout_bearish",
-                    "occurred_at": dates[i],
-                    "properties": {
-                        "support": float(support),
-                        "close": float(current_close),
-                        "breakdown_pct": float((support - current_close) / support)
-                    },
-                    "confidence": 0.75
-                })
-        
-        return events
+        signals = self._breakout_signals(
+            np.asarray([closes], dtype=float),
+            np.asarray([highs], dtype=float),
+            np.asarray([lows], dtype=float),
+            lookback
+        )
+        return self._breakout_events(symbol, dates, lookback, [s[0] for s in signals])
     
     def detect_volatility_regime_change(
         self,
@@ -143,46 +245,8 @@ class PriceEventDetector:
         if len(closes) < window * 2:
             return []
         
-        prices = np.array(closes)
-        
-        # Calculate rolling volatility (std of returns)
-        returns = np.diff(np.log(prices))
-        
-        events = []
-        
-        for i in range(window, len(returns) - window):
-            recent_vol = np.std(returns[i:i+window])
-            historical_vol = np.std(returns[i-window:i])
-            
-            # Volatility spike (risk-off)
-            if recent_vol > historical_vol * 1.5:  # 50% increase
-                events.append({
-                    "symbol": symbol,
-                    "event_type": "vol_regime_high",
-                    "occurred_at": dates[i],
-                    "properties": {
-                        "recent_vol": float(recent_vol),
-                        "historical_vol": float(historical_vol),
-                        "vol_ratio": float(recent_vol / historical_vol)
-                    },
-                    "confidence": 0.85
-                })
-            
-            # Volatility compression (calm before storm)
-            elif recent_vol < historical_vol * 0.5:  # 50% decrease
-                events.append({
-                    "symbol": symbol,
-                    "event_type": "vol_regime_low",
-                    "occurred_at": dates[i],
-                    "properties": {
-                        "recent_vol": float(recent_vol),
-                        "historical_vol": float(historical_vol),
-                        "vol_ratio": float(recent_vol / historical_vol)
-                    },
-                    "confidence": 0.85
-                })
-        
-        return events
+        signals = self._volatility_signals(np.asarray([closes], dtype=float), window)
+        return self._volatility_events(symbol, dates, window, [s[0] for s in signals])
     
     def detect_all(
         self,
@@ -202,25 +266,63 @@ class PriceEventDetector:
         if not price_data:
             return []
         
-        # Extract arrays
-        dates = [item["date"] for item in price_data]
-        closes = [item["close"] for item in price_data]
-        highs = [item.get("high", item["close"]) for item in price_data]
-        lows = [item.get("low", item["close"]) for item in price_data]
+        return self.detect_many({symbol: price_data})[symbol]
+    
+    def detect_many(
+        self,
+        price_data: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run all detectors over many symbols at once.
         
-        all_events = []
+        Series of equal length are stacked into one (symbols x days) array
+        and scanned together; the result per symbol is what detect_all()
+        returns for it.
         
-        # MA crossovers
-        all_events.extend(self.detect_ma_crossover(symbol, dates, closes))
+        Args:
+            price_data: Symbol -> list of bar dicts (date, open, high, low, close, volume)
         
-        # Breakouts
-        all_events.extend(self.detect_breakout(symbol, dates, closes, highs, lows))
+        Returns:
+            Symbol -> detected price events, sorted by date
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {symbol: [] for symbol in price_data}
         
-        # Volatility regime changes
-        all_events.extend(self.detect_volatility_regime_change(symbol, dates, closes))
+        by_length: Dict[int, List[str]] = {}
+        for symbol, bars in price_data.items():
+            if bars:
+                by_length.setdefault(len(bars), []).append(symbol)
         
-        # Sort by date
-        all_events.sort(key=lambda e: e["occurred_at"])
+        for days, symbols in by_length.items():
+            dates = [[item["date"] for item in price_data[s]] for s in symbols]
+            closes = np.array([[item["close"] for item in price_data[s]] for s in symbols], dtype=float)
+            highs = np.array(
+                [[item.get("high", item["close"]) for item in price_data[s]] for s in symbols], dtype=float
+            )
+            lows = np.array(
+                [[item.get("low", item["close"]) for item in price_data[s]] for s in symbols], dtype=float
+            )
+            
+            crossovers = self._crossover_signals(closes) if days >= self.long_ma else None
+            breakouts = self._breakout_signals(closes, highs, lows, 20) if days >= 21 else None
+            regimes = self._volatility_signals(closes, 20) if days >= 40 else None
+            
+            for row, symbol in enumerate(symbols):
+                all_events = []
+                
+                # MA crossovers
+                if crossovers is not None:
+                    all_events.extend(self._crossover_events(symbol, dates[row], [s[row] for s in crossovers]))
+                
+                # Breakouts
+                if breakouts is not None:
+                    all_events.extend(self._breakout_events(symbol, dates[row], 20, [s[row] for s in breakouts]))
+                
+                # Volatility regime changes
+                if regimes is not None:
+                    all_events.extend(self._volatility_events(symbol, dates[row], 20, [s[row] for s in regimes]))
+                
+                # Sort by date
+                all_events.sort(key=lambda e: e["occurred_at"])
+                results[symbol] = all_events
         
-        return all_events
-
+        return results
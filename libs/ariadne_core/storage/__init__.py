@@ -3,6 +3,9 @@ Graph storage layer
 """
 
 from .graph_store import GraphStore
+from .async_graph_store import AsyncGraphStore
+from .projections import ProjectionManager
+from .result_cache import ResultCache
+from .csr_snapshot import GraphSnapshot, SnapshotManager
 
-__all__ = ["GraphStore"]
-
+__all__ = ["GraphStore", "AsyncGraphStore", "ProjectionManager", "ResultCache", "GraphSnapshot", "SnapshotManager"]
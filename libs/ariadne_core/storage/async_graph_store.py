@@ -0,0 +1,206 @@
+"""
+Neo4j graph store on the async driver
+"""
+
+from neo4j import AsyncGraphDatabase, AsyncDriver
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any
+
+from .graph_store import (
+    graph_writes,
+    driver_settings,
+    GRAPH_TOKENS_QUERY,
+    count_store_query,
+    graph_stats,
+    edge_version_query,
+    temporal_edge_query,
+    temporal_edge_properties,
+    node_id_param,
+)
+
+
+class AsyncGraphStore:
+    """Neo4j wrapper for `async def` request handlers.
+
+    Same query surface as GraphStore, but a slow query only suspends its own
+    request instead of blocking the event loop. Pool size and acquisition
+    timeout come from driver_settings(); NEO4J_MAX_SESSIONS caps sessions
+    open at once (default: the pool size), so bursts queue on the event loop
+    instead of timing out on connection acquisition.
+    """
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        max_sessions: int | None = None,
+    ):
+        self.uri = uri or os.getenv("NEO4J_URI", "bolt://localhost:7687")
+        self.user = user or os.getenv("NEO4J_USER", "neo4j")
+        self.password = password or os.getenv("NEO4J_PASSWORD", "ariadne2025")
+        self.settings = driver_settings()
+        self.max_sessions = max_sessions or int(
+            os.getenv("NEO4J_MAX_SESSIONS", str(self.settings["max_connection_pool_size"]))
+        )
+        self.driver: AsyncDriver | None = None
+        # Created on first use so it belongs to the serving loop
+        self._slots: asyncio.Semaphore | None = None
+
+    def connect(self):
+        """Create the driver (connections are opened lazily by the pool)"""
+        if not self.driver:
+            self.driver = AsyncGraphDatabase.driver(self.uri, auth=(self.user, self.password), **self.settings)
+        return self
+
+    async def close(self):
+        """Close Neo4j connection"""
+        if self.driver:
+            await self.driver.close()
+            self.driver = None
+
+    @asynccontextmanager
+    async def session(self):
+        """Driver session, bounded by max_sessions"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_sessions)
+        async with self._slots:
+            async with self.driver.session() as session:
+                yield session
+
+    async def verify_connection(self) -> bool:
+        """Verify database connection"""
+        try:
+            async with self.session() as session:
+                result = await session.run("RETURN 1 AS num")
+                record = await result.single()
+                return record["num"] == 1
+        except Exception:
+            return False
+
+    async def execute_read(self, query: str, parameters: dict | None = None) -> list[dict]:
+        """Execute read query and return results"""
+        async with self.session() as session:
+            result = await session.run(query, parameters or {})
+            return [dict(record) async for record in result]
+
+    async def execute_write(self, query: str, parameters: dict | None = None) -> Any:
+        """Execute write query and return result"""
+        try:
+            return await self.run_single(query, parameters)
+        finally:
+            # After the write, so a projection built meanwhile is already stale
+            graph_writes.bump()
+
+    async def write_batches(self, query: str, rows: list[dict], batch_size: int = 1000) -> int:
+        """Run an `UNWIND $rows AS row ...` write over rows in chunks.
+
+        Each chunk is one managed write transaction, which the driver retries
+        on transient errors (deadlocks, leader changes). Returns rows written.
+        """
+        async def _write_chunk(tx, chunk):
+            result = await tx.run(query, {"rows": chunk})
+            await result.consume()
+
+        written = 0
+        try:
+            async with self.session() as session:
+                for start in range(0, len(rows), batch_size):
+                    chunk = rows[start:start + batch_size]
+                    await session.execute_write(_write_chunk, chunk)
+                    written += len(chunk)
+        finally:
+            if written:
+                graph_writes.bump()
+        return written
+
+    async def run_single(self, query: str, parameters: dict | None = None) -> Any:
+        """Run a query and return its first record, without counting it as a graph write (GDS catalog calls)"""
+        async with self.session() as session:
+            result = await session.run(query, parameters or {})
+            return await result.single()
+
+    async def get_stats(self) -> dict:
+        """Get database statistics; see GraphStore.get_stats"""
+        async with self.session() as session:
+            result = await session.run(GRAPH_TOKENS_QUERY)
+            tokens = await result.single()
+            labels, rel_types = tokens["labels"], tokens["rel_types"]
+
+            result = await session.run(
+                count_store_query(labels, rel_types),
+                {"labels": labels, "rel_types": rel_types}
+            )
+            return graph_stats([record async for record in result])
+
+    async def project_gds_graph(self, name: str, node_labels: list, rel_types: list) -> dict:
+        """Project a named GDS graph; see GraphStore.project_gds_graph"""
+        label_str = '|'.join(node_labels) if node_labels else '*'
+        rel_str = '|'.join(rel_types) if rel_types else '*'
+
+        query = f"""
+            CALL gds.graph.project(
+                $graph_name,
+                '{label_str}',
+                '{rel_str}'
+            ) YIELD graphName, nodeCount, relationshipCount
+            RETURN graphName, nodeCount, relationshipCount
+        """
+
+        try:
+            record = await self.run_single(query, {"graph_name": name})
+            if record:
+                return {
+                    "graph_name": record["graphName"],
+                    "node_count": record["nodeCount"],
+                    "relationship_count": record["relationshipCount"]
+                }
+            return {"error": "GDS projection failed"}
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def drop_gds_graph(self, name: str) -> dict:
+        """Drop a named GDS graph; see GraphStore.drop_gds_graph"""
+        query = """
+            CALL gds.graph.drop($graph_name)
+            YIELD graphName
+            RETURN graphName
+        """
+
+        try:
+            record = await self.run_single(query, {"graph_name": name})
+            if record:
+                return {"dropped": record["graphName"]}
+            return {"error": "GDS graph drop failed"}
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def merge_edge_temporal(
+        self,
+        source_label: str,
+        source_id: str,
+        target_label: str,
+        target_id: str,
+        rel_type: str,
+        properties: dict,
+        valid_from: datetime,
+        valid_to: datetime | None = None
+    ) -> dict:
+        """Merge edge with mandatory temporal bounds and version tracking"""
+        current = await self.execute_read(edge_version_query(rel_type), {
+            "source_id": int(source_id),
+            "target_id": int(target_id)
+        })
+        version = (current[0]["version"] if current else 0) + 1
+
+        properties = temporal_edge_properties(properties, version, valid_from, valid_to)
+        record = await self.execute_write(temporal_edge_query(source_label, target_label, rel_type), {
+            "source_id": node_id_param(source_id),
+            "target_id": node_id_param(target_id),
+            "properties": properties,
+            "valid_from": valid_from.isoformat()
+        })
+        return dict(record["r"]) if record else {}
@@ -0,0 +1,380 @@
+"""
+In-process CSR snapshot of the graph topology for traversal and centrality
+"""
+
+import asyncio
+import os
+import re
+import time
+from typing import Any
+
+import numpy as np
+from scipy import sparse
+
+from .async_graph_store import AsyncGraphStore
+from .graph_store import graph_writes, _quoted
+
+
+# Per-relationship factor multiplied along an impact path (see decision /impact)
+IMPACT_DECAY = {
+    "exponential": lambda confidence: confidence,
+    "linear": lambda confidence: 1.0 - (1.0 - confidence) * 0.2,
+}
+
+# One APOC relationshipFilter entry: TYPE (both directions), TYPE> (outgoing), <TYPE (incoming)
+_FILTER_TOKEN = re.compile(r"^(<)?([A-Za-z0-9_]*)(>)?$")
+
+
+def snapshot_query(labels: tuple[str, ...] | None) -> str:
+    """Cypher streaming one row per node with its outgoing relationships inside the snapshot"""
+    if labels:
+        n_filter = "WHERE " + " OR ".join(f"n:{_quoted(label)}" for label in labels)
+        t_filter = "WHERE " + " OR ".join(f"t:{_quoted(label)}" for label in labels)
+    else:
+        n_filter = t_filter = ""
+    return f"""
+        MATCH (n) {n_filter}
+        RETURN elementId(n) AS id,
+               labels(n) AS labels,
+               coalesce(n.name, n.title, n.content, 'Unknown') AS name,
+               CASE WHEN n:Company THEN n.ticker END AS ticker,
+               [(n)-[r]->(t) {t_filter} | [elementId(t), type(r), coalesce(r.confidence, 1.0)]] AS out
+    """
+
+
+class GraphSnapshot:
+    """Immutable node index plus relationship arrays, with sparse-matrix traversals.
+
+    `nodes` are dicts {id, labels, name, ticker}; `edges` are
+    (source_id, target_id, rel_type, confidence) tuples. Relationships whose
+    endpoints are not among the nodes are ignored. Traversal matrices and
+    PageRank vectors are built on first use and kept for the snapshot's life.
+    """
+
+    def __init__(
+        self,
+        nodes: list[dict],
+        edges: list[tuple[str, str, str, float]],
+        labels: tuple[str, ...] | None = None,
+        generation: int = 0,
+    ):
+        self.labels = labels
+        self.generation = generation
+        self.built_at = time.monotonic()
+
+        self.ids = [node["id"] for node in nodes]
+        self.names = [node.get("name") or "Unknown" for node in nodes]
+        self.kinds = [node["labels"][0] if node.get("labels") else "Unknown" for node in nodes]
+        self.index = {node_id: i for i, node_id in enumerate(self.ids)}
+        self.tickers = {
+            node["ticker"]: i for i, node in enumerate(nodes)
+            if node.get("ticker") is not None and "Company" in (node.get("labels") or ())
+        }
+        by_label: dict[str, list[int]] = {}
+        for i, node in enumerate(nodes):
+            for label in node.get("labels") or ():
+                by_label.setdefault(label, []).append(i)
+        self._by_label = {label: np.asarray(rows, dtype=np.int64) for label, rows in by_label.items()}
+
+        edges = [e for e in edges if e[0] in self.index and e[1] in self.index]
+        self.rel_types = sorted({e[2] for e in edges})
+        codes = {rel_type: code for code, rel_type in enumerate(self.rel_types)}
+        self.src = np.fromiter((self.index[e[0]] for e in edges), dtype=np.int64, count=len(edges))
+        self.dst = np.fromiter((self.index[e[1]] for e in edges), dtype=np.int64, count=len(edges))
+        self.rel = np.fromiter((codes[e[2]] for e in edges), dtype=np.int64, count=len(edges))
+        self.confidence = np.fromiter((float(e[3]) for e in edges), dtype=float, count=len(edges))
+
+        self._traversals: dict[tuple, sparse.csr_matrix | None] = {}
+        self._pagerank: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+        self._adjacency: sparse.csr_matrix | None = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.src)
+
+    def covers(self, label: str | None) -> bool:
+        """Whether the snapshot holds every node a query over `label` (None: all labels) can reach"""
+        if self.labels is None:
+            return True
+        return label is not None and label in self.labels
+
+    def node(self, ticker: str | None = None, node_id: str | None = None) -> int | None:
+        """Row of a Company by ticker or of any node by element id"""
+        if ticker is not None:
+            return self.tickers.get(ticker)
+        if node_id is not None:
+            return self.index.get(node_id)
+        return None
+
+    def nodes_with(self, label: str) -> np.ndarray:
+        return self._by_label.get(label, np.empty(0, dtype=np.int64))
+
+    # Traversal
+
+    def traversal(self, rel_filter: str | None = None, decay: str = "exponential") -> sparse.csr_matrix | None:
+        """(n x n) matrix of the strongest decay factor per traversable step i -> j.
+
+        rel_filter uses APOC's relationshipFilter syntax ('AFFECTS|SUPPLIES_TO>',
+        '<HARMS'); returns None for filters that syntax does not cover.
+        """
+        key = (rel_filter or "", decay)
+        if key not in self._traversals:
+            self._traversals[key] = self._build_traversal(rel_filter, IMPACT_DECAY[decay])
+        return self._traversals[key]
+
+    def _build_traversal(self, rel_filter: str | None, factor) -> sparse.csr_matrix | None:
+        tokens = [t.strip() for t in (rel_filter or "").split("|")] if rel_filter else [""]
+        codes = {rel_type: code for code, rel_type in enumerate(self.rel_types)}
+        weights = factor(self.confidence)
+
+        rows, cols, values = [], [], []
+        for token in tokens:
+            match = _FILTER_TOKEN.match(token)
+            if match is None:
+                return None
+            incoming, rel_type, outgoing = match.groups()
+            if rel_type:
+                selected = self.rel == codes.get(rel_type, -1)
+            else:
+                selected = np.ones(self.edge_count, dtype=bool)
+            if outgoing or not incoming:
+                rows.append(self.src[selected]); cols.append(self.dst[selected]); values.append(weights[selected])
+            if incoming or not outgoing:
+                rows.append(self.dst[selected]); cols.append(self.src[selected]); values.append(weights[selected])
+
+        rows, cols, values = np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+        # Parallel relationships: keep the strongest step between each pair
+        pair = rows * self.node_count + cols
+        order = np.lexsort((-values, pair))
+        pair, values = pair[order], values[order]
+        first = np.ones(len(pair), dtype=bool)
+        first[1:] = pair[1:] != pair[:-1]
+        pair, values = pair[first], values[first]
+
+        n = self.node_count
+        return sparse.csr_matrix((values, (pair // n, pair % n)), shape=(n, n))
+
+    @staticmethod
+    def _bfs(matrix: sparse.csr_matrix, source: int, max_depth: int) -> tuple[np.ndarray, np.ndarray]:
+        """Hop depth (-1: unreached) and best product of step factors over shortest-hop paths"""
+        n = matrix.shape[0]
+        depth = np.full(n, -1, dtype=np.int64)
+        score = np.zeros(n)
+        depth[source], score[source] = 0, 1.0
+        frontier = np.asarray([source])
+
+        for level in range(1, max_depth + 1):
+            steps = matrix[frontier]
+            cols = steps.indices
+            values = steps.data * np.repeat(score[frontier], np.diff(steps.indptr))
+            fresh = depth[cols] < 0
+            if not fresh.any():
+                break
+            cols, values = cols[fresh], values[fresh]
+            frontier = np.unique(cols)
+            depth[frontier] = level
+            score[frontier] = -np.inf
+            np.maximum.at(score, cols, values)
+        return depth, score
+
+    def k_hop(self, source: int, k: int, rel_filter: str | None = None) -> tuple[np.ndarray, np.ndarray] | None:
+        """Rows within k hops of source (excluding it) and their hop depth; None for unsupported filters"""
+        matrix = self.traversal(rel_filter)
+        if matrix is None:
+            return None
+        depth, _ = self._bfs(matrix, source, k)
+        reached = np.flatnonzero(depth > 0)
+        return reached, depth[reached]
+
+    def impact(
+        self,
+        source: int,
+        max_depth: int,
+        rel_filter: str | None = None,
+        decay: str = "exponential",
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+        """Rows reached from source within max_depth, their depth and decayed impact score.
+
+        Matches APOC expandConfig(bfs, NODE_GLOBAL) expansion: every node is
+        scored along a shortest-hop path. Where several such paths exist, the
+        strongest one counts (APOC keeps whichever it happens to expand first).
+        """
+        matrix = self.traversal(rel_filter, decay)
+        if matrix is None:
+            return None
+        depth, score = self._bfs(matrix, source, max_depth)
+        reached = np.flatnonzero(depth > 0)
+        return reached, depth[reached], score[reached]
+
+    # Centrality
+
+    def adjacency(self) -> sparse.csr_matrix:
+        """Directed relationship counts src -> dst (parallel relationships count separately)"""
+        if self._adjacency is None:
+            n = self.node_count
+            self._adjacency = sparse.csr_matrix(
+                (np.ones(self.edge_count), (self.src, self.dst)), shape=(n, n)
+            )
+        return self._adjacency
+
+    def pagerank(
+        self,
+        label: str | None = None,
+        damping: float = 0.85,
+        max_iterations: int = 20,
+        tolerance: float = 1e-7,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and PageRank scores over the snapshot, or over the subgraph induced by `label`.
+
+        Same scheme and defaults as gds.pageRank on a natural projection:
+        scores start at 1 - damping and are not normalized, dangling nodes
+        keep their rank, and a node stops passing on changes once its
+        per-iteration delta drops to `tolerance`.
+        """
+        key = (label, damping, max_iterations, tolerance)
+        if key in self._pagerank:
+            return self._pagerank[key]
+
+        matrix = self.adjacency()
+        rows = np.arange(self.node_count) if label is None else self.nodes_with(label)
+        if label is not None:
+            matrix = matrix[rows][:, rows]
+
+        out_degree = np.asarray(matrix.sum(axis=1)).ravel()
+        share = np.divide(1.0, out_degree, out=np.zeros_like(out_degree), where=out_degree > 0)
+        incoming = matrix.T.tocsr()
+
+        rank = np.full(len(rows), 1.0 - damping)
+        delta = rank.copy()
+        for _ in range(1, max_iterations):
+            sending = np.where(delta > tolerance, delta, 0.0) * share
+            if not sending.any():
+                break
+            delta = damping * (incoming @ sending)
+            rank += delta
+
+        self._pagerank[key] = (rows, rank)
+        return rows, rank
+
+    def status(self) -> dict:
+        return {
+            "labels": list(self.labels) if self.labels else "*",
+            "generation": self.generation,
+            "current_generation": graph_writes.value,
+            "age_seconds": round(time.monotonic() - self.built_at, 1),
+            "node_count": self.node_count,
+            "relationship_count": self.edge_count,
+            "relationship_types": len(self.rel_types),
+        }
+
+
+class SnapshotManager:
+    """Keeps one GraphSnapshot per process for routes that can run on it.
+
+    Disabled unless ARIADNE_CSR_SNAPSHOT=1; routes fall back to their Cypher
+    (APOC/GDS) path whenever current() returns None. The snapshot covers the
+    ARIADNE_CSR_LABELS nodes ('*', the default, for all; /impact needs the
+    whole graph because APOC follows every label) and is reloaded, with one streaming
+    query, after a graph write in this process or once it is older than
+    ARIADNE_CSR_SNAPSHOT_TTL seconds. Concurrent callers share one reload.
+
+        snapshot = await snapshots.current()
+        if snapshot is not None and snapshot.covers("Company"):
+            rows, scores = snapshot.pagerank("Company")
+    """
+
+    RETRY_AFTER = 30.0
+
+    def __init__(
+        self,
+        store: AsyncGraphStore,
+        enabled: bool | None = None,
+        labels: list[str] | None = None,
+        ttl: float | None = None,
+    ):
+        self.store = store
+        if enabled is None:
+            enabled = os.getenv("ARIADNE_CSR_SNAPSHOT", "0").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        if labels is None:
+            configured = os.getenv("ARIADNE_CSR_LABELS", "*").strip()
+            labels = None if configured == "*" else [l.strip() for l in configured.split(",") if l.strip()]
+        self.labels = tuple(labels) if labels else None
+        self.ttl = ttl if ttl is not None else float(os.getenv("ARIADNE_CSR_SNAPSHOT_TTL", "900"))
+        self._snapshot: GraphSnapshot | None = None
+        self._lock = asyncio.Lock()
+        self._loads = 0
+        self._failed_at: float | None = None
+        self.last_error: str | None = None
+
+    def _fresh(self, snapshot: GraphSnapshot | None) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.generation == graph_writes.value
+            and time.monotonic() - snapshot.built_at < self.ttl
+        )
+
+    async def current(self) -> GraphSnapshot | None:
+        """Fresh snapshot (reloaded if written past or expired), or None when disabled or unavailable"""
+        if not self.enabled:
+            return None
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._fresh(snapshot):
+                return snapshot
+            if self._failed_at is not None and time.monotonic() - self._failed_at < self.RETRY_AFTER:
+                return None
+            try:
+                snapshot = await self.load()
+            except Exception as e:
+                self._failed_at = time.monotonic()
+                self.last_error = str(e)
+                print(f"⚠️ CSR snapshot load failed, using Cypher fallbacks: {e}")
+                return None
+            self._snapshot, self._failed_at, self.last_error = snapshot, None, None
+            return snapshot
+
+    async def load(self) -> GraphSnapshot:
+        """Stream the covered nodes and their relationships into a new snapshot"""
+        # Generation read before loading: a write landing mid-load leaves the result stale
+        generation = graph_writes.value
+        self._loads += 1
+        nodes: list[dict] = []
+        edges: list[tuple[str, str, str, Any]] = []
+        async with self.store.session() as session:
+            result = await session.run(snapshot_query(self.labels))
+            async for record in result:
+                node_id = record["id"]
+                nodes.append({
+                    "id": node_id,
+                    "labels": record["labels"],
+                    "name": record["name"],
+                    "ticker": record["ticker"],
+                })
+                edges.extend((node_id, target, rel_type, confidence) for target, rel_type, confidence in record["out"])
+        return await asyncio.to_thread(GraphSnapshot, nodes, edges, self.labels, generation)
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+        self._failed_at = None
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "labels": list(self.labels) if self.labels else "*",
+            # A label-restricted snapshot misses paths APOC walks, so /impact keeps using APOC
+            "serves_impact": self.enabled and self.labels is None,
+            "ttl_seconds": self.ttl,
+            "loads": self._loads,
+            "fresh": self._fresh(self._snapshot),
+            "last_error": self.last_error,
+            "snapshot": self._snapshot.status() if self._snapshot else None,
+        }
@@ -4,10 +4,152 @@ Neo4j graph store wrapper
 
 from neo4j import GraphDatabase, Driver
 import os
+import threading
 from datetime import datetime
 from typing import Any
 
 
+class WriteGeneration:
+    """Process-wide counter bumped by every graph write path.
+
+    Derived state (GDS projections) records the generation it was built at
+    and is stale once the counter has moved on.
+    """
+    
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+    
+    def bump(self) -> int:
+        with self._lock:
+            self.value += 1
+            return self.value
+
+
+# Shared by GraphStore and AsyncGraphStore
+graph_writes = WriteGeneration()
+
+
+def driver_settings() -> dict:
+    """Connection-pool options shared by the sync and async drivers"""
+    return {
+        "max_connection_pool_size": int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+        "connection_acquisition_timeout": float(os.getenv("NEO4J_POOL_ACQUIRE_TIMEOUT", "60")),
+    }
+
+
+def edge_version_query(rel_type: str) -> str:
+    """Cypher for the current version of an edge (see GraphStore._get_edge_version_count)"""
+    return f"""
+        MATCH (s)-[r:{rel_type}]->(t)
+        WHERE id(s) = $source_id AND id(t) = $target_id
+        RETURN COALESCE(r.version, 0) AS version
+        ORDER BY version DESC
+        LIMIT 1
+    """
+
+
+def temporal_edge_query(source_label: str, target_label: str, rel_type: str) -> str:
+    """Cypher for GraphStore.merge_edge_temporal"""
+    return f"""
+        MATCH (s:{source_label}), (t:{target_label})
+        WHERE id(s) = $source_id AND id(t) = $target_id
+        
+        // Check for overlapping temporal edges
+        OPTIONAL MATCH (s)-[existing:{rel_type}]->(t)
+        WHERE existing.valid_to IS NULL OR existing.valid_to >= $valid_from
+        
+        WITH s, t, existing
+        WHERE existing IS NULL OR existing.valid_to < $valid_from
+        
+        MERGE (s)-[r:{rel_type}]->(t)
+        SET r += $properties
+        RETURN r
+    """
+
+
+def temporal_edge_properties(properties: dict, version: int, valid_from: datetime, valid_to: datetime | None) -> dict:
+    """Stamp mandatory temporal bounds, ingestion time and version onto edge properties"""
+    properties.update({
+        "valid_from": valid_from.isoformat(),
+        "valid_to": valid_to.isoformat() if valid_to else None,
+        "ingested_at": datetime.utcnow().isoformat(),
+        "version": version
+    })
+    return properties
+
+
+# Label and relationship-type tokens; the aggregating subquery keeps the row when no types exist
+GRAPH_TOKENS_QUERY = """
+    CALL db.labels() YIELD label
+    WITH collect(label) AS labels
+    CALL {
+        CALL db.relationshipTypes() YIELD relationshipType
+        RETURN collect(relationshipType) AS rel_types
+    }
+    RETURN labels, rel_types
+"""
+
+
+def _quoted(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def count_store_query(labels: list[str], rel_types: list[str]) -> str:
+    """Cypher for graph totals plus counts per label and per relationship type.
+
+    Every UNION branch is an unfiltered single-label (or single-type) count,
+    which Neo4j answers from its count store instead of scanning. Pass
+    {"labels": labels, "rel_types": rel_types} as parameters. Rows carry
+    kind ('node' or 'edge'), name (null for the totals) and count.
+    """
+    branches = [
+        "MATCH (n) RETURN 'node' AS kind, null AS name, count(n) AS count",
+        "MATCH ()-[r]->() RETURN 'edge' AS kind, null AS name, count(r) AS count",
+    ]
+    branches += [
+        f"MATCH (n:{_quoted(label)}) RETURN 'node' AS kind, $labels[{i}] AS name, count(n) AS count"
+        for i, label in enumerate(labels)
+    ]
+    branches += [
+        f"MATCH ()-[r:{_quoted(rel_type)}]->() RETURN 'edge' AS kind, $rel_types[{i}] AS name, count(r) AS count"
+        for i, rel_type in enumerate(rel_types)
+    ]
+    return "\nUNION ALL\n".join(branches)
+
+
+def graph_stats(rows) -> dict:
+    """get_stats() result from count_store_query rows.
+
+    A node with several labels counts once under each of them; the totals
+    count every node and relationship once. Tokens with no remaining
+    elements are left out.
+    """
+    totals = {"node": 0, "edge": 0}
+    by_name = {"node": {}, "edge": {}}
+    for row in rows:
+        if row["name"] is None:
+            totals[row["kind"]] = row["count"]
+        elif row["count"]:
+            by_name[row["kind"]][row["name"]] = row["count"]
+
+    return {
+        "nodes_by_label": by_name["node"],
+        "edges_by_type": by_name["edge"],
+        "total_nodes": totals["node"],
+        "total_edges": totals["edge"],
+        "last_updated": datetime.utcnow()
+    }
+
+
+def node_id_param(value):
+    """Internal node ids arrive as strings from the API; Cypher's id() compares integers"""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return value
+
+
 class GraphStore:
     """Neo4j graph database wrapper"""
     
@@ -20,7 +162,7 @@ class GraphStore:
     def connect(self):
         """Establish Neo4j connection"""
         if not self.driver:
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password), **driver_settings())
         return self
     
     def close(self):
@@ -120,12 +262,23 @@ class GraphStore:
                 FOR (r:Regime) ON (r.start_date, r.end_date)
             """)
             
+            # Blocking-Keys für /deduplicate/plan (nur Nodes mit gleichem Key werden verglichen)
+            for key in ("dedup_name_key", "dedup_phonetic_key", "dedup_lead_key"):
+                session.run(f"CREATE INDEX company_{key} IF NOT EXISTS FOR (c:Company) ON (c.{key})")
+            
             # Fulltext Index für freie Textsuche über alle relevanten Node-Typen
             session.run("""
                 CREATE FULLTEXT INDEX nodeFulltext IF NOT EXISTS
                 FOR (n:Company|Event|Concept|Hypothesis|Pattern|Regime)
                 ON EACH [n.name, n.title, n.description, n.content]
             """)
+            
+            # Fulltext Index für Topic-Lookups in /context (die Properties, die dort vorher per CONTAINS gescannt wurden)
+            session.run("""
+                CREATE FULLTEXT INDEX nodeTopicFulltext IF NOT EXISTS
+                FOR (n:Company|Event|Concept|Hypothesis|Pattern|Regime|Instrument|News|Location)
+                ON EACH [n.name, n.title, n.description, n.ticker, n.sector, n.industry, n.type, n.category]
+            """)
     
     def project_gds_graph(self, name: str, node_labels: list, rel_types: list) -> dict:
         """Projektiere Named GDS Graph für Analysen
@@ -197,37 +350,24 @@ class GraphStore:
     
     def execute_write(self, query: str, parameters: dict | None = None) -> Any:
         """Execute write query and return result"""
-        with self.driver.session() as session:
-            result = session.run(query, parameters or {})
-            return result.single()
+        try:
+            with self.driver.session() as session:
+                result = session.run(query, parameters or {})
+                return result.single()
+        finally:
+            graph_writes.bump()
     
     def get_stats(self) -> dict:
-        """Get database statistics"""
+        """Get database statistics (count-store lookups, no graph scan)"""
         with self.driver.session() as session:
-            # Node counts by label
-            node_result = session.run("""
-                MATCH (n)
-                RETURN labels(n)[0] AS label, count(n) AS count
-            """)
-            nodes_by_label = {record["label"]: record["count"] for record in node_result if record["label"]}
+            tokens = session.run(GRAPH_TOKENS_QUERY).single()
+            labels, rel_types = tokens["labels"], tokens["rel_types"]
             
-            # Edge counts by type
-            edge_result = session.run("""
-                MATCH ()-[r]->()
-                RETURN type(r) AS rel_type, count(r) AS count
-            """)
-            edges_by_type = {record["rel_type"]: record["count"] for record in edge_result if record["rel_type"]}
-            
-            total_nodes = sum(nodes_by_label.values()) if nodes_by_label else 0
-            total_edges = sum(edges_by_type.values()) if edges_by_type else 0
-            
-            return {
-                "nodes_by_label": nodes_by_label,
-                "edges_by_type": edges_by_type,
-                "total_nodes": total_nodes,
-                "total_edges": total_edges,
-                "last_updated": datetime.utcnow()
-            }
+            result = session.run(
+                count_store_query(labels, rel_types),
+                {"labels": labels, "rel_types": rel_types}
+            )
+            return graph_stats(result)
     
     def merge_node(self, label: str, properties: dict) -> dict:
         """Merge a node (create or update)"""
@@ -256,7 +396,8 @@ class GraphStore:
                 "properties": properties
             })
             record = result.single()
-            return dict(record["n"]) if record else {}
+        graph_writes.bump()
+        return dict(record["n"]) if record else {}
     
     def merge_edge(
         self,
@@ -286,17 +427,12 @@ class GraphStore:
                 "properties": properties
             })
             record = result.single()
-            return dict(record["r"]) if record else {}
+        graph_writes.bump()
+        return dict(record["r"]) if record else {}
     
     def _get_edge_version_count(self, source_id: str, target_id: str, rel_type: str) -> int:
         """Get current version count for an edge"""
-        query = f"""
-            MATCH (s)-[r:{rel_type}]->(t)
-            WHERE id(s) = $source_id AND id(t) = $target_id
-            RETURN COALESCE(r.version, 0) AS version
-            ORDER BY version DESC
-            LIMIT 1
-        """
+        query = edge_version_query(rel_type)
         
         with self.driver.session() as session:
             result = session.run(query, {
@@ -322,40 +458,12 @@ class GraphStore:
         # Get current version count
         version = self._get_edge_version_count(source_id, target_id, rel_type) + 1
         
-        # Enforce temporal metadata
-        properties.update({
-            "valid_from": valid_from.isoformat(),
-            "valid_to": valid_to.isoformat() if valid_to else None,
-            "ingested_at": datetime.utcnow().isoformat(),
-            "version": version
-        })
-        
-        # Query with temporal conflict check
-        query = f"""
-            MATCH (s:{source_label}), (t:{target_label})
-            WHERE id(s) = $source_id AND id(t) = $target_id
-            
-            // Check for overlapping temporal edges
-            OPTIONAL MATCH (s)-[existing:{rel_type}]->(t)
-            WHERE existing.valid_to IS NULL OR existing.valid_to >= $valid_from
-            
-            WITH s, t, existing
-            WHERE existing IS NULL OR existing.valid_to < $valid_from
-            
-            MERGE (s)-[r:{rel_type}]->(t)
-            SET r += $properties
-            RETURN r
-        """
+        properties = temporal_edge_properties(properties, version, valid_from, valid_to)
+        query = temporal_edge_query(source_label, target_label, rel_type)
         
         with self.driver.session() as session:
-            # Handle both string and int IDs
-            try:
-                src_id = int(source_id)
-                tgt_id = int(target_id)
-            except (ValueError, TypeError):
-                # Already integers or conversion failed
-                src_id = source_id
-                tgt_id = target_id
+            src_id = node_id_param(source_id)
+            tgt_id = node_id_param(target_id)
             
             result = session.run(query, {
                 "source_id": src_id,
@@ -364,5 +472,6 @@ class GraphStore:
                 "valid_from": valid_from.isoformat()
             })
             record = result.single()
-            return dict(record["r"]) if record else {}
+        graph_writes.bump()
+        return dict(record["r"]) if record else {}
 
@@ -0,0 +1,15 @@
+"""
+Batched write settings and queries shared by the ingestion and learn routers
+"""
+
+import os
+
+# Satbase requests in flight at once, and rows per UNWIND write transaction
+INGEST_FETCH_CONCURRENCY = int(os.getenv("ARIADNE_INGEST_FETCH_CONCURRENCY", "8"))
+INGEST_WRITE_BATCH = int(os.getenv("ARIADNE_INGEST_WRITE_BATCH", "1000"))
+
+UPSERT_INSTRUMENTS = """
+    UNWIND $rows AS row
+    MERGE (i:Instrument {symbol: row.symbol})
+    SET i.updated_at = datetime()
+"""
@@ -0,0 +1,183 @@
+"""
+Long-lived GDS graph projections shared across requests
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from .async_graph_store import AsyncGraphStore
+from .graph_store import graph_writes
+
+
+@dataclass
+class Projection:
+    """One projection in the GDS catalog"""
+    name: str
+    key: str
+    generation: int
+    built_at: float
+    node_count: int = 0
+    relationship_count: int = 0
+    users: int = 0
+    retired: bool = False
+
+
+class ProjectionManager:
+    """Keeps named GDS projections alive between requests.
+
+    Projections are keyed by (labels, relationship types, properties, config)
+    and reused until the graph write generation moves past the one they were
+    built at, or they are older than `ttl` seconds (which also bounds staleness
+    from writes made outside this process). Concurrent callers for the same
+    key share one rebuild. A replaced projection is dropped once its last user
+    is done, so a rebuild never pulls a graph out from under a running stream.
+
+        async with projections.use(["Company"], ["SUPPLIES_TO"]) as graph_name:
+            rows = await store.execute_read("CALL gds.pageRank.stream($g) ...", {"g": graph_name})
+    """
+
+    def __init__(self, store: AsyncGraphStore, ttl: float | None = None, prefix: str = "ariadne"):
+        self.store = store
+        self.ttl = ttl if ttl is not None else float(os.getenv("ARIADNE_GDS_PROJECTION_TTL", "900"))
+        # Per-process names: workers never drop each other's projections
+        self.prefix = f"{prefix}_{os.getpid()}"
+        self._current: dict[str, Projection] = {}
+        self._retired: list[Projection] = []
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._builds = 0
+
+    @staticmethod
+    def key(labels: list[str] | None, relationships: list[str] | dict | None,
+            properties: list[str] | None = None, config: dict | None = None) -> str:
+        """Canonical key for a projection definition"""
+        return json.dumps(
+            [sorted(labels or []), relationships or [], sorted(properties or []), config or {}],
+            sort_keys=True,
+        )
+
+    def _fresh(self, projection: Projection | None) -> bool:
+        return (
+            projection is not None
+            and projection.generation == graph_writes.value
+            and time.monotonic() - projection.built_at < self.ttl
+        )
+
+    async def acquire(self, labels: list[str] | None, relationships: list[str] | dict | None = None,
+                      properties: list[str] | None = None, config: dict | None = None) -> Projection:
+        """Fresh projection for the definition (built if missing, stale or expired); pair with release()"""
+        key = self.key(labels, relationships, properties, config)
+        projection = self._current.get(key)
+        if not self._fresh(projection):
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                projection = self._current.get(key)
+                if not self._fresh(projection):
+                    projection = await self._build(key, labels, relationships, properties, config)
+        projection.users += 1
+        return projection
+
+    async def release(self, projection: Projection) -> None:
+        projection.users -= 1
+        await self._sweep()
+
+    @asynccontextmanager
+    async def use(self, labels: list[str] | None, relationships: list[str] | dict | None = None,
+                  properties: list[str] | None = None, config: dict | None = None):
+        """Name of a fresh projection, held for the duration of the block"""
+        projection = await self.acquire(labels, relationships, properties, config)
+        try:
+            yield projection.name
+        finally:
+            await self.release(projection)
+
+    async def _build(self, key: str, labels, relationships, properties, config) -> Projection:
+        # Generation read before projecting: a write landing mid-build leaves the result stale
+        generation = graph_writes.value
+        self._builds += 1
+        digest = hashlib.sha1(key.encode()).hexdigest()[:10]
+        name = f"{self.prefix}_{digest}_{self._builds}"
+
+        project_config = dict(config or {})
+        if properties:
+            project_config["relationshipProperties"] = list(properties)
+        record = await self.store.run_single(
+            """
+            CALL gds.graph.project($name, $nodes, $relationships, $config)
+            YIELD graphName, nodeCount, relationshipCount
+            RETURN graphName, nodeCount, relationshipCount
+            """,
+            {
+                "name": name,
+                "nodes": list(labels) if labels else "*",
+                "relationships": relationships or "*",
+                "config": project_config,
+            },
+        )
+        projection = Projection(
+            name=name,
+            key=key,
+            generation=generation,
+            built_at=time.monotonic(),
+            node_count=record["nodeCount"] if record else 0,
+            relationship_count=record["relationshipCount"] if record else 0,
+        )
+        previous = self._current.get(key)
+        if previous is not None:
+            previous.retired = True
+            self._retired.append(previous)
+        self._current[key] = projection
+        await self._sweep()
+        return projection
+
+    async def _sweep(self) -> None:
+        """Drop retired projections nobody is using, and expired ones left idle"""
+        now = time.monotonic()
+        for key, projection in list(self._current.items()):
+            if projection.users == 0 and now - projection.built_at >= self.ttl:
+                del self._current[key]
+                projection.retired = True
+                self._retired.append(projection)
+        idle = [p for p in self._retired if p.users <= 0]
+        self._retired = [p for p in self._retired if p.users > 0]
+        for projection in idle:
+            await self._drop(projection.name)
+
+    async def _drop(self, name: str) -> None:
+        try:
+            await self.store.run_single("CALL gds.graph.drop($name, false) YIELD graphName", {"name": name})
+        except Exception:
+            pass
+
+    async def drop_all(self) -> int:
+        """Drop every projection this manager created (shutdown, admin reset)"""
+        projections = list(self._current.values()) + self._retired
+        self._current = {}
+        # Ones still streaming are dropped when released
+        self._retired = [p for p in projections if p.users > 0]
+        for projection in projections:
+            if projection.users <= 0:
+                await self._drop(projection.name)
+        return len(projections)
+
+    def status(self) -> list[dict]:
+        """Catalog of live projections with freshness"""
+        now = time.monotonic()
+        return [
+            {
+                "name": p.name,
+                "key": json.loads(p.key),
+                "generation": p.generation,
+                "current_generation": graph_writes.value,
+                "age_seconds": round(now - p.built_at, 1),
+                "fresh": self._fresh(p),
+                "node_count": p.node_count,
+                "relationship_count": p.relationship_count,
+                "users": p.users,
+            }
+            for p in self._current.values()
+        ]
@@ -0,0 +1,94 @@
+"""
+Small in-process cache for query results derived from the graph
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from .graph_store import graph_writes
+
+
+class ResultCache:
+    """LRU cache whose entries expire after `ttl` seconds or on the next graph write.
+
+    Each entry records the write generation that was current before it was
+    computed, so a write landing while the query runs leaves it stale. Writes
+    made by other processes only show up through the TTL. Concurrent misses
+    on the same key share one load.
+
+        subgraph = await cache.get_or_load(("topic", topic, depth), lambda: load_subgraph(...))
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[int, float, Any]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Cached value, or None when missing, expired or written past"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        generation, stored_at, value = entry
+        if generation != graph_writes.value or time.monotonic() - stored_at >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        if self.ttl <= 0 or generation != graph_writes.value:
+            return
+        self._entries[key] = (generation, time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for key, else await loader() once (shared by concurrent callers) and cache it"""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        generation = graph_writes.value
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't leave "exception never retrieved" behind
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+            self.put(key, value, generation)
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def status(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -3,6 +3,9 @@ Ariadne utilities
 """
 
 from .manifold_sync import ManifoldSync
+from .serialization import plain, plain_properties, node_dict, edge_dict, GraphCollector, dumps
+from .name_keys import blocking_keys, name_similarity, candidate_pairs
 
-__all__ = ["ManifoldSync"]
+__all__ = ["ManifoldSync", "plain", "plain_properties", "node_dict", "edge_dict", "GraphCollector", "dumps",
+           "blocking_keys", "name_similarity", "candidate_pairs"]
 
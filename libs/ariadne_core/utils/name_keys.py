@@ -0,0 +1,132 @@
+"""
+Normalized name keys for duplicate blocking.
+Nodes are only compared with nodes sharing at least one key.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Dict, Iterable, List, Tuple
+
+# Bump when normalization changes: stored keys carry the version and are recomputed
+BLOCKING_KEY_VERSION = 1
+
+# Legal forms dropped from the end of a name ("Apple Inc." == "Apple")
+LEGAL_SUFFIXES = frozenset({
+    "inc", "incorporated", "corp", "corporation", "co", "company", "companies", "ltd", "limited",
+    "llc", "llp", "lp", "plc", "pte", "pty", "ag", "se", "sa", "sas", "spa", "nv", "bv", "gmbh",
+    "kg", "kgaa", "ab", "asa", "oyj", "kk", "srl", "sarl", "bhd", "tbk", "na",
+})
+STOPWORDS = frozenset({"the", "and", "of"})
+
+_SEPARATORS = re.compile(r"[\W_]+")
+_SOUNDEX_DIGITS = {
+    letter: digit
+    for digit, letters in {"1": "bfpv", "2": "cgjkqsxz", "3": "dt", "4": "l", "5": "mn", "6": "r"}.items()
+    for letter in letters
+}
+
+
+def name_tokens(name: str | None) -> List[str]:
+    """Casefolded, accent- and punctuation-free tokens without stopwords or trailing legal forms"""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    # "S.A." -> "sa", "AT&T" -> "at and t"
+    text = text.replace(".", "").replace("&", " and ")
+    tokens = [t for t in _SEPARATORS.split(text) if t and t not in STOPWORDS]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return tokens
+
+
+def soundex(token: str, length: int | None = 4) -> str:
+    """
+    American Soundex code of a token (digits-only tokens are kept as they are).
+    length=None keeps every consonant class instead of cutting after four characters.
+    """
+    letters = [c for c in token if "a" <= c <= "z"]
+    if not letters:
+        return token[:length]
+    code = letters[0].upper()
+    last = _SOUNDEX_DIGITS.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_DIGITS.get(c, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == length:
+                break
+        if c not in "hw":
+            last = digit
+    return code.ljust(length or 0, "0")
+
+
+def blocking_keys(name: str | None) -> Dict[str, str | None]:
+    """
+    Blocking keys for a name.
+
+    - name_key: sorted tokens ("Motors Tesla Inc" == "Tesla Motors")
+    - phonetic_key: sorted untruncated Soundex codes of the tokens (spelling
+      variants; the four-character code lumps long names together)
+    - lead_key: first token, or the first two when it is shorter than 3 characters
+      ("Tesla" and "Tesla Motors" share it)
+    """
+    tokens = name_tokens(name)
+    if not tokens:
+        return {"name_key": None, "phonetic_key": None, "lead_key": None}
+    return {
+        "name_key": " ".join(sorted(tokens)),
+        "phonetic_key": " ".join(sorted(soundex(t, length=None) for t in tokens)),
+        "lead_key": tokens[0] if len(tokens[0]) >= 3 else " ".join(tokens[:2]),
+    }
+
+
+def name_similarity(name_key_a: str, name_key_b: str, threshold: float = 0.0) -> float:
+    """
+    Similarity of two name keys in [0, 1].
+
+    1.0 for equal keys, at least 0.9 when one name's tokens contain the
+    other's, otherwise the edit-based ratio of the keys. With a threshold,
+    pairs whose cheap upper bounds already fall below it return 0.0.
+    """
+    if name_key_a == name_key_b:
+        return 1.0
+    tokens_a, tokens_b = set(name_key_a.split()), set(name_key_b.split())
+    floor = 0.9 if tokens_a <= tokens_b or tokens_b <= tokens_a else 0.0
+    length_a, length_b = len(name_key_a), len(name_key_b)
+    if max(floor, 2 * min(length_a, length_b) / (length_a + length_b)) < threshold:
+        return 0.0
+    matcher = SequenceMatcher(None, name_key_a, name_key_b)
+    if max(floor, matcher.real_quick_ratio()) < threshold or max(floor, matcher.quick_ratio()) < threshold:
+        return 0.0
+    return max(floor, matcher.ratio())
+
+
+def candidate_pairs(
+    blocks: Dict[str, Iterable[List[Dict]]],
+    threshold: float
+) -> List[Tuple[str, str, float, List[str]]]:
+    """
+    Score every pair of nodes that share a block.
+
+    Args:
+        blocks: Key kind -> blocks, each a list of {id, name_key} members
+        threshold: Minimum name similarity
+
+    Returns:
+        (id_a, id_b, similarity, matched key kinds) with id_a < id_b,
+        best first
+    """
+    pairs: Dict[Tuple[str, str], list] = {}
+    for kind, kind_blocks in blocks.items():
+        for members in kind_blocks:
+            for a, b in combinations(members, 2):
+                key = (a["id"], b["id"]) if a["id"] < b["id"] else (b["id"], a["id"])
+                entry = pairs.get(key)
+                if entry is None:
+                    entry = pairs[key] = [name_similarity(a["name_key"], b["name_key"], threshold), []]
+                entry[1].append(kind)
+
+    scored = [(a, b, score, kinds) for (a, b), (score, kinds) in pairs.items() if score >= threshold]
+    scored.sort(key=lambda p: (-p[2], p[0], p[1]))
+    return scored
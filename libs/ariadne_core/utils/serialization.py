@@ -0,0 +1,177 @@
+"""
+Neo4j driver values to plain JSON structures, rendered with orjson
+"""
+
+from datetime import date, datetime, time
+from typing import Any, Callable, Iterable
+
+import orjson
+from neo4j import Record
+from neo4j.graph import Node, Relationship, Path
+from neo4j.time import Date, DateTime, Time, Duration
+
+
+def _temporal(value) -> Any:
+    native = value.to_native()
+    return native.isoformat() if hasattr(native, "isoformat") else native
+
+
+def _identity(value) -> Any:
+    return value
+
+
+def _sequence(value) -> list:
+    return [plain(v) for v in value]
+
+
+def _mapping(value) -> dict:
+    return {k: plain(v) for k, v in value.items()}
+
+
+def _iso(value) -> str:
+    return value.isoformat()
+
+
+# Exact type -> converter; subclasses (each relationship type is its own class) resolve
+# through the MRO once and are cached here
+_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+    type(None): _identity,
+    list: _sequence,
+    tuple: _sequence,
+    set: _sequence,
+    frozenset: _sequence,
+    dict: _mapping,
+    Record: _mapping,
+    DateTime: _temporal,
+    Date: _temporal,
+    Time: _temporal,
+    Duration: str,
+    datetime: _iso,
+    date: _iso,
+    time: _iso,
+}
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+def _converter(cls: type) -> Callable[[Any], Any]:
+    converter = _CONVERTERS.get(cls)
+    if converter is None:
+        converter = str
+        for base in cls.__mro__[1:]:
+            if base in _CONVERTERS:
+                converter = _CONVERTERS[base]
+                break
+        _CONVERTERS[cls] = converter
+    return converter
+
+
+def plain(value: Any) -> Any:
+    """Any driver value as JSON-ready Python (temporals as ISO strings, graph entities as dicts)"""
+    return _converter(type(value))(value)
+
+
+def plain_properties(entity) -> dict:
+    """Properties of a node or relationship; only non-primitive values take the converter path"""
+    return {
+        k: v if type(v) in _PRIMITIVES else plain(v)
+        for k, v in entity.items()
+    }
+
+
+def node_dict(node: Node) -> dict:
+    """Node as {id, label, properties} (the shape of models.Node)"""
+    labels = node.labels
+    return {
+        "id": node.element_id,
+        "label": next(iter(labels)) if labels else "Unknown",
+        "properties": plain_properties(node),
+    }
+
+
+def edge_dict(relationship: Relationship) -> dict:
+    """Relationship as {source_id, target_id, rel_type, properties} (the shape of models.Edge)"""
+    return {
+        "source_id": relationship.start_node.element_id,
+        "target_id": relationship.end_node.element_id,
+        "rel_type": relationship.type,
+        "properties": plain_properties(relationship),
+    }
+
+
+def path_dict(path: Path) -> dict:
+    return {
+        "nodes": [node_dict(n) for n in path.nodes],
+        "relationships": [edge_dict(r) for r in path.relationships],
+    }
+
+
+_CONVERTERS.update({Node: node_dict, Relationship: edge_dict, Path: path_dict})
+
+
+class GraphCollector:
+    """Nodes and edges gathered from query results, each converted once per element id.
+
+    Rows that repeat an element (a seed on every expansion row, a node shared
+    by several paths) reuse the first conversion.
+    """
+
+    def __init__(self):
+        self._nodes: dict[str, dict] = {}
+        self._edges: dict[str, dict] = {}
+
+    def node(self, node: Node) -> dict:
+        converted = self._nodes.get(node.element_id)
+        if converted is None:
+            converted = self._nodes[node.element_id] = node_dict(node)
+        return converted
+
+    def edge(self, relationship: Relationship) -> dict:
+        converted = self._edges.get(relationship.element_id)
+        if converted is None:
+            converted = self._edges[relationship.element_id] = edge_dict(relationship)
+        return converted
+
+    def add(self, value: Any) -> None:
+        """Collect every node, relationship and path in value (lists are walked)"""
+        if isinstance(value, Node):
+            self.node(value)
+        elif isinstance(value, Relationship):
+            self.edge(value)
+        elif isinstance(value, Path):
+            for node in value.nodes:
+                self.node(node)
+            for relationship in value.relationships:
+                self.edge(relationship)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self.add(item)
+
+    def add_records(self, records: Iterable[dict]) -> "GraphCollector":
+        for record in records:
+            for value in record.values():
+                if value is not None:
+                    self.add(value)
+        return self
+
+    @property
+    def nodes(self) -> list[dict]:
+        return list(self._nodes.values())
+
+    @property
+    def edges(self) -> list[dict]:
+        return list(self._edges.values())
+
+
+def _default(value: Any) -> Any:
+    # orjson handles str/int/float/bool/None/list/dict/datetime natively and calls back for the rest
+    converter = _converter(type(value))
+    return str(value) if converter is _identity else converter(value)
+
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes for a response body; driver values left in `content` are converted on the way"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -0,0 +1,114 @@
+import os
+import resource
+import threading
+import time
+from typing import Callable, Optional
+
+
+def process_rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB (None if unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / 1e6, 1)
+    except Exception:
+        pass
+    try:
+        # ru_maxrss is KB on Linux (peak, not current) - better than nothing
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3, 1)
+    except Exception:
+        return None
+
+
+class ModelLifecycle:
+    """Loads and warms the embedding model once, tracking readiness.
+
+    States: not_loaded -> loading -> warming -> ready (or error).
+    preload() is meant to run in a background thread at startup; get() returns
+    the instance, loading it on the calling thread if nothing did so yet.
+    Services differ only in how they report; override _report() for that.
+    """
+
+    def __init__(self, factory: Callable[[], object]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self.instance = None
+        self.state = "not_loaded"
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.rss_before_mb: Optional[float] = None
+        self.rss_after_mb: Optional[float] = None
+        self.footprint: dict = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    @property
+    def loading(self) -> bool:
+        return self.state in ("loading", "warming")
+
+    def load(self, warmup: bool = True):
+        """Load (and optionally warm) the model; no-op if already loaded"""
+        with self._lock:
+            if self.instance is not None:
+                return self.instance
+            try:
+                self.state = "loading"
+                self.error = None
+                self.rss_before_mb = process_rss_mb()
+                t0 = time.perf_counter()
+                instance = self._factory()
+                self.load_seconds = round(time.perf_counter() - t0, 2)
+
+                if warmup and hasattr(instance, "warmup"):
+                    self.state = "warming"
+                    t0 = time.perf_counter()
+                    instance.warmup()
+                    self.warmup_seconds = round(time.perf_counter() - t0, 2)
+
+                self.rss_after_mb = process_rss_mb()
+                if hasattr(instance, "memory_footprint"):
+                    self.footprint = instance.memory_footprint()
+                self.instance = instance
+                self.state = "ready"
+                self._report(f"✓ Model ready (load {self.load_seconds}s, warmup {self.warmup_seconds}s)")
+            except Exception as e:
+                self.state = "error"
+                self.error = str(e)
+                self._report(f"❌ Model load failed: {e}", error=True)
+                raise
+            return self.instance
+
+    def _report(self, message: str, error: bool = False) -> None:
+        print(message)
+
+    def preload(self):
+        """Startup entry point: load + warm, recording (not raising) failures"""
+        try:
+            self.load()
+        except Exception:
+            pass
+
+    def get(self):
+        if self.instance is not None:
+            return self.instance
+        return self.load(warmup=False)
+
+    def status(self) -> dict:
+        rss_delta = None
+        if self.rss_before_mb is not None and self.rss_after_mb is not None:
+            rss_delta = round(self.rss_after_mb - self.rss_before_mb, 1)
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "memory": {
+                "process_rss_mb": process_rss_mb(),
+                "load_rss_delta_mb": rss_delta,
+                **self.footprint,
+            },
+        }
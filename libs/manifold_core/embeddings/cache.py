@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from libs.manifold_core.embeddings.provider import EmbeddingProvider
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive form of a text (tokenizers ignore runs of whitespace)."""
+    return " ".join((text or "").split())
+
+
+class EmbeddingCache:
+    """Persistent vector cache keyed by (model id, hash of normalized text).
+
+    Vectors are stored as float32 blobs in SQLite. Lookups read through a
+    per-thread connection (WAL lets them run beside the writer) and only
+    note each hit's last_used stamp in memory; the stamps are written in
+    one batch with the next put_many, or once `flush_every` hits or
+    `flush_interval` seconds have piled up. Once the table grows past
+    `max_entries` the least recently used rows are evicted (down to 90% of
+    the cap, so eviction runs in bursts rather than on every insert).
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        max_entries: int = 50000,
+        flush_interval: float = 30.0,
+        flush_every: int = 1000,
+    ):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self._in_memory = str(db_path) == ":memory:"
+        if not self._in_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._readers = threading.local()
+        # (model, text_hash) -> last_used not yet written; guarded by _touch_lock
+        self._touched: Dict[Tuple[str, str], float] = {}
+        self._touch_lock = threading.Lock()
+        self._flushed_at = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._init_schema()
+        with self._lock:
+            self._entries = self.conn().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def conn(self) -> sqlite3.Connection:
+        """Shared connection; callers serialize access via self._lock."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+            if not self._in_memory:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    def _reader(self) -> Optional[sqlite3.Connection]:
+        """This thread's read-only connection (None for :memory:, which has only the shared one)."""
+        if self._in_memory:
+            return None
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = self._readers.conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        return conn
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            conn = self.conn()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+            conn.commit()
+
+    @staticmethod
+    def text_hash(text: str, is_query: bool = False) -> str:
+        # Query and passage embeddings differ for e5-style models
+        prefix = "q" if is_query else "p"
+        return hashlib.sha256(f"{prefix}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the given hashes ({hash: vector}); notes their LRU stamp."""
+        unique = list(dict.fromkeys(hashes))
+        reader = self._reader()
+        if reader is None:
+            with self._lock:
+                found = self._select(self.conn(), model, unique)
+        else:
+            found = self._select(reader, model, unique)
+
+        now = time.time()
+        with self._touch_lock:
+            for text_hash in found:
+                self._touched[(model, text_hash)] = now
+            self.hits += sum(1 for h in hashes if h in found)
+            self.misses += sum(1 for h in hashes if h not in found)
+            due = len(self._touched) >= self.flush_every or now - self._flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+        return found
+
+    @staticmethod
+    def _select(conn: sqlite3.Connection, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                (model, *chunk),
+            ).fetchall()
+            for text_hash, blob in rows:
+                found[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _write_touches(self, conn: sqlite3.Connection) -> None:
+        """Write pending last_used stamps; the caller holds self._lock and commits."""
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+            self._flushed_at = time.time()
+        if touched:
+            conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                [(last_used, model, text_hash) for (model, text_hash), last_used in touched.items()],
+            )
+
+    def flush(self) -> None:
+        """Write the last_used stamps noted by get_many since the last flush."""
+        with self._lock:
+            conn = self.conn()
+            self._write_touches(conn)
+            conn.commit()
+
+    def put_many(self, model: str, items: Sequence[Tuple[str, List[float]]]) -> None:
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for text_hash, vector in items:
+            arr = np.asarray(vector, dtype=np.float32)
+            rows.append((model, text_hash, int(arr.shape[0]), arr.tobytes(), now))
+        with self._lock:
+            conn = self.conn()
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+            self._entries += conn.total_changes - before
+            # Eviction orders by last_used, so pending stamps go in first
+            self._write_touches(conn)
+            if self._entries > self.max_entries:
+                self._evict(conn, self._entries - int(self.max_entries * 0.9))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, count: int) -> None:
+        conn.execute(
+            """
+            DELETE FROM embeddings WHERE rowid IN (
+                SELECT rowid FROM embeddings ORDER BY last_used ASC, rowid ASC LIMIT ?
+            )
+            """,
+            (count,),
+        )
+        self.evictions += count
+        self._entries = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self.conn()
+            conn.execute("DELETE FROM embeddings")
+            conn.commit()
+            self._entries = 0
+            with self._touch_lock:
+                self._touched = {}
+                self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "path": str(self.db_path),
+        }
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """Wraps a provider so every embed path checks the EmbeddingCache first.
+
+    Only cache misses reach the wrapped model, in a single embed_batch call.
+    Warm-up bypasses the cache (it exists to exercise the model).
+    """
+
+    def __init__(self, inner: EmbeddingProvider, cache: EmbeddingCache, model_id: str):
+        self.inner = inner
+        self.cache = cache
+        self.model_id = model_id
+
+    def embed(self, text: str, is_query: bool = False) -> List[float]:
+        return self.embed_batch([text], is_query=is_query)[0]
+
+    def embed_batch(self, texts: List[str], is_query: bool = False) -> List[List[float]]:
+        hashes = [EmbeddingCache.text_hash(t, is_query) for t in texts]
+        found = self.cache.get_many(self.model_id, hashes)
+        missing: Dict[str, str] = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in found:
+                missing.setdefault(text_hash, text)
+        if missing:
+            vectors = self.inner.embed_batch(list(missing.values()), is_query=is_query)
+            fresh = list(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model_id, fresh)
+            found.update(fresh)
+        return [found[h] for h in hashes]
+
+    def warmup(self, *args, **kwargs) -> None:
+        self.inner.warmup(*args, **kwargs)
+
+    def memory_footprint(self) -> dict:
+        return self.inner.memory_footprint()
+
+    def __getattr__(self, name):
+        # model, model_name, ... of the wrapped provider
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional
+
+from libs.manifold_core.embeddings.provider import EmbeddingProvider
+
+
+class EmbeddingExecutor:
+    """Dedicated, bounded thread pool for model inference from async routes.
+
+    `max_workers` threads run the model; at most `max_pending` calls may be
+    queued or running at once; further callers wait on the event loop (not in
+    a thread) until a slot frees up. Keeps embedding off the default
+    threadpool that sync routes use.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        # Both created on first use (the semaphore must belong to the serving loop)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def run(self, fn, *args, **kwargs):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="manifold-embed")
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+
+    async def embed(self, embedder: EmbeddingProvider, text: str, is_query: bool = False) -> List[float]:
+        return await self.run(embedder.embed, text, is_query=is_query)
+
+    async def embed_many(self, embedder: EmbeddingProvider, items: List[Dict[str, str]], is_query: bool = False) -> List[Dict[str, List[float]]]:
+        return await self.run(embedder.embed_many, items, is_query=is_query)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._slots = None
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import hashlib
+from typing import List
+
+import numpy as np
+
+from libs.manifold_core.embeddings.provider import EmbeddingProvider
+
+
+class HashEmbeddings(EmbeddingProvider):
+    """Deterministic pseudo-embeddings seeded from a hash of the text.
+
+    No model, no download: identical texts map to identical unit vectors and
+    different texts to near-orthogonal ones. Meant for tests and benchmarks
+    (pair with MANIFOLD_QDRANT_PATH for a fully in-process Manifold).
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.model_name = f"hash-{dim}"
+
+    def _vector(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+        v = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return (v / np.linalg.norm(v)).tolist()
+
+    def embed(self, text: str, is_query: bool = False) -> List[float]:
+        return self._vector(text)
+
+    def embed_batch(self, texts: List[str], is_query: bool = False) -> List[List[float]]:
+        return [self._vector(t) for t in texts]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import logging
+
+from libs.common.model_lifecycle import ModelLifecycle
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["EmbeddingLifecycle"]
+
+
+class EmbeddingLifecycle(ModelLifecycle):
+    """Owns the process-wide embedding provider and its readiness state.
+
+    The shared ModelLifecycle state machine (Tesseract uses it too), reporting
+    through logging instead of print.
+    """
+
+    def _report(self, message: str, error: bool = False) -> None:
+        if error:
+            logger.error(message, exc_info=True)
+        else:
+            logger.info(message)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from typing import List
 from sentence_transformers import SentenceTransformer
 import torch
@@ -19,6 +20,8 @@ class LocalHuggingFaceEmbeddings(EmbeddingProvider):
             device=device or ("cuda" if torch.cuda.is_available() else "cpu")
         )
         self.model_name = model_name
+        # Sentences per forward pass; encode() sorts by length so padding stays tight
+        self.batch_size = int(os.getenv("MANIFOLD_EMBED_BATCH_SIZE", "64"))
         # Detect if this is an e5-family model (needs query/passage prefixes)
         self._is_e5_model = "e5" in model_name.lower() or "multilingual-e5" in model_name.lower()
 
@@ -34,6 +37,19 @@ class LocalHuggingFaceEmbeddings(EmbeddingProvider):
         if self._is_e5_model:
             prefix = "query: " if is_query else "passage: "
             texts = [f"{prefix}{t}" for t in texts]
-        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).tolist()
-
+        return self.model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True
+        ).tolist()
 
+    def memory_footprint(self) -> dict:
+        """Parameter memory plus CUDA allocations (if on GPU) in MB."""
+        footprint = {
+            "model_params_mb": round(
+                sum(p.numel() * p.element_size() for p in self.model.parameters()) / 1e6, 1
+            ),
+            "device": str(self.model.device),
+        }
+        if self.model.device.type == "cuda":
+            footprint["cuda_allocated_mb"] = round(torch.cuda.memory_allocated() / 1e6, 1)
+            footprint["cuda_reserved_mb"] = round(torch.cuda.memory_reserved() / 1e6, 1)
+        return footprint
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-from typing import List
+from typing import Dict, List
 from abc import ABC, abstractmethod
 
 
@@ -17,6 +17,40 @@ class EmbeddingProvider(ABC):
     def embed_batch(self, texts: List[str], is_query: bool = False) -> List[List[float]]:
         """Embed batch of texts. For e5-family models, use is_query=True for search queries."""
         pass
+    
+    def embed_many(self, items: List[Dict[str, str]], is_query: bool = False) -> List[Dict[str, List[float]]]:
+        """Embed several named texts per item in one embed_batch call.
+        
+        items is e.g. [{"text": content, "title": title, "summary": summary}, ...];
+        returns the same shape with vectors. Identical strings (a title reused as
+        summary, repeated section titles) are embedded once.
+        """
+        unique: Dict[str, int] = {}
+        for item in items:
+            for text in item.values():
+                unique.setdefault(text, len(unique))
+        if not unique:
+            return [{} for _ in items]
+        vectors = self.embed_batch(list(unique), is_query=is_query)
+        return [
+            {name: vectors[unique[text]] for name, text in item.items()}
+            for item in items
+        ]
+    
+    def warmup(self, lengths: tuple = (8, 64, 384), batch_sizes: tuple = (1, 3, 16)) -> None:
+        """Run dummy batches of representative lengths so the first request is fast.
+        
+        Batch size 3 mirrors a single thought write (text, title, summary).
+        """
+        for length in lengths:
+            text = " ".join(["thought"] * length)
+            self.embed(text, is_query=True)
+            for batch_size in batch_sizes:
+                self.embed_batch([text] * batch_size)
+    
+    def memory_footprint(self) -> dict:
+        """Model memory usage in MB (empty if the provider cannot tell)."""
+        return {}
 
 
 def get_embedding_provider(
@@ -31,6 +65,10 @@ def get_embedding_provider(
             model_name=model_name or "mixedbread-ai/mxbai-embed-large-v1",
             device=device
         )
+    elif provider_type == "hash":
+        # Deterministic, model-free vectors for tests/benchmarks
+        from libs.manifold_core.embeddings.hashed import HashEmbeddings
+        return HashEmbeddings(dim=int(os.getenv("MANIFOLD_VECTOR_DIM", "1024")))
     else:
         raise ValueError(f"Unknown provider: {provider_type}")
 
@@ -68,6 +68,7 @@ class HealthResponse(BaseModel):
     qdrant_connected: bool
     collection_name: str
     embedding_model: str
+    model_state: Optional[str] = None
 
 
 class ConfigResponse(BaseModel):
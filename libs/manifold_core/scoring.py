@@ -78,15 +78,46 @@ def apply_mmr(
     candidates: list[dict],
     lambda_param: float = 0.5,
     k: int = 10,
+    embeddings: list[list[float]] | np.ndarray | None = None,
 ) -> list[dict]:
     """
     Maximal Marginal Relevance: diversify top-k.
     candidates: list of {id, score, thought}
+    embeddings: one vector per candidate (same order). When given, similarity is
+    cosine in embedding space; otherwise falls back to ticker overlap.
     """
     if not candidates or k <= 0:
         return candidates
+    if embeddings is None:
+        return _pseudo_mmr(candidates, lambda_param, k)
     
-    # Simple greedy MMR: pick highest score, then penalize similar docs
+    # Cosine similarity matrix over the candidate pool (rows L2-normalized)
+    emb = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    emb = emb / np.where(norms == 0, 1.0, norms)
+    sim = emb @ emb.T
+    relevance = np.asarray([c["score"] for c in candidates], dtype=np.float32)
+    
+    n = len(candidates)
+    available = np.ones(n, dtype=bool)
+    first = int(np.argmax(relevance))
+    selected = [first]
+    available[first] = False
+    max_sim = sim[first].copy()  # max similarity of each candidate to the selected set
+    
+    while len(selected) < min(k, n):
+        mmr = lambda_param * relevance - (1 - lambda_param) * max_sim
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_sim, sim[best], out=max_sim)
+    
+    return [candidates[i] for i in selected]
+
+
+def _pseudo_mmr(candidates: list[dict], lambda_param: float, k: int) -> list[dict]:
+    """Greedy MMR with ticker-overlap similarity (used when no vectors are available)."""
     selected = []
     remaining = list(candidates)
     
@@ -118,4 +149,3 @@ def _pseudo_similarity(a: dict, b: dict) -> float:
     if a_tickers & b_tickers:
         return 0.9
     return 0.3
-
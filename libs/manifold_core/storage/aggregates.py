@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Separator for (workspace_id, session_id) scope keys
+_SEP = "\x1f"
+
+
+def point_facts(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """The per-thought values the aggregates are built from."""
+    links = payload.get("links") or {}
+    created_at = payload.get("created_at")
+    return {
+        "session_id": payload.get("session_id") or None,
+        "workspace_id": payload.get("workspace_id") or None,
+        "type": payload.get("type") or "unknown",
+        "status": payload.get("status") or "unknown",
+        "confidence": payload.get("confidence_level") or "unknown",
+        "month": created_at[:7] if isinstance(created_at, str) and created_at else None,  # YYYY-MM
+        "degree": len(links.get("related_thoughts") or []),
+        "has_parent": 1 if payload.get("parent_id") else 0,
+        "title": payload.get("title"),
+    }
+
+
+def _contributions(facts: Dict[str, Any]) -> List[Tuple[str, str, str, str, int]]:
+    """(scope, scope_id, dim, value, delta) rows one thought adds to the counters."""
+    sid, wid = facts["session_id"], facts["workspace_id"]
+    scopes = [("all", "")]
+    if sid:
+        scopes.append(("session", sid))
+    if wid:
+        scopes.append(("workspace", wid))
+    if sid and wid:
+        scopes.append(("ws_session", f"{wid}{_SEP}{sid}"))
+
+    rows = []
+    for scope, scope_id in scopes:
+        rows.append((scope, scope_id, "total", "", 1))
+        rows.append((scope, scope_id, "type", facts["type"], 1))
+        rows.append((scope, scope_id, "status", facts["status"], 1))
+        rows.append((scope, scope_id, "confidence", facts["confidence"], 1))
+        rows.append((scope, scope_id, "degree", str(facts["degree"]), 1))
+        if facts["month"]:
+            rows.append((scope, scope_id, "month", facts["month"], 1))
+        if facts["degree"]:
+            rows.append((scope, scope_id, "relations", "", facts["degree"]))
+            rows.append((scope, scope_id, "with_relations", "", 1))
+        if facts["has_parent"]:
+            rows.append((scope, scope_id, "with_parent", "", 1))
+        if scope == "session" and wid:
+            rows.append((scope, scope_id, "workspace", wid, 1))
+    return rows
+
+
+class AggregateStore:
+    """Materialized thought aggregates in sidecar SQLite.
+
+    `point_facts` keeps a small projection of every thought so an update can
+    subtract its previous contribution; `agg_counts` holds the resulting
+    counters per scope (all / session / workspace / workspace+session). Stats,
+    graph metrics and session/workspace listings read a handful of counter
+    rows instead of scanning the collection. QdrantStore applies every write;
+    rebuild() recounts from a full scroll (first use, or recovery).
+    """
+
+    _FACT_COLUMNS = ("session_id", "workspace_id", "type", "status", "confidence", "month", "degree", "has_parent", "title")
+
+    def __init__(self, db_path: str | Path, collection_name: str):
+        self.db_path = Path(db_path)
+        self.collection_name = collection_name
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def conn(self) -> sqlite3.Connection:
+        """Shared autocommit connection; writes use explicit BEGIN IMMEDIATE under self._lock."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                str(self.db_path), timeout=30.0, check_same_thread=False, isolation_level=None
+            )
+            if str(self.db_path) != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            conn = self.conn()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS point_facts (
+                    collection TEXT NOT NULL,
+                    point_id TEXT NOT NULL,
+                    session_id TEXT,
+                    workspace_id TEXT,
+                    type TEXT,
+                    status TEXT,
+                    confidence TEXT,
+                    month TEXT,
+                    degree INTEGER NOT NULL DEFAULT 0,
+                    has_parent INTEGER NOT NULL DEFAULT 0,
+                    title TEXT,
+                    PRIMARY KEY (collection, point_id)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_facts_degree ON point_facts(collection, degree)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_facts_session_degree ON point_facts(collection, session_id, degree)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS agg_counts (
+                    collection TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    scope_id TEXT NOT NULL,
+                    dim TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (collection, scope, scope_id, dim, value)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_meta (
+                    collection TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    value TEXT,
+                    PRIMARY KEY (collection, name)
+                )
+            """)
+
+    # ---------- maintenance ----------
+
+    def _load_facts(self, conn: sqlite3.Connection, point_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            f"SELECT {', '.join(self._FACT_COLUMNS)} FROM point_facts WHERE collection = ? AND point_id = ?",
+            (self.collection_name, point_id),
+        ).fetchone()
+        return dict(zip(self._FACT_COLUMNS, row)) if row else None
+
+    def _apply(self, conn: sqlite3.Connection, rows: Iterable[Tuple[str, str, str, str, int]], sign: int) -> None:
+        rows = [(self.collection_name, scope, scope_id, dim, value, sign * delta) for scope, scope_id, dim, value, delta in rows]
+        conn.executemany(
+            """
+            INSERT INTO agg_counts VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (collection, scope, scope_id, dim, value) DO UPDATE SET count = count + excluded.count
+            """,
+            rows,
+        )
+        if sign < 0:
+            conn.executemany(
+                """
+                DELETE FROM agg_counts
+                WHERE collection = ? AND scope = ? AND scope_id = ? AND dim = ? AND value = ? AND count <= 0
+                """,
+                [row[:5] for row in rows],
+            )
+
+    def apply_upsert(self, point_id: str, payload: Dict[str, Any]) -> None:
+        self.apply_upserts([(point_id, payload)])
+
+    def apply_upserts(self, items: Iterable[Tuple[Any, Dict[str, Any]]]) -> None:
+        """apply_upsert for several (point_id, payload) pairs in one transaction."""
+        items = [(str(point_id), point_facts(payload)) for point_id, payload in items]
+        with self._lock:
+            conn = self.conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for point_id, facts in items:
+                    old = self._load_facts(conn, point_id)
+                    if old == facts:
+                        continue
+                    if old is not None:
+                        self._apply(conn, _contributions(old), -1)
+                    self._apply(conn, _contributions(facts), +1)
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO point_facts (collection, point_id, {', '.join(self._FACT_COLUMNS)}) "
+                        f"VALUES (?, ?, {', '.join('?' * len(self._FACT_COLUMNS))})",
+                        (self.collection_name, point_id, *[facts[c] for c in self._FACT_COLUMNS]),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def apply_delete(self, point_id: str) -> None:
+        point_id = str(point_id)
+        with self._lock:
+            conn = self.conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = self._load_facts(conn, point_id)
+                if old is not None:
+                    self._apply(conn, _contributions(old), -1)
+                    conn.execute(
+                        "DELETE FROM point_facts WHERE collection = ? AND point_id = ?",
+                        (self.collection_name, point_id),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def is_built(self) -> bool:
+        with self._lock:
+            row = self.conn().execute(
+                "SELECT value FROM index_meta WHERE collection = ? AND name = 'aggregates_built'",
+                (self.collection_name,),
+            ).fetchone()
+        return bool(row)
+
+    def rebuild(self, points: Iterable[Tuple[Any, Dict[str, Any]]]) -> int:
+        """Recount everything from (point_id, payload) pairs covering the whole collection."""
+        fact_rows = []
+        totals: Counter = Counter()
+        for point_id, payload in points:
+            facts = point_facts(payload or {})
+            fact_rows.append((self.collection_name, str(point_id), *[facts[c] for c in self._FACT_COLUMNS]))
+            for scope, scope_id, dim, value, delta in _contributions(facts):
+                totals[(scope, scope_id, dim, value)] += delta
+        with self._lock:
+            conn = self.conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM point_facts WHERE collection = ?", (self.collection_name,))
+                conn.execute("DELETE FROM agg_counts WHERE collection = ?", (self.collection_name,))
+                conn.executemany(
+                    f"INSERT INTO point_facts (collection, point_id, {', '.join(self._FACT_COLUMNS)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(self._FACT_COLUMNS))})",
+                    fact_rows,
+                )
+                conn.executemany(
+                    "INSERT INTO agg_counts VALUES (?, ?, ?, ?, ?, ?)",
+                    [(self.collection_name, *key, count) for key, count in totals.items()],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO index_meta VALUES (?, 'aggregates_built', datetime('now'))",
+                    (self.collection_name,),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(fact_rows)
+
+    # ---------- reads ----------
+
+    def _counts(self, scope: str, scope_id: str) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self.conn().execute(
+                "SELECT dim, value, count FROM agg_counts WHERE collection = ? AND scope = ? AND scope_id = ?",
+                (self.collection_name, scope, scope_id),
+            ).fetchall()
+        dims: Dict[str, Dict[str, int]] = {}
+        for dim, value, count in rows:
+            dims.setdefault(dim, {})[value] = count
+        return dims
+
+    def statistics(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        dims = self._counts("session", session_id) if session_id else self._counts("all", "")
+        total = dims.get("total", {}).get("", 0)
+        relations = dims.get("relations", {}).get("", 0)
+        with_parent = dims.get("with_parent", {}).get("", 0)
+        return {
+            "total_thoughts": total,
+            "distributions": {
+                "by_type": dims.get("type", {}),
+                "by_status": dims.get("status", {}),
+                "by_confidence": dims.get("confidence", {}),
+                "by_month": dict(sorted(dims.get("month", {}).items())),
+            },
+            "relations": {
+                "thoughts_with_relations": dims.get("with_relations", {}).get("", 0),
+                "total_relations": relations,
+                "avg_relations_per_thought": round(relations / total, 2) if total else 0,
+            },
+            "hierarchy": {
+                "thoughts_with_parent": with_parent,
+                "orphan_thoughts": total - with_parent,
+            },
+        }
+
+    def degree_summary(self, session_id: Optional[str] = None, top: int = 10) -> Dict[str, Any]:
+        """Node/edge totals, degree histogram stats and the `top` highest-degree thoughts."""
+        dims = self._counts("session", session_id) if session_id else self._counts("all", "")
+        histogram = sorted((int(d), c) for d, c in dims.get("degree", {}).items())
+        nodes = sum(c for _, c in histogram)
+        median = 0
+        seen = 0
+        for degree, count in histogram:
+            seen += count
+            if seen > nodes // 2:
+                median = degree
+                break
+
+        sql = "SELECT point_id, title, type, degree FROM point_facts WHERE collection = ?"
+        params: List[Any] = [self.collection_name]
+        if session_id:
+            sql += " AND session_id = ?"
+            params.append(session_id)
+        sql += " ORDER BY degree DESC, point_id LIMIT ?"
+        params.append(top)
+        with self._lock:
+            rows = self.conn().execute(sql, params).fetchall()
+
+        return {
+            "total_nodes": nodes,
+            "total_edges": dims.get("relations", {}).get("", 0),
+            "top_by_degree": [
+                {"id": pid, "title": title, "degree": degree, "type": ttype}
+                for pid, title, ttype, degree in rows
+            ],
+            "min": histogram[0][0] if histogram else 0,
+            "max": histogram[-1][0] if histogram else 0,
+            "median": median,
+            "isolated_nodes": dict(histogram).get(0, 0),
+        }
+
+    def _grouped(self, scope: str, lo: str = "", hi: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """{scope_id: {dim: {value: count}}} for total/type/workspace counters of a scope."""
+        sql = (
+            "SELECT scope_id, dim, value, count FROM agg_counts "
+            "WHERE collection = ? AND scope = ? AND dim IN ('total', 'type', 'workspace') AND scope_id >= ?"
+        )
+        params: List[Any] = [self.collection_name, scope, lo]
+        if hi is not None:
+            sql += " AND scope_id < ?"
+            params.append(hi)
+        with self._lock:
+            rows = self.conn().execute(sql, params).fetchall()
+        grouped: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for scope_id, dim, value, count in rows:
+            grouped.setdefault(scope_id, {}).setdefault(dim, {})[value] = count
+        return grouped
+
+    def sessions(self, workspace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Sessions with thought counts, types and owning workspace (sorted by session_id)."""
+        if workspace_id:
+            prefix = f"{workspace_id}{_SEP}"
+            grouped = {
+                scope_id[len(prefix):]: {**dims, "workspace": {workspace_id: 1}}
+                for scope_id, dims in self._grouped("ws_session", prefix, f"{workspace_id}\x20").items()
+            }
+        else:
+            grouped = self._grouped("session")
+        sessions = []
+        for sid, dims in sorted(grouped.items()):
+            workspaces = dims.get("workspace", {})
+            sessions.append({
+                "session_id": sid,
+                "workspace_id": max(workspaces, key=workspaces.get) if workspaces else None,
+                "count": dims.get("total", {}).get("", 0),
+                "types": dims.get("type", {}),
+            })
+        return sessions
+
+    def workspaces(self) -> List[Dict[str, Any]]:
+        """Workspaces with thought counts and types (sorted by workspace_id)."""
+        return [
+            {
+                "workspace_id": wid,
+                "count": dims.get("total", {}).get("", 0),
+                "types": dims.get("type", {}),
+            }
+            for wid, dims in sorted(self._grouped("workspace").items())
+        ]
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import namedtuple
+from typing import Any, Dict, List, Optional
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models as qm
+
+from libs.manifold_core.storage.qdrant_store import QdrantStore
+
+logger = logging.getLogger(__name__)
+
+# Filter-only query results mimic ScoredPoint (same shape as QdrantStore.query)
+ScoredPoint = namedtuple("ScoredPoint", ["id", "score", "payload", "vector"])
+
+
+class _ThreadedClient:
+    """Async facade that runs a sync client's calls in worker threads.
+
+    Used in local mode, where a second (async) client cannot open the same
+    embedded storage.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return call
+
+    async def close(self) -> None:
+        # The sync store owns the client
+        pass
+
+
+class AsyncQdrantStore:
+    """Read-side twin of QdrantStore on AsyncQdrantClient, for async routes.
+
+    Writes stay on the sync QdrantStore (it keeps the facet counters, link
+    index and aggregates in step); this class reuses its filter builder and
+    facet counters so both sides answer identically.
+    """
+
+    def __init__(self, store: QdrantStore, qdrant_url: str, client: Optional[AsyncQdrantClient] = None):
+        self.store = store
+        self.collection_name = store.collection_name
+        self.vector_dim = store.vector_dim
+        if client is None:
+            client = _ThreadedClient(store.client) if store.local_mode else AsyncQdrantClient(url=qdrant_url)
+        self.client = client
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def get_by_id(self, point_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve payload by ID."""
+        try:
+            res = await self.client.retrieve(self.collection_name, ids=[point_id])
+            return res[0].payload if res else None
+        except Exception:
+            return None
+
+    async def get_many(self, point_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Retrieve payloads for many IDs in one round trip ({id: payload}, missing IDs omitted)."""
+        ids = list(dict.fromkeys(str(pid) for pid in point_ids if pid))
+        if not ids:
+            return {}
+        try:
+            res = await self.client.retrieve(self.collection_name, ids=ids, with_payload=True, with_vectors=False)
+        except Exception:
+            return {}
+        return {str(p.id): p.payload for p in res}
+
+    async def count(self, payload_filter: Optional[Dict] = None) -> int:
+        """Exact number of points matching the filter (server-side, no payloads fetched)."""
+        res = await self.client.count(
+            self.collection_name,
+            count_filter=self.store._build_filter(payload_filter) if payload_filter else None,
+            exact=True,
+        )
+        return res.count
+
+    async def query(
+        self,
+        vector_name: str,
+        query_vector: Optional[List[float]] = None,
+        payload_filter: Optional[Dict] = None,
+        limit: int = 50,
+        offset: int = 0,
+        with_vectors: bool | List[str] = False,
+    ):
+        """Vector search or filter-only scroll; see QdrantStore.query."""
+        query_filter = self.store._build_filter(payload_filter) if payload_filter else None
+        if query_vector:
+            return await self.client.search(
+                collection_name=self.collection_name,
+                query_vector=qm.NamedVector(name=vector_name, vector=query_vector),
+                limit=limit,
+                offset=offset,
+                query_filter=query_filter,
+                with_payload=True,
+                with_vectors=with_vectors,
+            )
+        points, _ = await self.client.scroll(
+            self.collection_name,
+            scroll_filter=query_filter,
+            limit=limit,
+            with_payload=True,
+            with_vectors=with_vectors,
+        )
+        return [ScoredPoint(p.id, 1.0, p.payload, p.vector) for p in (points or [])]
+
+    async def scroll(
+        self,
+        payload_filter: Optional[Dict] = None,
+        limit: int = 1000,
+        order_by: Optional[str] = None,
+        descending: bool = True,
+    ):
+        """One page of points matching filter; see QdrantStore.scroll."""
+        try:
+            points, _ = await self.client.scroll(
+                self.collection_name,
+                scroll_filter=self.store._build_filter(payload_filter) if payload_filter else None,
+                limit=limit,
+                with_payload=True,
+                order_by=qm.OrderBy(
+                    key=order_by,
+                    direction=qm.Direction.DESC if descending else qm.Direction.ASC,
+                ) if order_by else None,
+            )
+            return points or []
+        except Exception as e:
+            if not order_by:
+                logger.error(f"Scroll on {self.collection_name} failed: {e}")
+                raise
+            logger.warning(f"Ordered scroll by {order_by} failed ({e}); sorting matching points in Python")
+            return await asyncio.to_thread(self.store._sorted_scan, payload_filter, limit, order_by, descending)
+
+    async def get_facets(self, facet_keys: List[str], payload_filter: Optional[Dict] = None, limit: int = 100) -> Dict[str, Any]:
+        """Facet counts; same order of preference as QdrantStore.get_facets, native calls run concurrently."""
+        if not facet_keys:
+            return {}
+        facets = self.store.counter_facets(facet_keys, payload_filter, limit)
+        if facets is not None:
+            return facets
+
+        if self.store._native_facets:
+            try:
+                return await self._native_facet_counts(facet_keys, payload_filter, limit)
+            except AttributeError:
+                # qdrant-client < 1.12 has no facet(); don't retry every request
+                self.store._native_facets = False
+            except Exception:
+                pass
+
+        return await asyncio.to_thread(self.store._scan_facets, facet_keys, payload_filter)
+
+    async def _native_facet_counts(self, facet_keys: List[str], payload_filter: Optional[Dict], limit: int) -> Dict[str, Any]:
+        facet_filter = self.store._build_filter(payload_filter) if payload_filter else None
+        responses = await asyncio.gather(*[
+            self.client.facet(
+                self.collection_name,
+                key=key,
+                facet_filter=facet_filter,
+                limit=limit,
+                exact=True,
+            )
+            for key in facet_keys
+        ])
+        return {
+            key: [{"value": hit.value, "count": hit.count} for hit in res.hits]
+            for key, res in zip(facet_keys, responses)
+        }
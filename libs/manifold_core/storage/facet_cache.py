@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Payload keys we keep counters for (keyword fields shown in search facets)
+FACET_KEYS = ("type", "status", "tickers", "sectors", "tags")
+
+
+def _facet_values(payload: Dict[str, Any], key: str) -> List[Any]:
+    value = payload.get(key)
+    if isinstance(value, list):
+        return [v for v in value if v is not None and not isinstance(v, (dict, list))]
+    if value and not isinstance(value, dict):
+        return [value]
+    return []
+
+
+class FacetCounters:
+    """Incrementally maintained facet counts per (status, workspace_id) scope.
+
+    QdrantStore applies every upsert/delete here, so counts stay current
+    without scanning the collection. A per-point projection of the facet
+    fields lets an upsert subtract the previous contribution. Counts are
+    rebuilt from a full scan after `reconcile_interval` seconds to correct
+    drift (e.g. writes made by another worker process). Writes that land
+    while a rebuild scans are logged and replayed onto the recount before
+    it replaces the live counters.
+    """
+
+    def __init__(self, reconcile_interval: float = 300.0):
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.RLock()
+        # point_id -> (status, workspace_id, {key: [values]})
+        self._points: Dict[str, Tuple[Any, Any, Dict[str, List[Any]]]] = {}
+        # (status, workspace_id) -> {key: Counter}
+        self._counts: Dict[Tuple[Any, Any], Dict[str, Counter]] = {}
+        self.built_at: Optional[float] = None
+        self._rebuilding = False
+        # point_id -> entry (None for a delete) written while a rebuild scans
+        self._write_log: Optional[Dict[str, Optional[Tuple[Any, Any, Dict[str, List[Any]]]]]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    @property
+    def stale(self) -> bool:
+        return self.built_at is None or (time.time() - self.built_at) > self.reconcile_interval
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._points = {}
+            self._counts = {}
+            self.built_at = None
+
+    # ---------- incremental maintenance ----------
+
+    def _apply(self, entry: Tuple[Any, Any, Dict[str, List[Any]]], sign: int) -> None:
+        status, workspace_id, values = entry
+        scope = self._counts.setdefault((status, workspace_id), {k: Counter() for k in FACET_KEYS})
+        for key, vals in values.items():
+            counter = scope[key]
+            for v in vals:
+                counter[v] += sign
+                if counter[v] <= 0:
+                    del counter[v]
+
+    def _replace(self, point_id: str, entry: Optional[Tuple[Any, Any, Dict[str, List[Any]]]]) -> None:
+        old = self._points.pop(point_id, None)
+        if old is not None:
+            self._apply(old, -1)
+        if entry is not None:
+            self._points[point_id] = entry
+            self._apply(entry, +1)
+
+    def apply_upsert(self, point_id: str, payload: Dict[str, Any]) -> None:
+        if not self.ready and self._write_log is None:
+            return
+        entry = (
+            payload.get("status"),
+            payload.get("workspace_id"),
+            {k: _facet_values(payload, k) for k in FACET_KEYS},
+        )
+        point_id = str(point_id)
+        with self._lock:
+            if self._write_log is not None:
+                self._write_log[point_id] = entry
+            if self.ready:
+                self._replace(point_id, entry)
+
+    def apply_delete(self, point_id: str) -> None:
+        if not self.ready and self._write_log is None:
+            return
+        point_id = str(point_id)
+        with self._lock:
+            if self._write_log is not None:
+                self._write_log[point_id] = None
+            if self.ready:
+                self._replace(point_id, None)
+
+    # ---------- reconciliation ----------
+
+    def rebuild(self, points: Iterable[Tuple[Any, Dict[str, Any]]]) -> None:
+        """Recount from (point_id, payload) pairs covering the whole collection.
+
+        Points written during the scan may have been read before or after the
+        write, so their logged entries are replayed onto the recount.
+        """
+        with self._lock:
+            self._write_log = {}
+        try:
+            fresh = FacetCounters(self.reconcile_interval)
+            fresh.built_at = time.time()
+            for point_id, payload in points:
+                fresh.apply_upsert(point_id, payload or {})
+            with self._lock:
+                for point_id, entry in self._write_log.items():
+                    fresh._replace(point_id, entry)
+                self._points = fresh._points
+                self._counts = fresh._counts
+                self.built_at = fresh.built_at
+        finally:
+            with self._lock:
+                self._write_log = None
+
+    def rebuild_async(self, load_points) -> None:
+        """Run rebuild(load_points()) in a daemon thread (at most one at a time)."""
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+
+        def _run():
+            try:
+                self.rebuild(load_points())
+            except Exception:
+                pass
+            finally:
+                self._rebuilding = False
+
+        threading.Thread(target=_run, name="facet-reconcile", daemon=True).start()
+
+    # ---------- reads ----------
+
+    @staticmethod
+    def scope_of(payload_filter: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """Return {"status"?, "workspace_id"?} if the filter only uses those exact
+        matches (the scopes counters can answer), else None."""
+        scope: Dict[str, Any] = {}
+        if not payload_filter:
+            return scope
+        if payload_filter.get("must_not") or payload_filter.get("should"):
+            return None
+        for clause in payload_filter.get("must", []):
+            key = clause.get("key")
+            value = (clause.get("match") or {}).get("value")
+            if key not in ("status", "workspace_id") or value is None or key in scope:
+                return None
+            scope[key] = value
+        return scope
+
+    def counts(self, facet_keys: List[str], scope: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        totals = {key: Counter() for key in facet_keys}
+        with self._lock:
+            for (status, workspace_id), per_key in self._counts.items():
+                if "status" in scope and status != scope["status"]:
+                    continue
+                if "workspace_id" in scope and workspace_id != scope["workspace_id"]:
+                    continue
+                for key in facet_keys:
+                    if key in per_key:
+                        totals[key].update(per_key[key])
+        return {
+            key: [{"value": v, "count": c} for v, c in totals[key].most_common()]
+            for key in facet_keys
+        }
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Meta flag marking a complete index; bumped when the row set changes (v2 added parent rows)
+_BUILT_KEY = "links_built_v2"
+
+
+def outgoing_links(point_id: str, payload: Dict[str, Any]) -> List[Tuple]:
+    """Edge rows for a thought's links: (from_id, to_id, kind, relation_type, weight, description, created_at).
+
+    kind is "related" for links.related_thoughts, "typed" for links.relations and
+    "parent" for parent_id (stored on the child, like the payload field).
+    """
+    links = payload.get("links") or {}
+    rows = []
+    for rid in links.get("related_thoughts", []) or []:
+        if rid:
+            rows.append((point_id, str(rid), "related", "related", 1.0, None, None))
+    for r in links.get("relations", []) or []:
+        rid = r.get("related_id")
+        if rid:
+            rows.append((
+                point_id,
+                str(rid),
+                "typed",
+                r.get("type", "related"),
+                float(r["weight"]) if r.get("weight") is not None else 1.0,
+                r.get("description"),
+                r.get("created_at"),
+            ))
+    parent_id = payload.get("parent_id")
+    if parent_id:
+        rows.append((point_id, str(parent_id), "parent", "section-of", 1.0, None, None))
+    return rows
+
+
+class LinkIndex:
+    """Sidecar SQLite reverse-adjacency index for thought links.
+
+    Qdrant stores links only on the source thought, so "who links to X"
+    needs a full scan. This table mirrors every (from, to) edge and is kept
+    in sync by QdrantStore on each upsert/delete; incoming(X) is then an
+    indexed lookup. The index is rebuilt from a full scroll the first time a
+    collection is seen (or via rebuild()).
+    """
+
+    def __init__(self, db_path: str | Path, collection_name: str):
+        self.db_path = Path(db_path)
+        self.collection_name = collection_name
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def conn(self) -> sqlite3.Connection:
+        """Shared connection; callers serialize access via self._lock."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+            if str(self.db_path) != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            conn = self.conn()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS links (
+                    collection TEXT NOT NULL,
+                    from_id TEXT NOT NULL,
+                    to_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    relation_type TEXT,
+                    weight REAL,
+                    description TEXT,
+                    created_at TEXT,
+                    PRIMARY KEY (collection, from_id, to_id, kind)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_links_to ON links(collection, to_id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_meta (
+                    collection TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    value TEXT,
+                    PRIMARY KEY (collection, name)
+                )
+            """)
+            conn.commit()
+
+    # ---------- maintenance ----------
+
+    def set_outgoing(self, point_id: str, payload: Dict[str, Any]) -> None:
+        """Replace all edges originating at point_id with those in its payload."""
+        self.set_outgoing_many([(point_id, payload)])
+
+    def set_outgoing_many(self, items: Iterable[Tuple[Any, Dict[str, Any]]]) -> None:
+        """set_outgoing for several (point_id, payload) pairs in one transaction."""
+        ids, rows = [], []
+        for point_id, payload in items:
+            ids.append((self.collection_name, str(point_id)))
+            rows.extend((self.collection_name, *row) for row in outgoing_links(str(point_id), payload))
+        with self._lock:
+            conn = self.conn()
+            conn.executemany("DELETE FROM links WHERE collection = ? AND from_id = ?", ids)
+            if rows:
+                conn.executemany("INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+
+    def remove(self, point_id: str) -> None:
+        """Drop edges originating at point_id (hard delete)."""
+        with self._lock:
+            conn = self.conn()
+            conn.execute(
+                "DELETE FROM links WHERE collection = ? AND from_id = ?",
+                (self.collection_name, str(point_id)),
+            )
+            conn.commit()
+
+    def is_built(self) -> bool:
+        with self._lock:
+            row = self.conn().execute(
+                "SELECT value FROM index_meta WHERE collection = ? AND name = ?",
+                (self.collection_name, _BUILT_KEY),
+            ).fetchone()
+        return bool(row)
+
+    def rebuild(self, points: Iterable[Tuple[Any, Dict[str, Any]]]) -> int:
+        """Recreate the index from (point_id, payload) pairs for the whole collection."""
+        rows = []
+        for point_id, payload in points:
+            rows.extend(outgoing_links(str(point_id), payload or {}))
+        with self._lock:
+            conn = self.conn()
+            conn.execute("DELETE FROM links WHERE collection = ?", (self.collection_name,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(self.collection_name, *row) for row in rows],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO index_meta VALUES (?, ?, datetime('now'))",
+                (self.collection_name, _BUILT_KEY),
+            )
+            conn.commit()
+        return len(rows)
+
+    # ---------- reads ----------
+
+    def incoming(self, to_id: str) -> List[Dict[str, Any]]:
+        """All link edges pointing at to_id (from any thought, regardless of status; parent rows excluded)."""
+        with self._lock:
+            rows = self.conn().execute(
+                """
+                SELECT from_id, to_id, kind, relation_type, weight, description, created_at
+                FROM links WHERE collection = ? AND to_id = ? AND kind != 'parent'
+                """,
+                (self.collection_name, str(to_id)),
+            ).fetchall()
+        return [
+            {
+                "from_id": r[0],
+                "to_id": r[1],
+                "kind": r[2],
+                "relation_type": r[3],
+                "weight": r[4],
+                "description": r[5],
+                "created_at": r[6],
+            }
+            for r in rows
+        ]
+
+    def outgoing_many(self, from_ids: Iterable[str]) -> List[Tuple[str, str, str, str, float]]:
+        """Edges owned by the given thoughts as (from_id, to_id, kind, relation_type, weight)."""
+        ids = list(dict.fromkeys(str(i) for i in from_ids))
+        rows: List[Tuple[str, str, str, str, float]] = []
+        with self._lock:
+            conn = self.conn()
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows.extend(conn.execute(
+                    f"""
+                    SELECT from_id, to_id, kind, relation_type, weight
+                    FROM links WHERE collection = ? AND from_id IN ({",".join("?" * len(chunk))})
+                    """,
+                    (self.collection_name, *chunk),
+                ).fetchall())
+        return rows
+
+    def count(self) -> int:
+        with self._lock:
+            row = self.conn().execute(
+                "SELECT COUNT(*) FROM links WHERE collection = ?", (self.collection_name,)
+            ).fetchone()
+        return row[0] if row else 0
@@ -4,7 +4,45 @@ from typing import Any, Dict, List, Optional
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qm
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timezone
+import logging
+import os
+from libs.manifold_core.storage.facet_cache import FacetCounters, FACET_KEYS
+from libs.manifold_core.storage.link_index import LinkIndex
+from libs.manifold_core.storage.aggregates import AggregateStore
+
+logger = logging.getLogger(__name__)
+
+# Named vectors stored per thought
+VECTOR_NAMES = ("text", "title", "summary")
+
+# Integer epoch seconds mirrored from created_at (range filters + ordered scroll)
+CREATED_TS_FIELD = "created_ts"
+
+
+def epoch_seconds(value: Optional[str]) -> Optional[int]:
+    """Epoch seconds for an ISO timestamp (naive = UTC); None if missing or unparseable."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def created_range(from_iso: Optional[str] = None, to_iso: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Filter clauses restricting created_at to [from_iso, to_iso] via the numeric created_ts index."""
+    bounds = {}
+    for op, value in (("gte", from_iso), ("lte", to_iso)):
+        if value:
+            ts = epoch_seconds(value)
+            if ts is None:
+                raise ValueError(f"Invalid ISO datetime: {value}")
+            bounds[op] = ts
+    return [{"key": CREATED_TS_FIELD, "range": bounds}] if bounds else []
 
 
 class QdrantConfig(BaseModel):
@@ -16,17 +54,39 @@ class QdrantConfig(BaseModel):
 
 
 class QdrantStore:
-    def __init__(self, qdrant_url: str, collection_name: str, vector_dim: int = 1024):
+    def __init__(
+        self,
+        qdrant_url: str,
+        collection_name: str,
+        vector_dim: int = 1024,
+        index_path: Optional[str] = None,
+        qdrant_path: Optional[str] = None,
+    ):
         self.collection_name = collection_name
         self.vector_dim = vector_dim
-        self.client = QdrantClient(url=qdrant_url)
+        # qdrant_path selects Qdrant's embedded local mode (":memory:" or a directory): no server
+        self.local_mode = bool(qdrant_path)
+        if not self.local_mode:
+            self.client = QdrantClient(url=qdrant_url)
+        elif qdrant_path == ":memory:":
+            self.client = QdrantClient(location=":memory:")
+        else:
+            self.client = QdrantClient(path=qdrant_path)
+        self.facet_counters = FacetCounters(
+            reconcile_interval=float(os.getenv("MANIFOLD_FACET_RECONCILE_SECONDS", "300"))
+        )
+        self._native_facets = True  # flipped off if the server lacks the facet API
+        # Sidecar SQLite reverse-link index (incoming relations without full scans)
+        sqlite_path = index_path or os.getenv("MANIFOLD_SQLITE_PATH", "data/manifold.db")
+        self.link_index = LinkIndex(sqlite_path, collection_name)
+        # Materialized counters behind stats / graph metrics / session & workspace lists
+        self.aggregates = AggregateStore(sqlite_path, collection_name)
 
     def initialize_collection(self) -> None:
         """Initialize collection with named vectors (text, title, summary)."""
         vectors_config = {
-            "text": qm.VectorParams(size=self.vector_dim, distance=qm.Distance.COSINE),
-            "title": qm.VectorParams(size=self.vector_dim, distance=qm.Distance.COSINE),
-            "summary": qm.VectorParams(size=self.vector_dim, distance=qm.Distance.COSINE),
+            name: qm.VectorParams(size=self.vector_dim, distance=qm.Distance.COSINE)
+            for name in VECTOR_NAMES
         }
         collection_exists = False
         try:
@@ -37,6 +97,9 @@ class QdrantStore:
                 collection_name=self.collection_name,
                 vectors_config=vectors_config,
             )
+            # Fresh collection: the link index is trivially complete (and empty)
+            self.link_index.rebuild([])
+            self.aggregates.rebuild([])
         
         # Create/ensure payload indexes exist (even if collection already existed)
         indexes_to_create = [
@@ -44,11 +107,14 @@ class QdrantStore:
             ("status", qm.PayloadSchemaType.KEYWORD),
             ("tickers", qm.PayloadSchemaType.KEYWORD),
             ("created_at", qm.PayloadSchemaType.DATETIME),
+            (CREATED_TS_FIELD, qm.PayloadSchemaType.INTEGER),
             ("session_id", qm.PayloadSchemaType.KEYWORD),
             ("workspace_id", qm.PayloadSchemaType.KEYWORD),
             ("parent_id", qm.PayloadSchemaType.KEYWORD),
             ("ordinal", qm.PayloadSchemaType.INTEGER),
             ("section", qm.PayloadSchemaType.KEYWORD),
+            ("sectors", qm.PayloadSchemaType.KEYWORD),
+            ("tags", qm.PayloadSchemaType.KEYWORD),
         ]
         
         # Get existing indexes to avoid duplicate creation errors
@@ -73,13 +139,63 @@ class QdrantStore:
             except Exception:
                 # Index likely already exists, continue
                 pass
+        
+        if collection_exists:
+            # Points written before created_ts existed
+            self.backfill_created_ts()
+        
+        # (Re)created collection: counters are rebuilt lazily on next facet read
+        self.facet_counters.invalidate()
 
     def upsert_point(self, point_id: str, payload: Dict[str, Any], vectors: Dict[str, List[float]]):
-        """Upsert single point with named vectors (text, title, summary)."""
+        """Upsert single point with named vectors (text, title, summary).
+        
+        A Qdrant upsert replaces the whole point, so when only some vectors are
+        given (e.g. a patch that changed the title, or {} for link updates) an
+        existing point gets its payload overwritten and just those vectors updated.
+        """
+        payload = self._with_created_ts(payload)
+        partial = not set(VECTOR_NAMES).issubset(vectors or {})
+        if partial and self.client.retrieve(self.collection_name, ids=[point_id], with_payload=False):
+            self.client.overwrite_payload(self.collection_name, payload=payload, points=[point_id])
+            if vectors:
+                self.client.update_vectors(
+                    self.collection_name,
+                    points=[qm.PointVectors(id=point_id, vector=vectors)],
+                )
+        else:
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=[qm.PointStruct(id=point_id, payload=payload, vector=vectors)],
+            )
+        self.facet_counters.apply_upsert(point_id, payload)
+        self.link_index.set_outgoing(point_id, payload)
+        self.aggregates.apply_upsert(point_id, payload)
+
+    def upsert_points(self, items: List[tuple]) -> None:
+        """Upsert many complete points, (point_id, payload, vectors) each, in one request.
+        
+        Every item must carry all named vectors (new thoughts); the sidecar
+        indexes are updated in one transaction each afterwards.
+        """
+        if not items:
+            return
+        items = [(str(pid), self._with_created_ts(payload), vectors) for pid, payload, vectors in items]
         self.client.upsert(
             collection_name=self.collection_name,
-            points=[qm.PointStruct(id=point_id, payload=payload, vector=vectors)],
+            points=[qm.PointStruct(id=pid, payload=payload, vector=vectors) for pid, payload, vectors in items],
         )
+        for pid, payload, _ in items:
+            self.facet_counters.apply_upsert(pid, payload)
+        self.link_index.set_outgoing_many((pid, payload) for pid, payload, _ in items)
+        self.aggregates.apply_upserts((pid, payload) for pid, payload, _ in items)
+
+    @staticmethod
+    def _with_created_ts(payload: Dict[str, Any]) -> Dict[str, Any]:
+        ts = epoch_seconds(payload.get("created_at"))
+        if ts is not None and payload.get(CREATED_TS_FIELD) != ts:
+            payload = {**payload, CREATED_TS_FIELD: ts}
+        return payload
 
     def get_by_id(self, point_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve payload by ID."""
@@ -89,12 +205,130 @@ class QdrantStore:
         except:
             return None
 
+    def get_many(self, point_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Retrieve payloads for many IDs in one round trip ({id: payload}, missing IDs omitted)."""
+        ids = list(dict.fromkeys(str(pid) for pid in point_ids if pid))
+        if not ids:
+            return {}
+        try:
+            res = self.client.retrieve(self.collection_name, ids=ids, with_payload=True, with_vectors=False)
+        except Exception:
+            return {}
+        return {str(p.id): p.payload for p in res}
+
+    def get_incoming_links(self, point_id: str) -> List[Dict[str, Any]]:
+        """Edges pointing at point_id from the reverse-link index (built on first use)."""
+        if not self.link_index.is_built():
+            self.rebuild_link_index()
+        return self.link_index.incoming(point_id)
+
+    def get_outgoing_links(self, point_ids: List[str]) -> List[tuple]:
+        """Edges owned by point_ids (links + parent rows) from the link index (built on first use)."""
+        if not self.link_index.is_built():
+            self.rebuild_link_index()
+        return self.link_index.outgoing_many(point_ids)
+
+    def rebuild_link_index(self) -> int:
+        """Recreate the reverse-link index from a full scroll. Returns edge count."""
+        return self.link_index.rebuild(self._scroll_payloads(["links", "parent_id"]))
+
+    def backfill_created_ts(self, batch_size: int = 256) -> int:
+        """Set created_ts on points that lack it (derived from created_at). Returns points updated."""
+        missing = {"must": [{"key": CREATED_TS_FIELD, "is_empty": True}]}
+        updated = 0
+        batch: List[qm.SetPayloadOperation] = []
+        for point in self.iter_points(missing, fields=["created_at"], page_size=batch_size):
+            ts = epoch_seconds(point.payload.get("created_at"))
+            if ts is None:
+                continue
+            batch.append(qm.SetPayloadOperation(
+                set_payload=qm.SetPayload(payload={CREATED_TS_FIELD: ts}, points=[point.id])
+            ))
+            if len(batch) >= batch_size:
+                self.client.batch_update_points(self.collection_name, update_operations=batch)
+                updated += len(batch)
+                batch = []
+        if batch:
+            self.client.batch_update_points(self.collection_name, update_operations=batch)
+            updated += len(batch)
+        return updated
+
+    def get_aggregates(self) -> AggregateStore:
+        """The aggregate store, recounted from a full scroll on first use."""
+        if not self.aggregates.is_built():
+            self.rebuild_aggregates()
+        return self.aggregates
+
+    def rebuild_aggregates(self) -> int:
+        """Recount all materialized aggregates from the collection. Returns thought count."""
+        fields = ["session_id", "workspace_id", "type", "status", "confidence_level", "created_at", "links", "parent_id", "title"]
+        return self.aggregates.rebuild(self._scroll_payloads(fields))
+
+    def iter_points(
+        self,
+        payload_filter: Optional[Dict] = None,
+        fields: Optional[List[str]] = None,
+        page_size: int = 1000,
+        vectors: Optional[List[str]] = None,
+    ):
+        """Stream every point matching the filter, page by page, following scroll offsets.
+
+        `fields` restricts the returned payload to those keys (None = full payload).
+        Vectors are skipped unless named in `vectors`. Memory stays at one page
+        regardless of collection size.
+        """
+        offset = None
+        while True:
+            points, offset = self.scroll_page(payload_filter, page_size, offset, fields, vectors)
+            yield from points
+            if offset is None:
+                break
+
+    def scroll_page(
+        self,
+        payload_filter: Optional[Dict] = None,
+        limit: int = 1000,
+        offset: Any = None,
+        fields: Optional[List[str]] = None,
+        vectors: Optional[List[str]] = None,
+    ):
+        """One page starting at `offset` (a point ID cursor): (points, next_offset or None)."""
+        points, next_offset = self.client.scroll(
+            self.collection_name,
+            scroll_filter=self._build_filter(payload_filter) if payload_filter else None,
+            limit=limit,
+            offset=offset,
+            with_payload=qm.PayloadSelectorInclude(include=fields) if fields is not None else True,
+            with_vectors=vectors or False,
+        )
+        for p in points:
+            if p.payload is None:
+                p.payload = {}
+        return points, next_offset
+
+    def count(self, payload_filter: Optional[Dict] = None) -> int:
+        """Exact number of points matching the filter (server-side, no payload transfer)."""
+        res = self.client.count(
+            self.collection_name,
+            count_filter=self._build_filter(payload_filter) if payload_filter else None,
+            exact=True,
+        )
+        return res.count
+
+    def _scroll_payloads(self, fields: List[str], page_size: int = 1000):
+        """Yield (id, payload) for every point, restricted to `fields`."""
+        for p in self.iter_points(fields=fields, page_size=page_size):
+            yield p.id, p.payload
+
     def delete_point(self, point_id: str):
         """Delete point by ID."""
         self.client.delete(
             self.collection_name,
             points_selector=qm.PointIdsList(points=[point_id]),
         )
+        self.facet_counters.apply_delete(point_id)
+        self.link_index.remove(point_id)
+        self.aggregates.apply_delete(point_id)
 
     def query(
         self,
@@ -103,8 +337,12 @@ class QdrantStore:
         payload_filter: Optional[Dict] = None,
         limit: int = 50,
         offset: int = 0,
+        with_vectors: bool | List[str] = False,
     ):
-        """Query with optional vector search and filters."""
+        """Query with optional vector search and filters.
+        
+        with_vectors (e.g. [vector_name]) returns the stored vectors with each hit.
+        """
         if query_vector:
             return self.client.search(
                 collection_name=self.collection_name,
@@ -113,6 +351,7 @@ class QdrantStore:
                 offset=offset,
                 query_filter=self._build_filter(payload_filter) if payload_filter else None,
                 with_payload=True,
+                with_vectors=with_vectors,
             )
         else:
             # Scroll without vector (filter-only)
@@ -121,6 +360,7 @@ class QdrantStore:
                 scroll_filter=self._build_filter(payload_filter) if payload_filter else None,
                 limit=limit,
                 with_payload=True,
+                with_vectors=with_vectors,
             )
             # Handle tuple return (points, next_page_offset)
             if isinstance(result, tuple):
@@ -129,17 +369,56 @@ class QdrantStore:
                 points = result
             # Fake ScoredPoint structure
             from collections import namedtuple
-            ScoredPoint = namedtuple("ScoredPoint", ["id", "score", "payload"])
-            return [ScoredPoint(p.id, 1.0, p.payload) for p in (points or [])]
+            ScoredPoint = namedtuple("ScoredPoint", ["id", "score", "payload", "vector"])
+            return [ScoredPoint(p.id, 1.0, p.payload, p.vector) for p in (points or [])]
+
+    def search_batch(
+        self,
+        vector_name: str,
+        query_vectors: List[List[float]],
+        payload_filter: Optional[Dict] = None,
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        fields: Optional[List[str]] = None,
+    ):
+        """Run one kNN query per vector in a single request; returns a list of hit lists."""
+        query_filter = self._build_filter(payload_filter) if payload_filter else None
+        with_payload = qm.PayloadSelectorInclude(include=fields) if fields is not None else True
+        return self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=[
+                qm.SearchRequest(
+                    vector=qm.NamedVector(name=vector_name, vector=vector),
+                    filter=query_filter,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    with_payload=with_payload,
+                )
+                for vector in query_vectors
+            ],
+        )
 
-    def scroll(self, payload_filter: Optional[Dict] = None, limit: int = 1000):
-        """Scroll through all points matching filter (no vector search)."""
+    def scroll(
+        self,
+        payload_filter: Optional[Dict] = None,
+        limit: int = 1000,
+        order_by: Optional[str] = None,
+        descending: bool = True,
+    ):
+        """One page of points matching filter (no vector search); use iter_points for full scans.
+        
+        order_by names a numeric indexed field (e.g. created_ts) to sort by server-side.
+        """
         try:
             result = self.client.scroll(
                 self.collection_name,
                 scroll_filter=self._build_filter(payload_filter) if payload_filter else None,
                 limit=limit,
                 with_payload=True,
+                order_by=qm.OrderBy(
+                    key=order_by,
+                    direction=qm.Direction.DESC if descending else qm.Direction.ASC,
+                ) if order_by else None,
             )
             
             # Handle tuple return (points, next_page_offset)
@@ -149,11 +428,81 @@ class QdrantStore:
                 points = result
             
             return points if points else []
-        except Exception:
-            return []
+        except Exception as e:
+            if not order_by:
+                logger.error(f"Scroll on {self.collection_name} failed: {e}")
+                raise
+            # Server without order_by support (or without a range index on the key)
+            logger.warning(f"Ordered scroll by {order_by} failed ({e}); sorting matching points in Python")
+            return self._sorted_scan(payload_filter, limit, order_by, descending)
+
+    def _sorted_scan(self, payload_filter: Optional[Dict], limit: int, order_by: str, descending: bool):
+        """Fallback for scroll(order_by=...): full filtered scan, sorted client-side.
+
+        Like Qdrant's order_by, points without the key are left out.
+        """
+        points = [p for p in self.iter_points(payload_filter) if p.payload.get(order_by) is not None]
+        points.sort(key=lambda p: p.payload[order_by], reverse=descending)
+        return points[:limit]
+
+    def get_facets(self, facet_keys: List[str], payload_filter: Optional[Dict] = None, limit: int = 100) -> Dict[str, Any]:
+        """Get facet counts.
+        
+        Order of preference:
+        1. Incremental counters (filters limited to status/workspace_id matches)
+        2. Qdrant native facet API (server-side, uses keyword payload indexes)
+        3. Scroll + count in Python (old servers only)
+        """
+        if not facet_keys:
+            return {}
+        
+        facets = self.counter_facets(facet_keys, payload_filter, limit)
+        if facets is not None:
+            return facets
+        
+        if self._native_facets:
+            try:
+                return self._native_facet_counts(facet_keys, payload_filter, limit)
+            except AttributeError:
+                # qdrant-client < 1.12 has no facet(); don't retry every request
+                self._native_facets = False
+            except Exception:
+                # e.g. key without a keyword index, or server < 1.12
+                pass
+        
+        return self._scan_facets(facet_keys, payload_filter)
+
+    def counter_facets(self, facet_keys: List[str], payload_filter: Optional[Dict], limit: int) -> Optional[Dict[str, Any]]:
+        """Facets from the incremental counters, or None if they can't answer this filter yet."""
+        counters = self.facet_counters
+        scope = FacetCounters.scope_of(payload_filter)
+        if counters.stale:
+            counters.rebuild_async(self._facet_projection)
+        if counters.ready and scope is not None and all(k in FACET_KEYS for k in facet_keys):
+            facets = counters.counts(facet_keys, scope)
+            return {k: v[:limit] for k, v in facets.items()}
+        return None
+
+    def _native_facet_counts(self, facet_keys: List[str], payload_filter: Optional[Dict], limit: int) -> Dict[str, Any]:
+        facet_filter = self._build_filter(payload_filter) if payload_filter else None
+        facets = {}
+        for key in facet_keys:
+            res = self.client.facet(
+                self.collection_name,
+                key=key,
+                facet_filter=facet_filter,
+                limit=limit,
+                exact=True,
+            )
+            facets[key] = [{"value": hit.value, "count": hit.count} for hit in res.hits]
+        return facets
+
+    def _facet_projection(self):
+        """Yield (id, facet payload) for every point; used to rebuild counters."""
+        return self._scroll_payloads(list(FACET_KEYS) + ["workspace_id"])
 
-    def get_facets(self, facet_keys: List[str], payload_filter: Optional[Dict] = None) -> Dict[str, Any]:
-        """Get facet counts (simple aggregation via scroll)."""
+    def _scan_facets(self, facet_keys: List[str], payload_filter: Optional[Dict] = None) -> Dict[str, Any]:
+        """Facet counts via scroll (fallback when the facet API is unavailable)."""
         try:
             result = self.client.scroll(
                 self.collection_name,
@@ -205,13 +554,19 @@ class QdrantStore:
     def _parse_condition(self, clause: Dict) -> Optional[qm.Condition]:
         """Parse single condition. Returns None if value is None."""
         key = clause.get("key")
+        if clause.get("is_empty"):
+            return qm.IsEmptyCondition(is_empty=qm.PayloadField(key=key))
         if "match" in clause:
             value = clause["match"].get("value")
             if value is None:
                 return None
             return qm.FieldCondition(key=key, match=qm.MatchValue(value=value))
         elif "range" in clause:
-            return qm.FieldCondition(key=key, range=qm.Range(**clause["range"]))
+            bounds = clause["range"]
+            if any(isinstance(v, str) for v in bounds.values()):
+                # ISO timestamps (e.g. created_at) need a datetime range
+                return qm.FieldCondition(key=key, range=qm.DatetimeRange(**bounds))
+            return qm.FieldCondition(key=key, range=qm.Range(**bounds))
         else:
             value = clause.get("value")
             if value is None:
@@ -56,3 +56,23 @@ class Embedder:
             device=self.device,
         )
 
+    def warmup(self, lengths: tuple = (8, 64, 384), batch_sizes: tuple = (1, 16)):
+        """Run dummy batches of representative lengths (query + passage) so the
+        first real request does not pay kernel selection / allocator costs."""
+        for length in lengths:
+            text = " ".join(["market"] * length)
+            for batch_size in batch_sizes:
+                self.encode([text] * batch_size, batch_size=batch_size, is_query=True)
+                self.encode([text] * batch_size, batch_size=batch_size, is_query=False)
+
+    def memory_footprint(self) -> dict:
+        """Model parameter memory and (if on GPU) CUDA allocations in MB"""
+        footprint = {
+            "model_params_mb": round(
+                sum(p.numel() * p.element_size() for p in self.model.parameters()) / 1e6, 1
+            ),
+        }
+        if self.device == "cuda" and torch.cuda.is_available():
+            footprint["cuda_allocated_mb"] = round(torch.cuda.memory_allocated() / 1e6, 1)
+            footprint["cuda_reserved_mb"] = round(torch.cuda.memory_reserved() / 1e6, 1)
+        return footprint
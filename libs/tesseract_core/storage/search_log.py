@@ -0,0 +1,215 @@
+import asyncio
+import json
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from .tesseract_db import TesseractDB
+
+
+class SearchLogBuffer:
+    """Buffered, batched writer for search_history.
+
+    Searches are appended to a bounded in-memory ring buffer and written by a
+    background flusher with one executemany per interval or size threshold.
+    When the buffer is full the oldest pending entry is dropped (and counted),
+    so a burst of agent searches never blocks or grows memory unbounded.
+
+    Rolling hourly aggregates are kept in memory (seeded from SQLite on start)
+    so get_search_stats() does not have to scan search_history. They count
+    every recorded search, including entries later dropped from the buffer.
+    """
+
+    BUCKET_SECONDS = 3600
+
+    def __init__(
+        self,
+        db: TesseractDB,
+        max_pending: int = None,
+        flush_interval: float = None,
+        flush_threshold: int = None,
+        stats_window_days: int = None,
+    ):
+        self.db = db
+        self.max_pending = max_pending or int(os.getenv("TESSERACT_SEARCH_LOG_MAX_PENDING", "10000"))
+        self.flush_interval = flush_interval or float(os.getenv("TESSERACT_SEARCH_LOG_FLUSH_INTERVAL", "5"))
+        self.flush_threshold = flush_threshold or int(os.getenv("TESSERACT_SEARCH_LOG_FLUSH_THRESHOLD", "200"))
+        self.stats_window_days = stats_window_days or int(os.getenv("TESSERACT_SEARCH_STATS_WINDOW_DAYS", "30"))
+
+        self._pending: deque = deque(maxlen=self.max_pending)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # bucket_start -> {"count", "result_sum", "result_n", "queries": Counter}
+        self._buckets: dict[int, dict] = {}
+        self._aggregates_ready = False
+
+        self.dropped = 0
+        self.written = 0
+        self.flushes = 0
+        self.last_error: Optional[str] = None
+
+    # ---------- recording ----------
+
+    def record(self, query: str, filters: dict = None, result_count: int = 0):
+        """Queue one search for logging (never blocks on SQLite)."""
+        now = int(datetime.now(timezone.utc).timestamp())
+        filters_json = json.dumps(filters) if filters else None
+
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+            self._pending.append((query, filters_json, result_count, now))
+            self._add_to_buckets(query, result_count, now)
+            pending = len(self._pending)
+
+        if pending >= self.flush_threshold and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _add_to_buckets(self, query: str, result_count: int, created_at: int, count: int = 1, result_sum: int = None, result_n: int = None):
+        bucket_start = created_at - (created_at % self.BUCKET_SECONDS)
+        bucket = self._buckets.get(bucket_start)
+        if bucket is None:
+            bucket = {"count": 0, "result_sum": 0, "result_n": 0, "queries": Counter()}
+            self._buckets[bucket_start] = bucket
+        bucket["count"] += count
+        bucket["queries"][query] += count
+        if result_sum is None:
+            if result_count and result_count > 0:
+                bucket["result_sum"] += result_count
+                bucket["result_n"] += 1
+        else:
+            bucket["result_sum"] += result_sum
+            bucket["result_n"] += result_n
+
+    def _evict_old_buckets(self, now: int):
+        cutoff = now - self.stats_window_days * 86400 - self.BUCKET_SECONDS
+        for bucket_start in [b for b in self._buckets if b < cutoff]:
+            del self._buckets[bucket_start]
+
+    # ---------- flushing ----------
+
+    def flush(self) -> int:
+        """Write all pending entries in one executemany. Returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                rows = list(self._pending)
+                self._pending.clear()
+            try:
+                self.db.log_searches(rows)
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"⚠️ Failed to flush {len(rows)} search log entries: {e}")
+                # Put rows back (oldest first); overflow beyond max_pending is dropped
+                with self._lock:
+                    space = self.max_pending - len(self._pending)
+                    requeue = rows[-space:] if space > 0 else []
+                    self.dropped += len(rows) - len(requeue)
+                    self._pending.extendleft(reversed(requeue))
+                return 0
+            self.written += len(rows)
+            self.flushes += 1
+            return len(rows)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await asyncio.to_thread(self.flush)
+
+    async def start(self):
+        """Seed aggregates and start the background flusher on the running loop."""
+        if self._task is not None and not self._task.done():
+            return
+        await asyncio.to_thread(self.load_aggregates)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    # ---------- aggregates ----------
+
+    def load_aggregates(self):
+        """(Re)build hourly aggregates for the stats window from SQLite."""
+        now = int(datetime.now(timezone.utc).timestamp())
+        cutoff = now - self.stats_window_days * 86400
+        rows = self.db.get_search_buckets(cutoff, self.BUCKET_SECONDS)
+        with self._lock:
+            self._buckets = {}
+            for bucket_start, query, count, result_sum, result_n in rows:
+                self._add_to_buckets(query, 0, bucket_start, count=count, result_sum=result_sum or 0, result_n=result_n or 0)
+            # Pending entries are not in SQLite yet; count them too
+            for query, _filters, result_count, created_at in self._pending:
+                self._add_to_buckets(query, result_count, created_at)
+            self._aggregates_ready = True
+
+    def reset(self):
+        """Drop pending entries and aggregates (factory reset)."""
+        with self._lock:
+            self._pending.clear()
+            self._buckets = {}
+
+    def get_search_stats(self, days: int = 30) -> dict:
+        """Search statistics from in-memory aggregates, falling back to SQLite."""
+        if not self._aggregates_ready or days > self.stats_window_days:
+            self.flush()
+            return self.db.get_search_stats(days=days)
+
+        now = int(datetime.now(timezone.utc).timestamp())
+        cutoff = now - days * 86400
+        cutoff_bucket = cutoff - (cutoff % self.BUCKET_SECONDS)
+
+        total = 0
+        result_sum = 0
+        result_n = 0
+        queries: Counter = Counter()
+        with self._lock:
+            self._evict_old_buckets(now)
+            for bucket_start, bucket in self._buckets.items():
+                if bucket_start < cutoff_bucket:
+                    continue
+                total += bucket["count"]
+                result_sum += bucket["result_sum"]
+                result_n += bucket["result_n"]
+                queries.update(bucket["queries"])
+
+        avg_results = (result_sum / result_n) if result_n else 0
+        return {
+            "total_searches": total,
+            "unique_queries": len(queries),
+            "avg_result_count": round(avg_results, 1),
+            "top_queries": [{"query": q, "count": c} for q, c in queries.most_common(10)],
+            "days": days
+        }
+
+    def status(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "max_pending": self.max_pending,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "flush_interval": self.flush_interval,
+            "flush_threshold": self.flush_threshold,
+            "last_error": self.last_error,
+        }
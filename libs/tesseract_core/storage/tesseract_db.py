@@ -232,6 +232,39 @@ class TesseractDB:
             """, (query, filters_json, result_count, now))
             conn.commit()
     
+    def log_searches(self, rows: List[tuple]):
+        """Log many searches in one transaction.
+        
+        rows: (query, filters_json, result_count, created_at) tuples
+        """
+        if not rows:
+            return
+        with self.conn() as conn:
+            conn.executemany("""
+                INSERT INTO search_history (query, filters, result_count, created_at)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+    
+    def get_search_buckets(self, since: int, bucket_seconds: int = 3600) -> List[tuple]:
+        """Aggregate search_history per (time bucket, query) since a timestamp.
+        
+        Returns (bucket_start, query, count, result_sum, result_n) tuples where
+        result_sum/result_n only cover searches with result_count > 0.
+        """
+        with self.conn() as conn:
+            rows = conn.execute("""
+                SELECT created_at - (created_at % ?) AS bucket,
+                       query,
+                       COUNT(*),
+                       SUM(CASE WHEN result_count > 0 THEN result_count ELSE 0 END),
+                       SUM(CASE WHEN result_count > 0 THEN 1 ELSE 0 END)
+                FROM search_history
+                WHERE created_at >= ?
+                GROUP BY bucket, query
+            """, (bucket_seconds, since)).fetchall()
+            return [tuple(row) for row in rows]
+    
     def get_search_history(
         self, 
         limit: int = 50, 
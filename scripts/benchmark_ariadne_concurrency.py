@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Ariadne request concurrency with a dockerless Neo4j stand-in.
+
+Runs the API in-process against an AsyncGraphStore whose sessions answer
+every query after a fixed latency instead of talking to Neo4j. In
+`blocking` mode the stand-in sleeps in the calling thread (what a sync
+driver call inside an `async def` route does); in `async` mode it awaits.
+Fires N concurrent GET /v1/kg/stats requests and reports wall time: blocking
+requests serialize (~N x queries x latency), async ones overlap.
+
+    python scripts/benchmark_ariadne_concurrency.py --requests 50 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+
+from libs.ariadne_core.storage import AsyncGraphStore
+from libs.ariadne_core.storage.graph_store import GRAPH_TOKENS_QUERY
+
+LABELS = ["Company", "Event", "Concept"]
+REL_TYPES = ["AFFECTS", "RELATED_TO"]
+
+
+class _StandInResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __aiter__(self):
+        async def rows():
+            for row in self._rows:
+                yield row
+        return rows()
+
+    async def single(self):
+        return self._rows[0] if self._rows else None
+
+
+class _StandInSession:
+    def __init__(self, latency: float, blocking: bool):
+        self.latency = latency
+        self.blocking = blocking
+
+    async def run(self, query, parameters=None):
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        # get_stats lists the tokens, then asks for count-store rows per token
+        if query == GRAPH_TOKENS_QUERY:
+            return _StandInResult([{"labels": LABELS, "rel_types": REL_TYPES}])
+        if " AS kind" in query:
+            rows = [{"kind": "node", "name": None, "count": 100 * len(LABELS)},
+                    {"kind": "edge", "name": None, "count": 50 * len(REL_TYPES)}]
+            rows += [{"kind": "node", "name": label, "count": 100} for label in LABELS]
+            rows += [{"kind": "edge", "name": rel_type, "count": 50} for rel_type in REL_TYPES]
+            return _StandInResult(rows)
+        return _StandInResult([])
+
+
+class StandInGraphStore(AsyncGraphStore):
+    """AsyncGraphStore with a fixed-latency fake session in place of the driver"""
+
+    def __init__(self, latency: float, blocking: bool, max_sessions: int):
+        super().__init__(max_sessions=max_sessions)
+        self.latency = latency
+        self.blocking = blocking
+
+    def connect(self):
+        return self
+
+    @asynccontextmanager
+    async def session(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_sessions)
+        async with self._slots:
+            yield _StandInSession(self.latency, self.blocking)
+
+
+async def run(mode: str, requests: int, latency: float, max_sessions: int) -> float:
+    from apps.ariadne_api.main import app, get_async_graph_store
+
+    store = StandInGraphStore(latency, blocking=(mode == "blocking"), max_sessions=max_sessions)
+    app.dependency_overrides[get_async_graph_store] = lambda: store
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://ariadne") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[client.get("/v1/kg/stats") for _ in range(requests)])
+        elapsed = time.perf_counter() - started
+    app.dependency_overrides.clear()
+
+    failed = [r.status_code for r in responses if r.status_code != 200]
+    if failed:
+        raise RuntimeError(f"{len(failed)} requests failed: {failed[:5]}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50, help="concurrent requests per mode")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stand-in query")
+    parser.add_argument("--max-sessions", type=int, default=100)
+    args = parser.parse_args()
+
+    # /v1/kg/stats issues two queries (label counts, type counts)
+    serial = args.requests * 2 * args.latency
+    print(f"🧪 {args.requests} concurrent /v1/kg/stats, {args.latency * 1000:.0f} ms per query "
+          f"(fully serialized: {serial:.2f}s)")
+    for mode in ("blocking", "async"):
+        elapsed = asyncio.run(run(mode, args.requests, args.latency, args.max_sessions))
+        print(f"  {mode:<9} {elapsed:6.2f}s  ({args.requests / elapsed:7.1f} req/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Ariadne price ingest end-to-end, with Satbase and Neo4j stand-ins.
+
+Satbase answers every bar request after a fixed latency with seeded
+synthetic daily bars; the graph store's sessions charge a fixed latency per
+round trip (one `session.run` or one managed write transaction). Runs the
+previous ingest path (serial fetches, one write per instrument and per
+event) and the current one (bounded concurrent fetches, UNWIND batches) over
+the same symbols and reports wall time and graph round trips.
+
+    python scripts/benchmark_ariadne_ingest.py --symbols 500 --fetch-latency 0.02 --write-latency 0.002
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+
+from libs.ariadne_core.storage import AsyncGraphStore
+
+
+def synthetic_bars(symbol: str, days: int, seed: int) -> list[dict]:
+    """Random-walk daily bars, deterministic per (symbol, seed)"""
+    rng = random.Random(f"{seed}:{symbol}")
+    price = rng.uniform(20, 400)
+    start = date(2025, 1, 1)
+    bars = []
+    for day in range(days):
+        price *= 1 + rng.gauss(0, 0.02)
+        bars.append({
+            "date": (start + timedelta(days=day)).isoformat(),
+            "open": price,
+            "high": price * (1 + abs(rng.gauss(0, 0.01))),
+            "low": price * (1 - abs(rng.gauss(0, 0.01))),
+            "close": price,
+            "volume": rng.randint(10_000, 1_000_000),
+        })
+    return bars
+
+
+def satbase_transport(latency: float, days: int, seed: int) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        symbol = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"bars": synthetic_bars(symbol, days, seed)})
+    return httpx.MockTransport(handler)
+
+
+class _StandInResult:
+    async def consume(self):
+        return None
+
+    async def single(self):
+        return None
+
+
+class _StandInSession:
+    def __init__(self, store: "StandInGraphStore"):
+        self.store = store
+
+    async def _round_trip(self):
+        self.store.round_trips += 1
+        await asyncio.sleep(self.store.latency)
+
+    async def run(self, query, parameters=None):
+        await self._round_trip()
+        return _StandInResult()
+
+    async def execute_write(self, work, *args):
+        await self._round_trip()
+        return await work(self, *args)
+
+
+class StandInGraphStore(AsyncGraphStore):
+    """AsyncGraphStore charging a fixed latency per round trip instead of talking to Neo4j"""
+
+    def __init__(self, latency: float):
+        super().__init__(max_sessions=100)
+        self.latency = latency
+        self.round_trips = 0
+
+    def connect(self):
+        return self
+
+    @asynccontextmanager
+    async def session(self):
+        yield _StandInSession(self)
+
+
+def ingest_module():
+    # The routers import their dependencies from main, so main has to load first
+    importlib.import_module("apps.ariadne_api.main")
+    from apps.ariadne_api.routers import ingest
+    return ingest
+
+
+async def legacy_ingestion(store: AsyncGraphStore, symbols: list[str], from_date: str, to_date: str):
+    """The serial, one-write-per-event path this benchmark compares against"""
+    ingest = ingest_module()
+    satbase_url = os.getenv("SATBASE_URL", "http://localhost:8080")
+    detector = ingest.get_price_detector()
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        for symbol in symbols:
+            response = await client.get(
+                f"{satbase_url}/v1/prices/daily/{symbol}", params={"from": from_date, "to": to_date}
+            )
+            price_data = response.json().get("bars", [])
+            if not price_data:
+                continue
+            await store.execute_write(
+                "MERGE (i:Instrument {symbol: $symbol}) SET i.updated_at = datetime()", {"symbol": symbol}
+            )
+            for event in detector.detect_all(symbol, price_data):
+                await store.execute_write("CREATE (pe:PriceEvent ...)", {
+                    "symbol": event["symbol"],
+                    "event_type": event["event_type"],
+                    "occurred_at": event["occurred_at"],
+                    "confidence": event["confidence"],
+                    "properties": event.get("properties", {}),
+                })
+
+
+async def run(path: str, args) -> tuple[float, int]:
+    ingest = ingest_module()
+    transport = satbase_transport(args.fetch_latency, args.days, args.seed)
+    real_client = httpx.AsyncClient
+    ingest.httpx.AsyncClient = lambda **kwargs: real_client(transport=transport, **kwargs)
+    try:
+        store = StandInGraphStore(args.write_latency)
+        symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+        fn = legacy_ingestion if path == "legacy" else ingest.run_price_ingestion
+        started = time.perf_counter()
+        await fn(store, symbols, "2025-01-01", "2025-12-31")
+        return time.perf_counter() - started, store.round_trips
+    finally:
+        ingest.httpx.AsyncClient = real_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=250, help="daily bars per symbol")
+    parser.add_argument("--fetch-latency", type=float, default=0.02, help="seconds per Satbase request")
+    parser.add_argument("--write-latency", type=float, default=0.002, help="seconds per graph round trip")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"🧪 {args.symbols} symbols x {args.days} bars, Satbase {args.fetch_latency * 1000:.0f} ms, "
+          f"graph {args.write_latency * 1000:.1f} ms per round trip")
+    for path in ("legacy", "batched"):
+        elapsed, round_trips = asyncio.run(run(path, args))
+        print(f"  {path:<8} {elapsed:7.2f}s  {round_trips:6d} graph round trips")
+
+
+if __name__ == "__main__":
+    main()
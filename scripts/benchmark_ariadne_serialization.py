@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Ariadne subgraph serialization: per-value normalizer + pydantic vs collector + orjson.
+
+Builds driver Node/Relationship objects shaped like a /v1/kg/context result
+(seeds, first hop, second hop; one row per second-hop neighbour, so seeds
+and first-hop elements repeat across rows) with temporal, list and scalar
+properties. Times turning the rows into response bytes the previous way
+(recursive _normalize per row value, Node/Edge/ContextResponse models,
+jsonable_encoder, JSONResponse) and the current way (GraphCollector, orjson
+via GraphJSONResponse).
+
+    python scripts/benchmark_ariadne_serialization.py --nodes 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from neo4j.graph import Graph, Node as GraphNode
+from neo4j.time import DateTime, Date
+
+from libs.ariadne_core.models import ContextResponse, Subgraph, Node, Edge
+from libs.ariadne_core.utils import GraphCollector, dumps
+
+LABELS = ["Company", "Event", "Concept", "Instrument"]
+REL_TYPES = ["SUPPLIES_TO", "AFFECTS", "COMPETES_WITH", "MENTIONS"]
+
+
+def build_rows(nodes: int, seeds: int, fanout: int, seed: int) -> list[dict]:
+    """Context-shaped rows {n, r1, n1, r2, n2} over roughly `nodes` distinct nodes"""
+    rng = random.Random(seed)
+    graph = Graph()
+    epoch = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    counter = iter(range(10_000_000))
+
+    def node() -> GraphNode:
+        i = next(counter)
+        return GraphNode(graph, f"4:bench:{i}", i, [rng.choice(LABELS)], {
+            "id": f"n{i}",
+            "name": f"Entity {i}",
+            "ticker": f"T{i % 9000:04d}",
+            "sector": rng.choice(["Semiconductors", "Energy", "Software", "Banks"]),
+            "confidence": round(rng.random(), 3),
+            "tags": [rng.choice(["ai", "supply", "rates", "china"]) for _ in range(3)],
+            "created_at": DateTime.from_native(epoch + timedelta(minutes=rng.randrange(500_000))),
+            "as_of": Date(2025, rng.randint(1, 12), rng.randint(1, 28)),
+        })
+
+    def rel(start: GraphNode, end: GraphNode):
+        i = next(counter)
+        r = graph.relationship_type(rng.choice(REL_TYPES))(graph, f"5:bench:{i}", i, {
+            "confidence": round(rng.random(), 3),
+            "weight": rng.random(),
+            "valid_from": DateTime.from_native(epoch + timedelta(days=rng.randrange(365))),
+            "source": "benchmark",
+        })
+        r._start_node, r._end_node = start, end
+        return r
+
+    # seeds x fanout first-hop nodes, each with enough second-hop rows to reach `nodes`
+    second_hop = max(1, nodes // (seeds * fanout))
+    rows = []
+    for _ in range(seeds):
+        n = node()
+        for _ in range(fanout):
+            n1 = node()
+            r1 = rel(n, n1)
+            for _ in range(second_hop):
+                n2 = node()
+                rows.append({"n": n, "r1": r1, "n1": n1, "r2": rel(n1, n2), "n2": n2})
+    return rows
+
+
+def before(rows: list[dict]) -> bytes:
+    """Previous /context path: per-value normalizer, models, jsonable_encoder"""
+    def _normalize(value):
+        try:
+            if value is None:
+                return None
+            if isinstance(value, (str, int, float, bool)):
+                return value
+            if isinstance(value, list):
+                return [_normalize(v) for v in value]
+            if isinstance(value, dict):
+                return {k: _normalize(v) for k, v in value.items()}
+            if hasattr(value, "to_native"):
+                native = value.to_native()
+                return native.isoformat() if hasattr(native, "isoformat") else native
+            if hasattr(value, "isoformat"):
+                return value.isoformat()
+            return str(value)
+        except Exception:
+            return str(value)
+
+    nodes_dict: dict[str, Node] = {}
+    edges_list: list[Edge] = []
+    for record in rows:
+        for val in record.values():
+            if val is None:
+                continue
+            if hasattr(val, "labels") and hasattr(val, "id"):
+                node_id = str(val.element_id)
+                if node_id not in nodes_dict:
+                    nodes_dict[node_id] = Node(
+                        id=node_id,
+                        label=list(val.labels)[0] if getattr(val, "labels", None) else "Unknown",
+                        properties={k: _normalize(v) for k, v in dict(val).items()}
+                    )
+            elif hasattr(val, "type") and hasattr(val, "start_node") and hasattr(val, "end_node"):
+                edges_list.append(Edge(
+                    source_id=str(val.start_node.element_id),
+                    target_id=str(val.end_node.element_id),
+                    rel_type=val.type,
+                    properties={k: _normalize(v) for k, v in dict(val).items()}
+                ))
+    nodes = list(nodes_dict.values())
+    response = ContextResponse(
+        query="benchmark",
+        subgraph=Subgraph(nodes=nodes, edges=edges_list, summary=f"Found {len(nodes)} nodes"),
+        as_of=None
+    )
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def after(rows: list[dict]) -> bytes:
+    """Current /context path: GraphCollector + orjson"""
+    collector = GraphCollector().add_records(rows)
+    nodes, edges = collector.nodes, collector.edges
+    return dumps({
+        "query": "benchmark",
+        "subgraph": {"nodes": nodes, "edges": edges, "summary": f"Found {len(nodes)} nodes"},
+        "as_of": None
+    })
+
+
+def timed(fn, rows, repeats: int) -> tuple[float, bytes]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        body = fn(rows)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=5000, help="approximate distinct nodes")
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--fanout", type=int, default=20, help="first-hop neighbours per seed")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # the previous normalizer probed entity.id, which the driver now flags as deprecated
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    rows = build_rows(args.nodes, args.seeds, args.fanout, args.seed)
+    unique_nodes = len({v.element_id for row in rows for k, v in row.items() if k in ("n", "n1", "n2")})
+    unique_edges = len({v.element_id for row in rows for k, v in row.items() if k in ("r1", "r2")})
+    print(f"🧪 {len(rows)} rows, {unique_nodes} distinct nodes, {unique_edges} distinct relationships")
+
+    before_s, before_body = timed(before, rows, args.repeats)
+    after_s, after_body = timed(after, rows, args.repeats)
+
+    old, new = json.loads(before_body)["subgraph"], json.loads(after_body)["subgraph"]
+    if old["nodes"] != new["nodes"]:
+        raise RuntimeError("node payloads differ")
+    if {json.dumps(e, sort_keys=True) for e in old["edges"]} != {json.dumps(e, sort_keys=True) for e in new["edges"]}:
+        raise RuntimeError("edge payloads differ")
+    print(f"  ✓ same nodes and distinct edges ({len(old['edges'])} edges before, {len(new['edges'])} after)")
+    print(f"  before  {before_s * 1000:8.1f} ms  {len(before_body) / 1e6:6.2f} MB")
+    print(f"  after   {after_s * 1000:8.1f} ms  {len(after_body) / 1e6:6.2f} MB  ({before_s / after_s:.1f}x)")
+    print("  (before repeats first-hop edges once per second-hop row; after emits each edge once)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Ariadne CSR snapshot: fixture parity and per-request cost.
+
+Builds seeded Company/Event/Concept graphs, loads them through
+SnapshotManager from a stand-in store (one streamed row per node, as
+snapshot_query returns them) and checks the sparse traversals against
+reference implementations of what the Cypher paths compute:
+
+  - impact / k_hop vs an APOC expandConfig(bfs, NODE_GLOBAL) style
+    expansion: identical on a tree fixture; on a general graph identical
+    reach and depth, with scores equal to the best shortest-hop path
+  - pagerank vs a Pregel-style gds.pageRank (whole graph and label-induced)
+  - a snapshot restricted to Company/Event/Concept loses nodes APOC reaches
+    through Instrument nodes, and reports that it cannot serve /impact
+
+Then reports snapshot load time and per-request latency. A live Neo4j is
+needed to time APOC itself; the pure-Python expansion is shown only as a
+rough per-request traversal baseline.
+
+    python scripts/benchmark_ariadne_snapshot.py --nodes 20000 --degree 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+from libs.ariadne_core.storage import SnapshotManager
+from libs.ariadne_core.storage.csr_snapshot import IMPACT_DECAY
+
+LABELS = ["Company", "Event", "Concept"]
+# Outside a Company/Event/Concept snapshot; APOC's expansion still walks through it
+OTHER_LABELS = ["Instrument"]
+REL_TYPES = ["SUPPLIES_TO", "AFFECTS", "COMPETES_WITH", "MENTIONS"]
+
+
+def synthetic_graph(nodes: int, degree: float, seed: int, tree: bool = False):
+    """Node dicts and (source_id, target_id, rel_type, confidence) edges; tree=True gives a random tree"""
+    rng = random.Random(seed)
+    node_list = [
+        {"id": f"4:fx:{i}", "labels": [rng.choice(LABELS + OTHER_LABELS)], "name": f"Node {i}", "ticker": f"T{i}"}
+        for i in range(nodes)
+    ]
+    edges = []
+    if tree:
+        for i in range(1, nodes):
+            parent = rng.randrange(i)
+            pair = (parent, i) if rng.random() < 0.5 else (i, parent)
+            edges.append((f"4:fx:{pair[0]}", f"4:fx:{pair[1]}", rng.choice(REL_TYPES), round(rng.uniform(0.3, 1.0), 3)))
+    else:
+        for _ in range(int(nodes * degree)):
+            s, t = rng.randrange(nodes), rng.randrange(nodes)
+            edges.append((f"4:fx:{s}", f"4:fx:{t}", rng.choice(REL_TYPES), round(rng.uniform(0.3, 1.0), 3)))
+        # A few parallel relationships with a different confidence
+        for s, t, rel_type, _ in rng.sample(edges, len(edges) // 50):
+            edges.append((s, t, rel_type, round(rng.uniform(0.3, 1.0), 3)))
+    return node_list, edges
+
+
+class StandInStore:
+    """Streams snapshot_query-shaped rows from in-memory fixtures (labels: the covered label set)"""
+
+    def __init__(self, nodes, edges, labels=None):
+        kept = {n["id"] for n in nodes if not labels or set(n["labels"]) & set(labels)}
+        out = {}
+        for s, t, rel_type, confidence in edges:
+            if t in kept:
+                out.setdefault(s, []).append([t, rel_type, confidence])
+        self.rows = [
+            {"id": n["id"], "labels": n["labels"], "name": n["name"],
+             "ticker": n["ticker"] if "Company" in n["labels"] else None, "out": out.get(n["id"], [])}
+            for n in nodes if n["id"] in kept
+        ]
+
+    @asynccontextmanager
+    async def session(self):
+        yield self
+
+    async def run(self, query, parameters=None):
+        return self
+
+    def __aiter__(self):
+        return self._stream()
+
+    async def _stream(self):
+        for row in self.rows:
+            yield row
+
+
+def reference_adjacency(nodes, edges, rel_filter=None, decay="exponential"):
+    """Per-node (neighbour, factor) lists in relationship order, honouring an APOC relationshipFilter"""
+    factor = IMPACT_DECAY[decay]
+    allowed = []
+    for token in (rel_filter.split("|") if rel_filter else [""]):
+        incoming, outgoing = token.startswith("<"), token.endswith(">")
+        allowed.append((token.strip("<>"), incoming or not outgoing, outgoing or not incoming))
+    adjacency = {n["id"]: [] for n in nodes}
+    for s, t, rel_type, confidence in edges:
+        for name, backward, forward in allowed:
+            if name and name != rel_type:
+                continue
+            if forward:
+                adjacency[s].append((t, factor(confidence)))
+            if backward:
+                adjacency[t].append((s, factor(confidence)))
+    return adjacency
+
+
+def apoc_expand(adjacency, source, max_depth):
+    """BFS with NODE_GLOBAL uniqueness: each node scored along the first path that reaches it"""
+    reached = {source: (0, 1.0)}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        depth, score = reached[node]
+        if depth == max_depth:
+            continue
+        for neighbour, factor in adjacency[node]:
+            if neighbour not in reached:
+                reached[neighbour] = (depth + 1, score * factor)
+                queue.append(neighbour)
+    del reached[source]
+    return reached
+
+
+def best_shortest_paths(adjacency, source, max_depth):
+    """Depth and best product score over all shortest-hop paths, level by level"""
+    reached = {source: (0, 1.0)}
+    frontier = {source: 1.0}
+    for level in range(1, max_depth + 1):
+        best = {}
+        for node, score in frontier.items():
+            for neighbour, factor in adjacency[node]:
+                if neighbour not in reached:
+                    best[neighbour] = max(best.get(neighbour, -np.inf), score * factor)
+        for node, score in best.items():
+            reached[node] = (level, score)
+        frontier = best
+    del reached[source]
+    return reached
+
+
+def gds_pagerank(nodes, edges, label=None, damping=0.85, max_iterations=20, tolerance=1e-7):
+    """Pregel-style gds.pageRank on a natural projection (label: induced subgraph)"""
+    members = {n["id"] for n in nodes if label is None or label in n["labels"]}
+    out = {node: [] for node in members}
+    for s, t, _, _ in edges:
+        if s in members and t in members:
+            out[s].append(t)
+    rank = {node: 1.0 - damping for node in members}
+    delta = dict(rank)
+    for _ in range(1, max_iterations):
+        incoming = {node: 0.0 for node in members}
+        for node, targets in out.items():
+            if delta[node] > tolerance and targets:
+                share = delta[node] / len(targets)
+                for t in targets:
+                    incoming[t] += share
+        delta = {node: damping * incoming[node] for node in members}
+        for node in members:
+            rank[node] += delta[node]
+    return rank
+
+
+def as_dict(snapshot, reached):
+    rows, depths, *scores = reached
+    scores = scores[0].tolist() if scores else [None] * len(rows)
+    return {snapshot.ids[r]: (d, s) for r, d, s in zip(rows.tolist(), depths.tolist(), scores)}
+
+
+def check_impact(snapshot, nodes, edges, sources, exact: bool):
+    mismatches = 0
+    for rel_filter in (None, "SUPPLIES_TO|AFFECTS", "SUPPLIES_TO>|<AFFECTS"):
+        for decay in IMPACT_DECAY:
+            adjacency = reference_adjacency(nodes, edges, rel_filter, decay)
+            for source in sources:
+                row = snapshot.node(node_id=source)
+                got = as_dict(snapshot, snapshot.impact(row, 3, rel_filter, decay))
+                apoc = apoc_expand(adjacency, source, 3)
+                best = apoc if exact else best_shortest_paths(adjacency, source, 3)
+                hops = as_dict(snapshot, snapshot.k_hop(row, 3, rel_filter))
+                ok = (
+                    got.keys() == apoc.keys()
+                    and all(got[n][0] == apoc[n][0] and abs(got[n][1] - best[n][1]) < 1e-12 for n in got)
+                    and all(got[n][1] >= apoc[n][1] - 1e-12 for n in got)
+                    and {n: d for n, (d, _) in hops.items()} == {n: d for n, (d, _) in apoc.items()}
+                )
+                mismatches += not ok
+    return mismatches
+
+
+def check_pagerank(snapshot, nodes, edges):
+    worst = 0.0
+    for label in (None, "Company"):
+        expected = gds_pagerank(nodes, edges, label)
+        rows, scores = snapshot.pagerank(label)
+        for row, score in zip(rows.tolist(), scores.tolist()):
+            worst = max(worst, abs(score - expected[snapshot.ids[row]]))
+    return worst
+
+
+def timed(fn, repeats=1):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return result, statistics.median(samples)
+
+
+async def load(nodes, edges, labels=()):
+    """Snapshot of the fixture; labels=() covers the whole graph like ARIADNE_CSR_LABELS=*"""
+    manager = SnapshotManager(StandInStore(nodes, edges, labels), enabled=True, labels=list(labels))
+    return await manager.current()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--degree", type=float, default=5.0, help="relationships per node")
+    parser.add_argument("--sources", type=int, default=5, help="impact sources checked per fixture")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    # Parity fixtures
+    for name, tree in (("tree", True), ("graph", False)):
+        nodes, edges = synthetic_graph(2000, 3.0, args.seed, tree=tree)
+        snapshot = asyncio.run(load(nodes, edges))
+        sources = [n["id"] for n in rng.sample(nodes, args.sources)]
+        mismatches = check_impact(snapshot, nodes, edges, sources, exact=tree)
+        if mismatches:
+            raise RuntimeError(f"{name} fixture: {mismatches} impact/k_hop mismatches")
+        worst = check_pagerank(snapshot, nodes, edges)
+        if worst > 1e-9:
+            raise RuntimeError(f"{name} fixture: PageRank differs from the reference by {worst:.2e}")
+        print(f"  ✓ {name} fixture: impact, k_hop and PageRank match (max PageRank diff {worst:.1e})")
+
+    # A label-restricted snapshot misses paths through Instrument nodes, so /impact must not use it
+    nodes, edges = synthetic_graph(2000, 3.0, args.seed)
+    restricted = asyncio.run(load(nodes, edges, LABELS))
+    full = asyncio.run(load(nodes, edges))
+    adjacency = reference_adjacency(nodes, edges)
+    lost = 0
+    for source in [n["id"] for n in nodes if set(n["labels"]) & set(LABELS)][:args.sources]:
+        apoc = apoc_expand(adjacency, source, 3)
+        partial = as_dict(restricted, restricted.impact(restricted.node(node_id=source), 3))
+        lost += len(apoc.keys() - partial.keys())
+    if restricted.covers(None) or not full.covers(None) or not lost:
+        raise RuntimeError("label-restricted fixture: expected a snapshot that cannot serve /impact")
+    print(f"  ✓ label-restricted fixture: {lost} APOC-reachable nodes missing, so /impact falls back to APOC")
+
+    # Cost
+    nodes, edges = synthetic_graph(args.nodes, args.degree, args.seed)
+    print(f"🧪 {len(nodes)} nodes, {len(edges)} relationships")
+    snapshot, load_time = timed(lambda: asyncio.run(load(nodes, edges)))
+    print(f"  snapshot load          {load_time * 1000:9.1f} ms  (stand-in stream + CSR build)")
+
+    source = snapshot.node(node_id=nodes[0]["id"])
+    adjacency = reference_adjacency(nodes, edges)
+    _, cold = timed(lambda: snapshot.impact(source, 1))
+    print(f"  traversal matrix       {cold * 1000:9.1f} ms  (first impact call, then cached)")
+    for depth in (3, 5):
+        reached, warm = timed(lambda: snapshot.impact(source, depth), repeats=20)
+        _, baseline = timed(lambda: apoc_expand(adjacency, nodes[0]["id"], depth), repeats=5)
+        print(
+            f"  impact depth {depth}         {warm * 1000:9.1f} ms  "
+            f"({len(reached[0])} nodes reached; pure-Python expansion {baseline * 1000:.1f} ms)"
+        )
+
+    _, pagerank_cold = timed(lambda: snapshot.pagerank())
+    _, pagerank_warm = timed(lambda: snapshot.pagerank(), repeats=20)
+    print(f"  pagerank (cold)        {pagerank_cold * 1000:9.1f} ms")
+    print(f"  pagerank (cached)      {pagerank_warm * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Seeded Manifold performance baseline with no external services.
+
+Runs the API in-process on Qdrant's embedded local mode with deterministic
+hash embeddings, loads N synthetic thoughts (same seed = same data) and
+reports p50/p95 latency for create, search, related and stats.
+
+    python scripts/benchmark_manifold_local.py --thoughts 50000 --samples 200
+
+With --serve PORT the seeded API is served over HTTP instead, e.g. as the
+target of scripts/benchmark_manifold_search.py.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+TYPES = ["observation", "analysis", "hypothesis", "decision", "reflection", "question"]
+TICKERS = ["AAPL", "MSFT", "NVDA", "TSM", "ASML", "AMD", "INTC", "TSLA", "AMZN", "GOOGL", "BTC", "ETH"]
+WORDS = (
+    "revenue margin guidance capex demand supply inventory pricing rates inflation yield "
+    "credit spread momentum valuation earnings cycle risk hedge exposure liquidity volume"
+).split()
+
+
+def _configure_env(args, workdir: str) -> None:
+    """Point every Manifold dependency at in-process / temp resources (before importing the app)."""
+    os.environ["MANIFOLD_QDRANT_PATH"] = args.qdrant_path or ":memory:"
+    os.environ["MANIFOLD_QDRANT_COLLECTION"] = "manifold_bench"
+    os.environ["MANIFOLD_VECTOR_DIM"] = str(args.dim)
+    os.environ["MANIFOLD_EMBED_PROVIDER"] = "hash"
+    os.environ["MANIFOLD_EMBED_CACHE_PATH"] = ""
+    os.environ["MANIFOLD_SQLITE_PATH"] = os.path.join(workdir, "manifold.db")
+    os.environ["MANIFOLD_EAGER_LOAD"] = "false"
+
+
+def _synthetic_thought(rng: random.Random, i: int, ids: list, now: datetime) -> dict:
+    words = rng.sample(WORDS, 8)
+    created = (now - timedelta(minutes=rng.randrange(365 * 24 * 60))).isoformat() + "Z"
+    workspace = f"ws-{rng.randrange(10)}"
+    related = rng.sample(ids[:i], min(i, rng.choice([0, 0, 1, 2, 3]))) if i else []
+    return {
+        "id": ids[i],
+        "type": rng.choice(TYPES),
+        "status": "active",
+        "title": f"{rng.choice(TICKERS)} {' '.join(words[:3])} #{i}",
+        "summary": " ".join(words[:6]),
+        "content": " ".join(rng.choice(WORDS) for _ in range(60)),
+        "tickers": rng.sample(TICKERS, rng.randint(1, 3)),
+        "tags": rng.sample(WORDS, 2),
+        "workspace_id": workspace,
+        "session_id": f"{workspace}-s{rng.randrange(20)}",
+        "confidence_level": rng.choice(["low", "medium", "high"]),
+        "confidence_score": round(rng.random(), 2),
+        "links": {"related_thoughts": related, "relations": []},
+        "created_at": created,
+        "updated_at": created,
+        "version": 1,
+    }
+
+
+def load(store, embedder, n: int, seed: int, batch_size: int = 1000) -> float:
+    """Bulk-load n seeded thoughts straight into the collection, then rebuild the sidecar indexes."""
+    from qdrant_client.http import models as qm
+    from libs.manifold_core.storage.qdrant_store import CREATED_TS_FIELD, epoch_seconds
+
+    rng = random.Random(seed)
+    ids = [str(UUID(int=rng.getrandbits(128), version=4)) for _ in range(n)]
+    now = datetime(2026, 1, 1)
+    started = time.perf_counter()
+    for start in range(0, n, batch_size):
+        thoughts = [_synthetic_thought(rng, i, ids, now) for i in range(start, min(start + batch_size, n))]
+        vectors = embedder.embed_many([
+            {"text": t["content"], "title": t["title"], "summary": t["summary"]} for t in thoughts
+        ])
+        store.client.upsert(
+            collection_name=store.collection_name,
+            points=[
+                qm.PointStruct(id=t["id"], payload={**t, CREATED_TS_FIELD: epoch_seconds(t["created_at"])}, vector=v)
+                for t, v in zip(thoughts, vectors)
+            ],
+        )
+        print(f"  … {min(start + batch_size, n)}/{n}", end="\r", flush=True)
+    store.rebuild_link_index()
+    store.rebuild_aggregates()
+    store.facet_counters.invalidate()
+    return time.perf_counter() - started
+
+
+def timed(fn, samples: int) -> list:
+    latencies = []
+    for i in range(samples):
+        t0 = time.perf_counter()
+        resp = fn(i)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if resp.status_code != 200:
+            raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    print(f"  {name:<8} p50 {p50:8.1f} ms | p95 {p95:8.1f} ms | n={len(ordered)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--thoughts", type=int, default=50000)
+    parser.add_argument("--samples", type=int, default=200, help="requests timed per operation")
+    parser.add_argument("--dim", type=int, default=384, help="vector size (1024 matches the default model)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--qdrant-path", default=None, help="local-mode directory (default: in memory)")
+    parser.add_argument("--serve", type=int, default=None, metavar="PORT", help="serve the loaded API instead of timing it")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="manifold-bench-") as workdir:
+        _configure_env(args, workdir)
+        from fastapi.testclient import TestClient
+        from apps.manifold_api.main import app
+        from apps.manifold_api.dependencies import get_qdrant_store, embedding_lifecycle
+
+        store = get_qdrant_store()
+        embedder = embedding_lifecycle.load(warmup=False)
+
+        print(f"🌱 Loading {args.thoughts} thoughts (dim={args.dim}, seed={args.seed})...")
+        seconds = load(store, embedder, args.thoughts, args.seed)
+        print(f"  ✓ loaded in {seconds:.1f}s ({args.thoughts / seconds:.0f} thoughts/s)")
+
+        if args.serve:
+            import uvicorn
+            print(f"🚀 Serving on http://127.0.0.1:{args.serve}")
+            uvicorn.run(app, host="127.0.0.1", port=args.serve, log_level="warning")
+            return
+
+        rng = random.Random(args.seed + 1)
+        sample_ids = [str(p.id) for p in store.scroll(limit=args.samples)]
+        client = TestClient(app)
+
+        print(f"⏱  {args.samples} requests per operation")
+        report("create", timed(lambda i: client.post("/v1/memory/thought", json={
+            "title": f"bench {i} {rng.choice(WORDS)}",
+            "content": " ".join(rng.choice(WORDS) for _ in range(60)),
+            "summary": " ".join(rng.sample(WORDS, 6)),
+            "type": rng.choice(TYPES),
+            "tickers": rng.sample(TICKERS, 2),
+            "workspace_id": "ws-bench",
+        }), args.samples))
+        report("search", timed(lambda i: client.post("/v1/memory/search", json={
+            "query": " ".join(rng.sample(WORDS, 4)),
+            "limit": 10,
+            "filters": {"must": [{"field": "workspace_id", "op": "match", "value": f"ws-{rng.randrange(10)}"}]},
+        }), args.samples))
+        report("related", timed(
+            lambda i: client.get(f"/v1/memory/thought/{sample_ids[i % len(sample_ids)]}/related"),
+            args.samples,
+        ))
+        report("stats", timed(lambda i: client.get("/v1/memory/statistics"), args.samples))
+
+
+if __name__ == "__main__":
+    main()
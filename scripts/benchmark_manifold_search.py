@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Concurrent search load against a running Manifold API.
+
+Fires POST /v1/memory/search from N concurrent clients for a fixed duration
+and reports throughput and latency percentiles. Run it before and after a
+change against the same collection to compare.
+
+    python scripts/benchmark_manifold_search.py --url http://localhost:8083 --concurrency 100 --duration 30
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+QUERIES = [
+    "semiconductor supply chain risk",
+    "Fed rate cut expectations",
+    "NVDA data center revenue",
+    "bitcoin macro thesis",
+    "margin compression competition",
+    "energy sector capex cycle",
+    "consumer credit delinquencies",
+    "AI inference demand",
+]
+
+
+async def _client_loop(client: httpx.AsyncClient, url: str, deadline: float, body_extra: dict, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        body = {"query": random.choice(QUERIES), "limit": 10, **body_extra}
+        start = time.perf_counter()
+        try:
+            resp = await client.post(f"{url}/v1/memory/search", json=body)
+            if resp.status_code != 200:
+                errors.append(resp.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(url: str, concurrency: int, duration: float, facets: bool):
+    body_extra = {"facets": ["type", "tickers"]} if facets else {}
+    latencies: list = []
+    errors: list = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+        # Warm-up request (model load, connection setup)
+        await client.post(f"{url}/v1/memory/search", json={"query": QUERIES[0], "limit": 1})
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            _client_loop(client, url, deadline, body_extra, latencies, errors)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    print(f"🔎 {concurrency} clients, {elapsed:.1f}s, facets={'on' if facets else 'off'}")
+    print(f"  ✓ requests:   {len(latencies)}  ({len(latencies) / elapsed:.1f} req/s)")
+    print(f"  ✗ errors:     {len(errors)}")
+    if latencies:
+        ordered = sorted(latencies)
+        pct = lambda p: ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+        print(f"  ⏱  p50 {pct(0.50):.1f} ms | p95 {pct(0.95):.1f} ms | p99 {pct(0.99):.1f} ms | mean {statistics.mean(latencies) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8083")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--facets", action="store_true", help="also request type/tickers facets")
+    args = parser.parse_args()
+    asyncio.run(run(args.url.rstrip("/"), args.concurrency, args.duration, args.facets))
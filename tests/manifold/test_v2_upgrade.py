@@ -285,3 +285,45 @@ class TestGraphWithNewFilters:
         # Check for section-of edges
         section_edges = [e for e in data["edges"] if e["type"] == "section-of"]
         assert len(section_edges) > 0
+
+
+class TestAggregates:
+    """Test materialized aggregates against a full recount."""
+    
+    def test_incremental_aggregates_match_rebuild(self, client):
+        """Stats, metrics and session lists kept on write equal a rebuild from scratch."""
+        session_id = str(uuid4())
+        workspace_id = f"ws-{uuid4()}"
+        ids = []
+        for i in range(4):
+            response = client.post("/v1/memory/thought", json={
+                "title": f"Aggregate {i}",
+                "content": f"Content {i}",
+                "type": "observation" if i % 2 else "analysis",
+                "session_id": session_id,
+                "workspace_id": workspace_id,
+            })
+            assert response.status_code == 200
+            ids.append(response.json()["thought_id"])
+        client.patch(f"/v1/memory/thought/{ids[0]}", json={"type": "decision", "status": "validated"})
+        client.post(f"/v1/memory/thought/{ids[1]}/related", json={"related_id": ids[2]})
+        client.delete(f"/v1/memory/thought/{ids[3]}?soft=false")
+        
+        urls = [
+            "/v1/memory/statistics",
+            f"/v1/memory/statistics?session_id={session_id}",
+            f"/v1/memory/graph/metrics?session_id={session_id}",
+            "/v1/memory/workspaces",
+            f"/v1/memory/sessions?workspace_id={workspace_id}",
+            f"/v1/memory/workspace/{workspace_id}/sessions",
+        ]
+        before = [client.get(url).json() for url in urls]
+        
+        response = client.post("/v1/memory/index/aggregates/rebuild")
+        assert response.status_code == 200
+        after = [client.get(url).json() for url in urls]
+        
+        for incremental, recounted in zip(before, after):
+            assert incremental == recounted
+        assert before[1]["total_thoughts"] == 3
+        assert before[1]["distributions"]["by_type"].get("decision") == 1